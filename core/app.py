@@ -8,13 +8,21 @@ from core.test_runner import TestRunner
 from core.code_manager import CodeManager
 from core.file_monitor import FileMonitor
 from core.clipboard_monitor import ClipboardMonitor
+from core.ui_dispatcher import UIDispatcher
+from core.problem_store import ProblemStore
 
 
 class AtCoderTestTool:
     """AtCoderテストツールのメインクラス"""
 
-    def __init__(self, root):
+    def __init__(self, root, startup_profile=None):
+        """
+        Args:
+            root: Tkのルートウィンドウ
+            startup_profile: 起動時間を記録する StartupProfile（省略可）
+        """
         self.root = root
+        self.startup_profile = startup_profile
         self.root.title("AtCoder Test Tool")
         self.root.geometry("1280x800")
 
@@ -26,24 +34,99 @@ class AtCoderTestTool:
         # 問題管理
         self.problems = {}  # problem_id -> problem_info
 
+        # 問題・テストケース・最後の実行結果の保存先（次回の起動時に復元する）
+        self.problem_store = ProblemStore()
+
         # テーマの設定
         self.theme_manager = ThemeManager(root)
+        self._mark_startup("テーマの設定")
+
+        # ワーカースレッドからのUI更新をメインスレッドでまとめて反映する
+        self.dispatcher = UIDispatcher(root)
+        self.dispatcher.start()
 
         # 各マネージャーの初期化
         self.html_manager = HTMLManager(self)
         self.test_runner = TestRunner(self)
         self.code_manager = CodeManager(self)
+        self._mark_startup("マネージャーの初期化")
 
         # UIの初期化
         self.ui = MainWindow(root, self)
+        self._mark_startup("ウィジェットの作成")
 
-        # ファイル監視を開始
-        self.file_monitor = FileMonitor("", self.code_manager.reload_code_file)
+        # 開いている問題の解答コードと補助モジュールの監視を開始
+        self.file_monitor = FileMonitor()
         self.file_monitor.start()
 
         # クリップボード監視を開始
         self.clipboard_monitor = ClipboardMonitor(self)
         self.clipboard_monitor.start()
+        self._mark_startup("監視の開始")
+
+    def _mark_startup(self, phase):
+        """起動の段階が終わった時刻を記録"""
+        if self.startup_profile:
+            self.startup_profile.mark(phase)
+
+    def finish_startup(self):
+        """ウィンドウの表示後に、起動直後には必要ないものを準備する"""
+        # 問題タブで使うスタイル
+        self.theme_manager.setup_deferred_theme()
+        # HTMLの解析に使うモジュールは最初の貼り付けまでに読み込んでおく
+        self.html_manager.preload_parser()
+        # ランタイムメニューに表示するインタプリタを探しておく
+        self.test_runner.discover_runtimes()
+        # 前回開いていたコンテストの問題を復元
+        self.restore_problems()
+
+    def restore_problems(self):
+        """
+        最後に開いていたコンテストの問題を復元する
+
+        タブは一覧だけを作り、中身のウィジェットは初めて開いたときに作る
+        """
+        try:
+            problems = self.problem_store.load_contest()
+        except Exception as e:
+            print(f"保存した問題の読み込みに失敗しました: {str(e)}")
+            return
+
+        for problem_info in problems:
+            problem_id = problem_info["problem_id"]
+            if problem_id in self.problems:
+                continue
+            self.problems[problem_id] = problem_info
+            self.code_manager.watch_problem(problem_info)
+            self.ui.add_problem_tab(problem_id, problem_info["problem_title"])
+
+        if problems:
+            self.ui.show_status_message(
+                f"前回の問題を{len(problems)}問復元しました", "Success.TLabel"
+            )
+
+    def save_problem(self, problem_id):
+        """問題とテストケースを保存する"""
+        problem_info = self.problems.get(problem_id)
+        if problem_info is None or not _is_complete(problem_info):
+            return
+        try:
+            self.problem_store.save_problem(problem_info)
+        except Exception as e:
+            print(f"問題の保存に失敗しました: {str(e)}")
+
+    def on_problem_tab_built(self, problem_id):
+        """問題タブのウィジェットを作ったら、保存されていた最後の実行結果を表示"""
+        problem_info = self.problems.get(problem_id)
+        tab_info = self.ui.get_problem_tab_info(problem_id)
+        if problem_info is None or tab_info is None:
+            return
+        try:
+            results = self.problem_store.load_results(problem_info)
+        except Exception as e:
+            print(f"保存した実行結果の読み込みに失敗しました: {str(e)}")
+            return
+        self.test_runner.show_saved_results(tab_info, results)
 
     def activate_window(self):
         """アプリケーションウィンドウをアクティブにする"""
@@ -112,9 +195,9 @@ class AtCoderTestTool:
                     self.code_manager.update_code_file_path(
                         problem_info["contest_number"], problem_info["problem_id"]
                     )
-                    # ファイル監視を更新
+                    # コードの表示を更新
                     if self.code_manager.code_file:
-                        self.file_monitor.update_file_path(self.code_manager.code_file)
+                        self.code_manager.reload_code_file()
 
     # 操作メソッド
     def start_parsing(self):
@@ -122,16 +205,73 @@ class AtCoderTestTool:
         html_content = self.ui.html_text.get("1.0", tk.END)
         self.html_manager.start_parsing(html_content)
 
+    def import_pages(self, paths):
+        """保存した問題ページ（ファイルまたはフォルダ）からコンテストの問題をまとめて読み込む"""
+        if not self.html_manager.start_import(paths):
+            self.ui.show_status_message("解析中です", "Warning.TLabel")
+
     def update_problem_info(self, problem_info):
         """問題情報を更新"""
-        # 問題情報の保存
+        self._store_problems([problem_info])
+        self._select_problem(problem_info)
+
+    def import_problems(self, problem_infos):
+        """
+        同じコンテストの複数の問題をまとめて追加する
+
+        問題タブは問題IDの順に一度に作り（中身は初めて開いたときに作る）、最初の問題を開く
+        """
+        problem_infos = sorted(problem_infos, key=lambda info: info["problem_id"])
+        self._store_problems(problem_infos)
+        for problem_info in problem_infos:
+            self.ui.add_problem_tab(
+                problem_info["problem_id"], problem_info["problem_title"]
+            )
+        self._select_problem(problem_infos[0])
+
+    def _store_problems(self, problem_infos):
+        """同じコンテストの問題をコレクションに追加して保存"""
+        # 別のコンテストの問題なら、前のコンテストの問題タブは閉じる
+        # （コンテスト番号や問題IDが取れなかった問題はタブを作らないので閉じない）
+        contest_number = problem_infos[0]["contest_number"]
+        if all(_is_complete(problem_info) for problem_info in problem_infos) and any(
+            problem.get("contest_number")
+            and problem.get("contest_number") != contest_number
+            for problem in self.problems.values()
+        ):
+            self.problems.clear()
+            self.ui.clear_problem_tabs()
+            self.code_manager.unwatch_all()
+
+        for problem_info in problem_infos:
+            # 同じ問題を貼り付け直した場合も、ストレステストで見つけたケースは残す
+            previous = self.problems.get(problem_info["problem_id"])
+            if previous is not None and previous is not problem_info:
+                problem_info["test_cases"].extend(
+                    test_case
+                    for test_case in previous["test_cases"]
+                    if test_case.get("custom")
+                )
+            self.problems[problem_info["problem_id"]] = problem_info
+            self.code_manager.watch_problem(problem_info)
+
+        try:
+            self.problem_store.save_problems(
+                [
+                    problem_info
+                    for problem_info in problem_infos
+                    if _is_complete(problem_info)
+                ]
+            )
+        except Exception as e:
+            print(f"問題の保存に失敗しました: {str(e)}")
+
+    def _select_problem(self, problem_info):
+        """問題を現在の問題にして、情報・コードファイル・問題タブを切り替える"""
         self.problem_id = problem_info["problem_id"]
         self.problem_title = problem_info["problem_title"]
         self.contest_number = problem_info["contest_number"]
-
-        # 問題をコレクションに追加
         problem_id = problem_info["problem_id"]
-        self.problems[problem_id] = problem_info
 
         # 問題情報の表示を更新
         if self.contest_number and self.problem_id and self.problem_title:
@@ -149,9 +289,6 @@ class AtCoderTestTool:
             if code_file:
                 self.code_manager.update_code_frame(code_file)
 
-                # ファイル監視の更新
-                self.file_monitor.update_file_path(code_file)
-
         # 問題タブの作成または更新
         if problem_id and self.problem_title and self.contest_number:
             self.ui.create_problem_tab(
@@ -159,6 +296,8 @@ class AtCoderTestTool:
                 self.problem_title,
                 self.contest_number,
                 problem_info["test_cases"],
+                problem_info.get("comparator"),
+                problem_info.get("constraints"),
             )
 
         # テストケースの更新（従来のテストケースタブ用）
@@ -206,6 +345,50 @@ class AtCoderTestTool:
         # テストケースを実行
         self.test_runner.run_tests_for_tab(tab_info)
 
+    def compare_runtimes_for_problem(self, problem_id):
+        """指定された問題のテストケースをランタイムごとに実行して比較"""
+        tab_info = self.ui.get_problem_tab_info(problem_id)
+        if not tab_info:
+            self.ui.show_status_message(
+                "テストケース情報が見つかりません", "Warning.TLabel"
+            )
+            return
+
+        self.test_runner.run_runtime_matrix(tab_info)
+
+    def start_stress_test(self, problem_id, generator_file, brute_file):
+        """指定された問題の解答コードをストレステスト"""
+        tab_info = self.ui.get_problem_tab_info(problem_id)
+        if not tab_info:
+            self.ui.show_status_message(
+                "テストケース情報が見つかりません", "Warning.TLabel"
+            )
+            return
+
+        self.test_runner.run_stress_test(tab_info, generator_file, brute_file)
+
+    def start_scaling_analysis(self, problem_id, generator_file, max_n):
+        """指定された問題の解答コードの計算量を推定"""
+        tab_info = self.ui.get_problem_tab_info(problem_id)
+        if not tab_info:
+            self.ui.show_status_message(
+                "テストケース情報が見つかりません", "Warning.TLabel"
+            )
+            return
+
+        self.test_runner.run_scaling_analysis(tab_info, generator_file, max_n)
+
+    def profile_test_case(self, problem_id, case_index):
+        """指定された問題のテストケースをプロファイルしながら実行"""
+        tab_info = self.ui.get_problem_tab_info(problem_id)
+        if not tab_info:
+            self.ui.show_status_message(
+                "テストケース情報が見つかりません", "Warning.TLabel"
+            )
+            return
+
+        self.test_runner.profile_test_case(tab_info, case_index)
+
     def generate_single_file(self):
         """ファイルを生成"""
         self.code_manager.generate_file()
@@ -219,5 +402,15 @@ class AtCoderTestTool:
         if hasattr(self, "clipboard_monitor"):
             self.clipboard_monitor.stop()
 
+        # 常駐プロセスを停止
+        self.test_runner.shutdown()
+        self.dispatcher.stop()
+        self.problem_store.close()
+
         # ウィンドウを閉じる
         self.root.destroy()
+
+
+def _is_complete(problem_info):
+    """コンテスト番号と問題IDが取れた問題か"""
+    return bool(problem_info.get("contest_number") and problem_info.get("problem_id"))
@@ -0,0 +1,248 @@
+"""
+GUIを起動せずにテストを実行するコマンドライン
+
+    python -m core solution.py --html problem.html
+    python -m core solution.py --problem problem.json --format junit -o report.xml
+
+問題は保存した問題情報（JSON）か、問題ページのHTMLから読み込む。
+HTMLを読み込むときだけ core.parser をインポートする。
+すべてのテストケースがACなら終了コード0、そうでなければ1で終了する
+"""
+
+import os
+import sys
+import json
+import argparse
+from xml.etree import ElementTree
+from core.engine import TestEngine, load_cases, all_passed
+from core.tester import DEFAULT_LIMITS, VERDICT_AC
+from core.scheduler import MODE_PARALLEL
+from core.comparators import Comparator
+from core.zygote import Zygote
+
+# 出力形式
+FORMAT_TEXT = "text"
+FORMAT_JSON = "json"
+FORMAT_JUNIT = "junit"
+FORMATS = [FORMAT_TEXT, FORMAT_JSON, FORMAT_JUNIT]
+
+
+def build_parser():
+    """コマンドライン引数の定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m core",
+        description="AtCoderの入力例で解答コードをテストする",
+    )
+    parser.add_argument("solution", help="解答コード（.py）")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--html", help="問題ページのHTMLファイル")
+    source.add_argument("--problem", help="保存した問題情報のJSONファイル")
+    parser.add_argument(
+        "--format", choices=FORMATS, default=FORMAT_TEXT, help="結果の出力形式"
+    )
+    parser.add_argument("-o", "--output", help="結果の出力先（省略時は標準出力）")
+    parser.add_argument(
+        "--python", default=sys.executable, help="解答コードを実行するPython"
+    )
+    parser.add_argument("--time-limit", type=float, help="実行時間制限（秒）")
+    parser.add_argument("--memory-limit", type=int, help="メモリ制限（KB）")
+    parser.add_argument("--jobs", type=int, help="並列に実行するテストの数")
+    parser.add_argument(
+        "--no-zygote", action="store_true", help="ゾイゴートを使わずに実行する"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="実行結果のキャッシュを使わない"
+    )
+    parser.add_argument(
+        "--save-problem", help="読み込んだ問題情報をJSONファイルに保存する"
+    )
+    return parser
+
+
+def load_problem(args):
+    """問題情報を読み込む"""
+    if args.html:
+        # HTMLを解析するときだけインポートする
+        from core.parser import parse_problem_html
+
+        with open(args.html, "r", encoding="utf-8") as f:
+            return parse_problem_html(f.read())
+
+    with open(args.problem, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def problem_limits(problem_info, args):
+    """問題文の実行制限にコマンドラインの指定を反映"""
+    limits = dict(DEFAULT_LIMITS)
+    limits.update(problem_info.get("limits", {}))
+    if args.time_limit is not None:
+        limits["time_limit"] = args.time_limit
+    if args.memory_limit is not None:
+        limits["memory_limit"] = args.memory_limit
+    return limits
+
+
+def problem_name(problem_info):
+    """問題の表示名"""
+    name = " ".join(
+        part
+        for part in [
+            problem_info.get("contest_number"),
+            problem_info.get("problem_id"),
+        ]
+        if part
+    )
+    title = problem_info.get("problem_title")
+    return f"{name}: {title}" if name and title else name or title or ""
+
+
+def case_entry(report):
+    """テストケースの結果を出力用の辞書に変換"""
+    result = report["result"]
+    return {
+        "title": report["title"],
+        "verdict": report["verdict"],
+        "time": result.get("time"),
+        "cpu_time": result.get("cpu_time"),
+        "memory": result.get("memory"),
+        "cached": bool(result.get("cached")),
+        "output": result.get("output", ""),
+        "expected_output": report["expected_output"],
+        "error": result.get("error", ""),
+    }
+
+
+def format_json(solution, problem_info, reports):
+    """結果をJSONで出力"""
+    cases = [case_entry(report) for report in reports]
+    return json.dumps(
+        {
+            "solution": solution,
+            "problem": problem_name(problem_info),
+            "summary": {
+                "passed": sum(case["verdict"] == VERDICT_AC for case in cases),
+                "total": len(cases),
+            },
+            "cases": cases,
+        },
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+def format_junit(solution, problem_info, reports):
+    """結果をJUnit形式のXMLで出力"""
+    cases = [case_entry(report) for report in reports]
+    suite = ElementTree.Element(
+        "testsuite",
+        name=problem_name(problem_info) or os.path.basename(solution),
+        tests=str(len(cases)),
+        failures=str(sum(case["verdict"] != VERDICT_AC for case in cases)),
+        time=f"{sum(case['time'] or 0 for case in cases):.3f}",
+    )
+    for case in cases:
+        element = ElementTree.SubElement(
+            suite,
+            "testcase",
+            classname=os.path.basename(solution),
+            name=case["title"],
+            time=f"{case['time'] or 0:.3f}",
+        )
+        if case["verdict"] != VERDICT_AC:
+            failure = ElementTree.SubElement(
+                element, "failure", message=case["verdict"], type=case["verdict"]
+            )
+            failure.text = (
+                f"期待される出力:\n{case['expected_output']}\n\n"
+                f"実際の出力:\n{case['output']}"
+            )
+        if case["error"]:
+            ElementTree.SubElement(element, "system-err").text = case["error"]
+    ElementTree.indent(suite)
+    return ElementTree.tostring(suite, encoding="unicode", xml_declaration=True)
+
+
+def format_text(solution, problem_info, reports):
+    """結果を人が読む形式で出力"""
+    lines = []
+    name = problem_name(problem_info)
+    if name:
+        lines.append(name)
+    for case in map(case_entry, reports):
+        stats = []
+        if case["time"] is not None:
+            stats.append(f"{case['time'] * 1000:.0f} ms")
+        if case["memory"]:
+            stats.append(f"{case['memory']} KB")
+        if case["cached"]:
+            stats.append("キャッシュ")
+        lines.append(f"{case['verdict']:<4} {case['title']}  {' / '.join(stats)}")
+        if case["verdict"] != VERDICT_AC and case["error"]:
+            lines.append(case["error"].rstrip())
+    passed = sum(report["verdict"] == VERDICT_AC for report in reports)
+    lines.append(f"{passed}/{len(reports)} ケースに合格")
+    return "\n".join(lines)
+
+
+FORMATTERS = {
+    FORMAT_TEXT: format_text,
+    FORMAT_JSON: format_json,
+    FORMAT_JUNIT: format_junit,
+}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        problem_info = load_problem(args)
+    except (OSError, ValueError) as e:
+        print(f"問題を読み込めません: {str(e)}", file=sys.stderr)
+        return 2
+
+    if args.save_problem:
+        with open(args.save_problem, "w", encoding="utf-8") as f:
+            json.dump(problem_info, f, ensure_ascii=False, indent=2)
+
+    cases = load_cases(problem_info.get("test_cases", []))
+    if not cases:
+        print("テストケースがありません", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.solution):
+        print(f"解答コードが存在しません: {args.solution}", file=sys.stderr)
+        return 2
+
+    engine = TestEngine()
+    if args.jobs:
+        engine.scheduler.set_mode(MODE_PARALLEL, args.jobs)
+    zygote = None
+    if not args.no_zygote and Zygote.is_supported():
+        zygote = Zygote(args.python)
+
+    try:
+        reports = engine.run_solution(
+            args.solution,
+            cases,
+            limits=problem_limits(problem_info, args),
+            comparator=Comparator.from_dict(problem_info.get("comparator")),
+            python=args.python,
+            zygote=zygote,
+            use_cache=not args.no_cache,
+        )
+    finally:
+        if zygote:
+            zygote.stop()
+
+    report = FORMATTERS[args.format](args.solution, problem_info, reports)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+    return 0 if all_passed(reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,46 @@
-import threading
-import time
 import re
+import sys
+import hashlib
+
+# 指紋に使う先頭・末尾の文字数
+FINGERPRINT_CHARS = 4096
+
+# AtCoderのHTMLかどうかを調べる先頭の文字数（問題ページは収まり、巨大な内容の全体は調べない）
+HEAD_CHARS = 262144
+
+# AtCoderのHTMLに特徴的なパターン（いずれかにマッチすればAtCoderのHTMLとみなす）
+ATCODER_PATTERN = re.compile(
+    r'<span class="h2">[A-Z] - '  # 問題タイトルパターン
+    r'|<div class="part">'  # 入力例、出力例のセクション
+    r"|<h3>入力例"  # 入力例のヘッダー
+    r"|<h3>出力例"  # 出力例のヘッダー
+    r'|<a href="/contests/abc\d+'  # コンテストへのリンク
+)
+
+
+def _clipboard_sequence_reader():
+    """
+    クリップボードの更新回数を返す関数（取得できない環境ではNone）
+
+    Windows では内容を読まずに変更を検出できる
+    """
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+
+        return ctypes.windll.user32.GetClipboardSequenceNumber
+    except (ImportError, AttributeError, OSError):
+        return None
 
 
 class ClipboardMonitor:
-    """クリップボードの変更を監視するクラス"""
+    """
+    クリップボードの変更を監視するクラス
+
+    クリップボードはTkのメインスレッドで読む。更新回数が取れる環境では変わったときだけ読み、
+    内容は長さと先頭・末尾のハッシュの指紋で前回と比べる
+    """
 
     def __init__(self, app_controller, interval=0.5):
         """
@@ -14,9 +50,11 @@ class ClipboardMonitor:
         """
         self.app_controller = app_controller
         self.interval = interval
-        self.last_clipboard_content = ""
+        self.last_fingerprint = None
+        self.last_sequence = None
+        self.read_sequence = None
         self.running = False
-        self.thread = None
+        self.after_id = None
 
     def start(self):
         """監視を開始"""
@@ -24,61 +62,67 @@ class ClipboardMonitor:
             return
 
         self.running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        self.read_sequence = _clipboard_sequence_reader()
+        self._schedule()
 
     def stop(self):
         """監視を停止"""
         self.running = False
-        if self.thread:
-            self.thread.join(timeout=self.interval * 2)
-            self.thread = None
-
-    def _monitor_loop(self):
-        """監視ループ"""
-        while self.running:
+        if self.after_id is not None:
             try:
-                # 現在のクリップボード内容を取得
-                current_content = self.app_controller.root.clipboard_get()
+                self.app_controller.root.after_cancel(self.after_id)
+            except Exception:
+                pass
+            self.after_id = None
 
-                # 内容が変わっていて、かつHTML入力タブがアクティブな場合のみ処理
-                if (
-                    current_content != self.last_clipboard_content
-                    and self._looks_like_atcoder_html(current_content)
-                ):
+    def _schedule(self):
+        if self.running:
+            self.after_id = self.app_controller.root.after(
+                int(self.interval * 1000), self._poll
+            )
 
-                    # UIスレッドで安全に貼り付け
-                    self.app_controller.root.after(
-                        0, lambda: self._auto_paste(current_content)
-                    )
+    def _poll(self):
+        """クリップボードを確認（Tkのメインスレッドで呼ばれる）"""
+        self.after_id = None
+        try:
+            self._check_clipboard()
+        except Exception:
+            # クリップボードが空または取得できない場合はスキップ
+            pass
+        self._schedule()
+
+    def _check_clipboard(self):
+        # 更新回数が変わっていなければ内容は読まない
+        if self.read_sequence is not None:
+            sequence = self.read_sequence()
+            if sequence == self.last_sequence:
+                return
+            self.last_sequence = sequence
+
+        # 現在のクリップボード内容を取得
+        current_content = self.app_controller.root.clipboard_get()
+
+        fingerprint = self._fingerprint(current_content)
+        if fingerprint == self.last_fingerprint:
+            return
+        self.last_fingerprint = fingerprint
 
-                self.last_clipboard_content = current_content
-            except Exception:
-                # クリップボードが空または取得できない場合はスキップ
-                pass
+        if self._looks_like_atcoder_html(current_content):
+            self._auto_paste(current_content)
 
-            time.sleep(self.interval)
+    def _fingerprint(self, content):
+        """内容の指紋（長さと、先頭・末尾のハッシュ）"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(content[:FINGERPRINT_CHARS].encode("utf-8", "surrogatepass"))
+        digest.update(content[-FINGERPRINT_CHARS:].encode("utf-8", "surrogatepass"))
+        return len(content), digest.digest()
 
     def _looks_like_atcoder_html(self, content):
         """コンテンツがAtCoderのHTML形式かどうかをチェック"""
         if len(content) < 100:  # 短すぎる内容は除外
             return False
 
-        # AtCoderのHTMLに特徴的なパターンをチェック
-        atcoder_patterns = [
-            r'<span class="h2">[A-Z] - ',  # 問題タイトルパターン
-            r'<div class="part">',  # 入力例、出力例のセクション
-            r"<h3>入力例",  # 入力例のヘッダー
-            r"<h3>出力例",  # 出力例のヘッダー
-            r'<a href="/contests/abc\d+',  # コンテストへのリンク
-        ]
-
-        # いずれかのパターンにマッチすればAtCoderのHTMLとみなす
-        for pattern in atcoder_patterns:
-            if re.search(pattern, content):
-                return True
-
-        return False
+        return ATCODER_PATTERN.search(content, 0, HEAD_CHARS) is not None
 
     def _auto_paste(self, content):
         """コンテンツを自動的に貼り付け"""
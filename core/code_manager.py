@@ -2,7 +2,9 @@ import os
 import tkinter as tk
 from tkinter import ttk
 import subprocess
+import threading
 import re
+from core.compile_cache import local_modules
 
 
 class CodeManager:
@@ -12,13 +14,122 @@ class CodeManager:
         self.app_controller = app_controller
         self.code_file = ""
 
-    def update_code_file_path(self, contest_number, problem_id):
-        """コードファイルのパスを更新"""
+        # 監視している解答コード（絶対パス） -> インポートしている補助モジュールの集合
+        self.helpers = {}
+        # 監視を始めてから存在を確認した解答コード（初めて作られたときは自動実行しない）
+        self.existing_files = set()
+        self.watch_lock = threading.Lock()
+
+    def code_file_for(self, contest_number, problem_id):
+        """問題の解答コードのファイル名（決められなければNone）"""
         if contest_number and problem_id:
-            self.code_file = f"{contest_number}{problem_id}.py"
-            return self.code_file
+            return f"{contest_number}{problem_id}.py"
         return None
 
+    def update_code_file_path(self, contest_number, problem_id):
+        """コードファイルのパスを更新"""
+        code_file = self.code_file_for(contest_number, problem_id)
+        if code_file:
+            self.code_file = code_file
+        return code_file
+
+    def watch_problem(self, problem_info):
+        """問題の解答コードと、それがインポートする補助モジュールの変更を監視する"""
+        code_file = self.code_file_for(
+            problem_info.get("contest_number"), problem_info.get("problem_id")
+        )
+        if not code_file:
+            return
+        path = os.path.abspath(code_file)
+        with self.watch_lock:
+            if os.path.exists(path):
+                self.existing_files.add(path)
+            self.helpers.setdefault(path, set())
+        self.app_controller.file_monitor.subscribe(path, self._on_code_file_changed)
+        self._watch_helpers(path)
+
+    def unwatch_all(self):
+        """すべての解答コードと補助モジュールの監視をやめる（別のコンテストを開いたとき）"""
+        file_monitor = self.app_controller.file_monitor
+        with self.watch_lock:
+            helpers = self.helpers
+            self.helpers = {}
+            self.existing_files.clear()
+        for path, modules in helpers.items():
+            file_monitor.unsubscribe(path, self._on_code_file_changed)
+            for module in modules:
+                file_monitor.unsubscribe(module, self._on_helper_changed)
+
+    def _watch_helpers(self, path):
+        """解答コードがインポートする補助モジュールの監視を更新する"""
+        modules = set(local_modules(path))
+        with self.watch_lock:
+            if path not in self.helpers:
+                return
+            old_modules = self.helpers[path]
+            self.helpers[path] = modules
+            still_used = set().union(*self.helpers.values())
+
+        file_monitor = self.app_controller.file_monitor
+        for module in modules - old_modules:
+            file_monitor.subscribe(module, self._on_helper_changed)
+        for module in old_modules - still_used:
+            file_monitor.unsubscribe(module, self._on_helper_changed)
+
+    def _on_code_file_changed(self, path):
+        """解答コードの内容が変わったときの処理（ファイル監視のスレッドから呼ばれる）"""
+        self._watch_helpers(path)
+        with self.watch_lock:
+            created = path not in self.existing_files
+            self.existing_files.add(path)
+
+        if path == os.path.abspath(self.code_file or ""):
+            self.reload_code_file()
+            # 新しく作られたファイルはまだ解答が書かれていないので実行しない
+            if not created:
+                self.app_controller.test_runner.on_code_saved()
+        else:
+            # 表示していない問題のタブも最新の内容にしておく
+            self.app_controller.dispatcher.post(self._show_changed_code, path)
+
+    def _on_helper_changed(self, module):
+        """補助モジュールの内容が変わったときの処理（ファイル監視のスレッドから呼ばれる）"""
+        with self.watch_lock:
+            dependents = [
+                path for path, modules in self.helpers.items() if module in modules
+            ]
+        # 表示中の問題が使っていればテストを実行し直す
+        if os.path.abspath(self.code_file or "") in dependents:
+            self.app_controller.test_runner.on_code_saved()
+
+    def _show_changed_code(self, path):
+        """表示中でない問題の解答コードの表示を更新（UIスレッドで呼ぶ）"""
+        ui = self.app_controller.ui
+        for problem_id, problem_info in self.app_controller.problems.items():
+            code_file = self.code_file_for(
+                problem_info.get("contest_number"), problem_id
+            )
+            if not code_file or os.path.abspath(code_file) != path:
+                continue
+            # まだ開いていない問題タブは、開いたときに読み込む
+            tab_info = ui.get_problem_tab_info(problem_id, build=False)
+            if tab_info and "code_text" in tab_info:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        self._set_code_text(tab_info["code_text"], f.read())
+                except Exception as e:
+                    print(f"ファイルの再読み込みに失敗: {str(e)}")
+            ui.show_status_message(
+                f"{os.path.basename(path)} が更新されました", "Status.TLabel"
+            )
+
+    def _set_code_text(self, code_text, code):
+        """読み取り専用のコード表示の内容を置き換える"""
+        code_text.config(state="normal")
+        code_text.delete("1.0", tk.END)
+        code_text.insert(tk.END, code)
+        code_text.config(state="disabled")
+
     def update_code_frame(self, title):
         """コード表示用フレームを更新"""
         ui = self.app_controller.ui
@@ -60,7 +171,6 @@ class CodeManager:
 
         # ファイルが存在すれば読み込む
         if os.path.exists(self.code_file):
-            self.app_controller.file_monitor.update_file_path(self.code_file)
             self.reload_code_file()
 
         # 現在のタブが問題タブの場合、そのタブのコード表示も更新
@@ -131,28 +241,27 @@ class CodeManager:
                 with open(self.code_file, "r", encoding="utf-8") as f:
                     code = f.read()
 
-                # UIスレッドでの更新
-                self.app_controller.root.after(0, lambda: self.update_code_text(code))
-
-                # 現在のタブもチェックして更新
-                current_tab = self.app_controller.ui.notebook.index("current")
-                if current_tab >= 2:  # 問題タブの場合
-                    tab_info = self.app_controller.ui.get_current_tab_info()
-                    if tab_info:
-                        self.app_controller.root.after(
-                            0, lambda: self.update_problem_tab_code(tab_info)
-                        )
+                # ファイル監視のスレッドから呼ばれた場合はUIスレッドで更新
+                self.app_controller.dispatcher.call(self._show_reloaded_code, code)
         except Exception as e:
             print(f"ファイルの再読み込みに失敗: {str(e)}")
 
+    def _show_reloaded_code(self, code):
+        """再読み込みしたコードを表示（UIスレッドで呼ぶ）"""
+        self.update_code_text(code)
+
+        # 現在のタブもチェックして更新
+        current_tab = self.app_controller.ui.notebook.index("current")
+        if current_tab >= 2:  # 問題タブの場合
+            tab_info = self.app_controller.ui.get_current_tab_info()
+            if tab_info:
+                self.update_problem_tab_code(tab_info)
+
     def update_code_text(self, code):
         """コードテキストエリアを更新"""
         ui = self.app_controller.ui
         if hasattr(ui, "code_text"):
-            ui.code_text.config(state="normal")
-            ui.code_text.delete("1.0", tk.END)
-            ui.code_text.insert(tk.END, code)
-            ui.code_text.config(state="disabled")
+            self._set_code_text(ui.code_text, code)
 
     def generate_code_template(self):
         """コードテンプレートを生成"""
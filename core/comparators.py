@@ -0,0 +1,235 @@
+import math
+
+# 判定モード
+MODE_EXACT = "exact"
+MODE_CASE_INSENSITIVE = "case_insensitive"
+MODE_TOKEN = "token"
+MODE_FLOAT = "float"
+
+# デフォルトの判定モードと許容誤差
+DEFAULT_MODE = MODE_CASE_INSENSITIVE
+DEFAULT_TOLERANCE = 1e-6
+
+# 判定モード -> 表示名
+COMPARATOR_MODES = {
+    MODE_EXACT: "完全一致",
+    MODE_CASE_INSENSITIVE: "大文字小文字を無視",
+    MODE_TOKEN: "空白区切りで比較",
+    MODE_FLOAT: "誤差許容",
+}
+
+
+class TextMatcher:
+    """出力を文字単位で逐次比較するクラス（前後の空白は無視）"""
+
+    def __init__(self, expected, ignore_case):
+        self.ignore_case = ignore_case
+        expected = expected.strip()
+        self.expected = expected.lower() if ignore_case else expected
+        self.position = 0  # 期待される出力のどこまで一致したか
+        self.started = False  # 先頭の空白を読み飛ばし終えたか
+
+    def feed(self, text):
+        """出力の一部を受け取り、ここまで一致していればTrueを返す"""
+        if not self.started:
+            # 先頭の空白は無視
+            text = text.lstrip()
+            if not text:
+                return True
+            self.started = True
+
+        if self.ignore_case:
+            text = text.lower()
+        expected_part = self.expected[self.position : self.position + len(text)]
+        if text[: len(expected_part)] != expected_part:
+            return False
+
+        # 期待される出力より後ろは空白のみ許可
+        rest = text[len(expected_part) :]
+        self.position += len(expected_part)
+        return not rest or rest.isspace()
+
+    def finish(self):
+        """出力の終わりで、全体が一致したかどうかを返す"""
+        return self.position >= len(self.expected)
+
+
+class TokenMatcher:
+    """出力を空白区切りのトークン単位で逐次比較するクラス"""
+
+    def __init__(self, expected):
+        self.expected = expected.split()
+        self.position = 0
+        self.carry = ""  # チャンクの境界で途切れたトークン
+
+    def feed(self, text):
+        """出力の一部を受け取り、ここまで一致していればTrueを返す"""
+        text = self.carry + text
+        tokens = text.split()
+        if tokens and not text[-1].isspace():
+            self.carry = tokens.pop()
+        else:
+            self.carry = ""
+        return self._check(tokens)
+
+    def finish(self):
+        """出力の終わりで、全体が一致したかどうかを返す"""
+        tokens = self.carry.split()
+        self.carry = ""
+        return self._check(tokens) and self.position == len(self.expected)
+
+    def _check(self, tokens):
+        """トークン列を期待される出力の続きと比較"""
+        if not tokens:
+            return True
+        end = self.position + len(tokens)
+        if end > len(self.expected):
+            return False
+        matched = self._match(tokens, self.position, end)
+        self.position = end
+        return matched
+
+    def _match(self, tokens, start, end):
+        """期待される出力の start から end までのトークンと比較"""
+        return tokens == self.expected[start:end]
+
+
+class FloatMatcher(TokenMatcher):
+    """数値のトークンを許容誤差つきで比較するクラス（NumPyでまとめて比較）"""
+
+    def __init__(self, expected, abs_tol, rel_tol):
+        super().__init__(expected)
+        self.abs_tol = abs_tol
+        self.rel_tol = rel_tol
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        self.np = numpy
+        if numpy is not None:
+            self.expected_values, self.expected_numeric = self._parse(self.expected)
+
+    def _parse(self, tokens):
+        """
+        トークン列を数値の配列に変換
+
+        Returns:
+            (数値の配列, 数値として読めたかどうかのマスク) のタプル。
+            すべて数値ならマスクはNone
+        """
+        np = self.np
+        try:
+            return np.array(tokens, dtype=np.float64), None
+        except ValueError:
+            # 数値でないトークンが混ざっている場合は1つずつ変換
+            values = np.zeros(len(tokens), dtype=np.float64)
+            numeric = np.zeros(len(tokens), dtype=bool)
+            for i, token in enumerate(tokens):
+                try:
+                    values[i] = float(token)
+                    numeric[i] = True
+                except ValueError:
+                    pass
+            return values, numeric
+
+    def _match(self, tokens, start, end):
+        if self.np is None:
+            return all(
+                self._match_token(actual, expected)
+                for actual, expected in zip(tokens, self.expected[start:end])
+            )
+
+        np = self.np
+        actual_values, actual_numeric = self._parse(tokens)
+        expected_values = self.expected_values[start:end]
+
+        # すべて数値なら配列のまま比較
+        if actual_numeric is None and self.expected_numeric is None:
+            return self._within(actual_values, expected_values)
+
+        if actual_numeric is None:
+            actual_numeric = np.ones(len(tokens), dtype=bool)
+        if self.expected_numeric is None:
+            expected_numeric = np.ones(len(tokens), dtype=bool)
+        else:
+            expected_numeric = self.expected_numeric[start:end]
+
+        # 数値でないトークンは文字列として比較
+        both_numeric = actual_numeric & expected_numeric
+        for i in np.nonzero(~both_numeric)[0]:
+            if tokens[i] != self.expected[start + i]:
+                return False
+        return self._within(actual_values[both_numeric], expected_values[both_numeric])
+
+    def _within(self, actual_values, expected_values):
+        """絶対誤差または相対誤差が許容値以内かどうか"""
+        np = self.np
+        error = np.abs(actual_values - expected_values)
+        within = (error <= self.abs_tol) | (
+            error <= self.rel_tol * np.abs(expected_values)
+        )
+        return bool(within.all())
+
+    def _match_token(self, actual, expected):
+        """NumPyがない場合の1トークンごとの比較"""
+        if actual == expected:
+            return True
+        try:
+            return math.isclose(
+                float(actual),
+                float(expected),
+                rel_tol=self.rel_tol,
+                abs_tol=self.abs_tol,
+            )
+        except ValueError:
+            return False
+
+
+class Comparator:
+    """出力の比較方法（判定モード）"""
+
+    def __init__(self, mode=DEFAULT_MODE, tolerance=DEFAULT_TOLERANCE):
+        """
+        Args:
+            mode: 判定モード（COMPARATOR_MODES のキー）
+            tolerance: 誤差許容モードの絶対誤差・相対誤差の許容値
+        """
+        if mode not in COMPARATOR_MODES:
+            raise ValueError(f"不明な判定モードです: {mode}")
+        self.mode = mode
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_dict(cls, spec):
+        """辞書形式の設定から作成（Noneならデフォルト）"""
+        if not spec:
+            return cls()
+        return cls(
+            spec.get("mode", DEFAULT_MODE), spec.get("tolerance", DEFAULT_TOLERANCE)
+        )
+
+    def to_dict(self):
+        """辞書形式の設定に変換"""
+        return {"mode": self.mode, "tolerance": self.tolerance}
+
+    @property
+    def label(self):
+        """表示用の名前"""
+        if self.mode == MODE_FLOAT:
+            return f"{COMPARATOR_MODES[self.mode]} ({self.tolerance:g})"
+        return COMPARATOR_MODES[self.mode]
+
+    def matcher(self, expected):
+        """期待される出力と逐次比較するオブジェクトを作成"""
+        if self.mode == MODE_EXACT:
+            return TextMatcher(expected, ignore_case=False)
+        if self.mode == MODE_CASE_INSENSITIVE:
+            return TextMatcher(expected, ignore_case=True)
+        if self.mode == MODE_TOKEN:
+            return TokenMatcher(expected)
+        return FloatMatcher(expected, self.tolerance, self.tolerance)
+
+    def compare(self, actual, expected):
+        """実際の出力と期待される出力を比較"""
+        matcher = self.matcher(expected)
+        return matcher.feed(actual) and matcher.finish()
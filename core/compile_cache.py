@@ -0,0 +1,181 @@
+import os
+import re
+import hashlib
+import marshal
+import tempfile
+import threading
+import importlib.util
+
+# import 文（from X import ... / import X, Y as Z）のモジュール名
+IMPORT_PATTERN = re.compile(
+    r"^[ \t]*(?:from[ \t]+([A-Za-z_]\w*)|import[ \t]+([A-Za-z_][\w \t,.]*))",
+    re.MULTILINE,
+)
+
+
+def local_modules(code_file, source=None):
+    """
+    解答コードがインポートする、同じディレクトリにあるモジュールのファイル
+
+    ライブラリとして分けた補助モジュールなど。そのモジュールがさらにインポートするものも含む
+
+    Args:
+        source: 解答コードの内容（省略時はファイルから読み込む）
+
+    Returns:
+        モジュールのファイルの絶対パスのリスト（ソート済み）
+    """
+    path = os.path.abspath(code_file)
+    directory = os.path.dirname(path)
+    seen = {path}
+    found = []
+    pending = [(path, source)]
+    while pending:
+        module_path, text = pending.pop()
+        if text is None:
+            try:
+                with open(module_path, "rb") as f:
+                    text = f.read()
+            except OSError:
+                continue
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", "replace")
+
+        for match in IMPORT_PATTERN.finditer(text):
+            if match.group(1):
+                names = [match.group(1)]
+            else:
+                names = [
+                    part.split()[0].split(".")[0]
+                    for part in match.group(2).split(",")
+                    if part.strip()
+                ]
+            for name in names:
+                module = os.path.join(directory, f"{name}.py")
+                if module not in seen and os.path.isfile(module):
+                    seen.add(module)
+                    found.append(module)
+                    pending.append((module, None))
+    return sorted(found)
+
+
+class CompiledSolution:
+    """コンパイル済みの解答コード"""
+
+    def __init__(self, code_file, source_hash, pyc_path, code, dependencies=()):
+        self.code_file = code_file
+        self.source_hash = source_hash  # 同じディレクトリの補助モジュールの内容も含む
+        self.pyc_path = pyc_path
+        self.code = code
+        self.dependencies = list(dependencies)  # 補助モジュールのファイル
+
+
+class CompileCache:
+    """
+    解答コードのバイトコードをソースのハッシュごとにキャッシュするクラス
+
+    全テストケースで同じ.pycを使い回すことで、子プロセスごとの
+    読み込みとコンパイルを省略する
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Args:
+            cache_dir: .pycを保存するディレクトリ（省略時は一時ディレクトリ）
+        """
+        self.cache_dir = cache_dir or os.path.join(
+            tempfile.gettempdir(), "atcoder_test_tool", "pyc"
+        )
+        # コードファイルの絶対パス -> (ファイルの状態, CompiledSolution)
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def compile(self, code_file):
+        """
+        コードファイルをコンパイルしてキャッシュする
+
+        コードファイルと補助モジュールの更新時刻とサイズが変わっていなければ読み込みも省略する。
+        補助モジュールの内容もハッシュに含めるため、補助モジュールだけを変更しても
+        実行結果のキャッシュは使われない
+
+        Raises:
+            SyntaxError: コードに構文エラーがある場合
+        """
+        path = os.path.abspath(code_file)
+
+        with self.lock:
+            entry = self.entries.get(path)
+        if entry and entry[0] == _file_state([path] + entry[1].dependencies):
+            return entry[1]
+
+        state = _file_state([path])
+        with open(path, "rb") as f:
+            source = f.read()
+        dependencies = local_modules(path, source)
+        digest = hashlib.sha256(source)
+        for module in dependencies:
+            state += _file_state([module])
+            try:
+                with open(module, "rb") as f:
+                    module_source = f.read()
+            except OSError:
+                continue
+            digest.update(b"\0" + os.path.basename(module).encode("utf-8"))
+            digest.update(b"\0" + module_source)
+        source_hash = digest.hexdigest()
+
+        # 保存しただけで内容が同じならコンパイルし直さない
+        if entry and entry[1].source_hash == source_hash:
+            with self.lock:
+                self.entries[path] = (state, entry[1])
+            return entry[1]
+
+        code = compile(source, code_file, "exec")
+        pyc_path = self._write_pyc(source, source_hash, code)
+        compiled = CompiledSolution(
+            code_file, source_hash, pyc_path, code, dependencies
+        )
+
+        with self.lock:
+            old_entry = self.entries.get(path)
+            self.entries[path] = (state, compiled)
+
+        # 古い.pycは不要なので削除
+        if old_entry and old_entry[1].pyc_path != pyc_path:
+            try:
+                os.remove(old_entry[1].pyc_path)
+            except OSError:
+                pass
+
+        return compiled
+
+    def _write_pyc(self, source, source_hash, code):
+        """ハッシュベースの.pycとして書き出す"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pyc_path = os.path.join(self.cache_dir, f"{source_hash}.pyc")
+        if os.path.exists(pyc_path):
+            return pyc_path
+
+        data = bytearray(importlib.util.MAGIC_NUMBER)
+        data.extend((0b01).to_bytes(4, "little"))  # ハッシュベース（未検証）
+        data.extend(importlib.util.source_hash(source))
+        data.extend(marshal.dumps(code))
+
+        # 並列実行中の読み込みと競合しないように一時ファイルから置き換える
+        tmp_path = f"{pyc_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, pyc_path)
+        return pyc_path
+
+
+def _file_state(paths):
+    """ファイルごとの (更新時刻, サイズ)（ないファイルは None）"""
+    state = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            state.append(None)
+    return tuple(state)
@@ -0,0 +1,180 @@
+import math
+from core.tester import run_python_test, kill_timeout
+
+# 計算量のモデル（表示名, N -> 計算量の目安）
+COMPLEXITY_MODELS = [
+    ("O(log N)", lambda n: math.log2(n)),
+    ("O(√N)", lambda n: math.sqrt(n)),
+    ("O(N)", lambda n: n),
+    ("O(N log N)", lambda n: n * math.log2(n)),
+    ("O(N log² N)", lambda n: n * math.log2(n) ** 2),
+    ("O(N√N)", lambda n: n**1.5),
+    ("O(N²)", lambda n: n**2),
+    ("O(N² log N)", lambda n: n**2 * math.log2(n)),
+    ("O(N³)", lambda n: n**3),
+    ("O(2^N)", lambda n: 2.0 ** min(n, 1000)),
+]
+
+# 当てはめで扱う計算量の目安の上限（これを超えるモデルは候補から外す）
+MAX_MODEL_VALUE = 1e100
+
+# 制約が分からない場合の最大N
+DEFAULT_MAX_N = 2 * 10**5
+
+# 入力サイズとして扱う上限（これより大きい範囲の変数は入力サイズではないとみなす）
+MAX_INPUT_SIZE = 10**7
+
+# 計測する入力サイズの数（最大Nから √10 倍ずつ小さくする）
+SCALING_POINTS = 7
+
+# 各サイズで解答コードを実行する回数（最短の時間を使う）
+SCALING_REPEAT = 3
+
+# ジェネレータの強制終了までの時間（秒）
+GENERATOR_TIMEOUT = 30
+
+
+def fit_complexity(sizes, times):
+    """
+    計測した実行時間を各モデルの 時間 = a + b × f(N) に当てはめる
+
+    誤差は相対誤差で評価するため、小さいNの計測も大きいNと同じ重みで扱われる。
+    a は起動などの定数時間で、負にならないように制限する
+
+    Returns:
+        label, a, b, error（相対誤差の二乗平均平方根）をキーに持つ辞書のリスト（誤差の小さい順）
+    """
+    fits = []
+    for label, model in COMPLEXITY_MODELS:
+        xs = [model(n) for n in sizes]
+        if max(xs) > MAX_MODEL_VALUE:
+            continue
+        a, b = _weighted_least_squares(xs, times)
+        if b <= 0:
+            continue
+        error = math.sqrt(
+            sum(((a + b * x) / t - 1) ** 2 for x, t in zip(xs, times)) / len(times)
+        )
+        fits.append({"label": label, "a": a, "b": b, "error": error, "model": model})
+
+    fits.sort(key=lambda fit: fit["error"])
+    return fits
+
+
+def _weighted_least_squares(xs, ts):
+    """重み 1/t² で t = a + b x を当てはめる（a < 0 になる場合は a = 0 で当てはめ直す）"""
+    ws = [1 / (t * t) for t in ts]
+    sw = sum(ws)
+    sx = sum(w * x for w, x in zip(ws, xs))
+    st = sum(w * t for w, t in zip(ws, ts))
+    sxx = sum(w * x * x for w, x in zip(ws, xs))
+    sxt = sum(w * x * t for w, x, t in zip(ws, xs, ts))
+
+    det = sw * sxx - sx * sx
+    if det > 0:
+        a = (sxx * st - sx * sxt) / det
+        b = (sw * sxt - sx * st) / det
+        if a >= 0:
+            return a, b
+    return 0.0, (sxt / sxx if sxx > 0 else 0.0)
+
+
+def estimate_time(fit, n):
+    """当てはめたモデルで入力サイズ n の実行時間を推定"""
+    return fit["a"] + fit["b"] * fit["model"](n)
+
+
+def default_max_n(constraints):
+    """
+    制約から計測する最大Nを求める
+
+    N があればその上限、なければ入力サイズらしい変数（大文字1文字）の上限の最大値
+    """
+    bounds = (constraints or {}).get("bounds", {})
+    candidates = [
+        bound["max"]
+        for name, bound in bounds.items()
+        if len(name) == 1
+        and name.isupper()
+        and isinstance(bound["max"], int)
+        and 0 < bound["max"] <= MAX_INPUT_SIZE
+    ]
+    n_bound = bounds.get("N", {}).get("max")
+    if isinstance(n_bound, int) and 0 < n_bound <= MAX_INPUT_SIZE:
+        return n_bound
+    return max(candidates) if candidates else DEFAULT_MAX_N
+
+
+def scaling_sizes(max_n, points=SCALING_POINTS):
+    """最大Nまでの計測する入力サイズ（小さい順）"""
+    return sorted({max(1, round(max_n / 10 ** (k / 2))) for k in range(points)})
+
+
+def run_scaling(
+    solution,
+    generator,
+    limits,
+    sizes,
+    zygote=None,
+    python="python",
+    on_measure=None,
+):
+    """
+    入力サイズを変えながら解答コードを実行し、実行時間を計測する
+
+    ジェネレータには標準入力でNを渡す。各サイズで SCALING_REPEAT 回実行して
+    最短のCPU時間（取れない環境では経過時間）を使う。
+    実行時間制限を超えたサイズより大きいサイズは計測しない
+
+    Args:
+        solution, generator: (ファイル名, コンパイル済みのコード) のタプル
+        on_measure: on_measure(N, 時間) を計測ごとに呼ぶ関数
+
+    Returns:
+        (計測できたサイズのリスト, 時間のリスト, エラーメッセージまたはNone) のタプル
+    """
+    measured_sizes = []
+    times = []
+    for n in sizes:
+        generated = run_python_test(
+            generator[0],
+            str(n),
+            timeout=GENERATOR_TIMEOUT,
+            zygote=zygote,
+            compiled=generator[1],
+            python=python,
+        )
+        if not generated["success"]:
+            return measured_sizes, times, f"N={n} でジェネレータが異常終了しました"
+
+        best = None
+        for _ in range(SCALING_REPEAT):
+            result = run_python_test(
+                solution[0],
+                generated["output"],
+                timeout=kill_timeout(limits),
+                zygote=zygote,
+                compiled=solution[1],
+                python=python,
+            )
+            if result.get("timed_out"):
+                break
+            if not result["success"]:
+                return measured_sizes, times, f"N={n} で解答コードが異常終了しました"
+            used = result.get("cpu_time")
+            if used is None:
+                used = result.get("time")
+            # 計測の分解能より短い時間は分解能に揃える
+            used = max(used or 0.0, 1e-4)
+            best = used if best is None else min(best, used)
+
+        if best is None:
+            break
+        measured_sizes.append(n)
+        times.append(best)
+        if on_measure:
+            on_measure(n, best)
+        if best > limits["time_limit"]:
+            break
+
+    return measured_sizes, times, None
@@ -0,0 +1,204 @@
+"""
+GUIに依存しないテストの実行エンジン
+
+TestRunner（GUI）とコマンドライン（core/cli.py）の両方から使う。
+tkinter などのGUIのモジュールはインポートしない
+"""
+
+import traceback
+from core.tester import (
+    judge_result,
+    kill_timeout,
+    DEFAULT_LIMITS,
+    VERDICT_AC,
+    VERDICT_CE,
+)
+from core.scheduler import TestScheduler
+from core.compile_cache import CompileCache
+from core.result_cache import (
+    ResultCache,
+    judge_key,
+    RUNNER_SUBPROCESS,
+    RUNNER_ZYGOTE,
+)
+
+
+def load_cases(test_cases):
+    """
+    問題情報のテストケース（辞書）を (名前, 入力, 期待される出力) のリストに変換
+
+    入力と期待される出力は画面に表示するときと同じように前後の空白を取り除く
+    """
+    cases = []
+    for index, test_case in enumerate(test_cases):
+        title = test_case.get("input_title") or f"入力例 {index + 1}"
+        cases.append(
+            (
+                title,
+                (test_case.get("input") or "").strip(),
+                (test_case.get("expected_output") or "").strip(),
+            )
+        )
+    return cases
+
+
+def all_passed(reports):
+    """すべてのテストケースがACかどうか"""
+    return bool(reports) and all(report["verdict"] == VERDICT_AC for report in reports)
+
+
+class TestEngine:
+    """
+    解答コードをコンパイルしてテストケースを実行し、判定するクラス
+
+    実行結果は辞書 {index, title, verdict, result, expected_output} のリスト（レポート）で返す
+    """
+
+    def __init__(self, scheduler=None, compile_cache=None, result_cache=None):
+        self.scheduler = scheduler or TestScheduler()
+        self.compile_cache = compile_cache or CompileCache()
+        self.result_cache = result_cache or ResultCache()
+
+    def compile(self, code_file):
+        """解答コードをコンパイルする（構文エラーなら SyntaxError）"""
+        return self.compile_cache.compile(code_file)
+
+    def run_cases(
+        self,
+        code_file,
+        cases,
+        compiled=None,
+        limits=None,
+        comparator=None,
+        python="python",
+        zygote=None,
+        use_cache=True,
+        cancelled=None,
+        on_result=None,
+    ):
+        """
+        テストケースをスケジューラで実行して判定する
+
+        Args:
+            cases: テストケースごとの (入力, 期待される出力) か
+                (名前, 入力, 期待される出力) のリスト
+            compiled: compile で作成したコンパイル済みの解答コード
+                （Noneなら結果のキャッシュは使わない）
+            on_result: 判定が終わったものから on_result(index, verdict, result) を呼ぶ
+                （キャッシュの結果は実行より先に呼ばれる）
+            cancelled: 中止を指示する threading.Event。セットされたら残りのケースは
+                実行せず、結果も返さない
+
+        Returns:
+            判定が終わったテストケースのレポートの番号順のリスト
+        """
+        limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        timeout = kill_timeout(limits)
+        use_cache = use_cache and compiled is not None
+        if use_cache:
+            # ゾイゴートを起動できなければ subprocess で実行されるので、実際の起動方法で分ける
+            runner = (
+                RUNNER_ZYGOTE
+                if zygote is not None and zygote.ensure_started()
+                else RUNNER_SUBPROCESS
+            )
+        titles = []
+        expected_outputs = []
+        cache_keys = []
+        judge_keys = []
+        cached_results = {}
+        jobs = []
+        job_cases = []  # ジョブの番号 -> テストケースの番号
+        for index, case in enumerate(cases):
+            title, input_data, expected_output = (
+                case if len(case) == 3 else (f"入力例 {index + 1}", *case)
+            )
+            titles.append(title)
+            expected_outputs.append(expected_output)
+
+            # コード・入力・ランタイム・起動方法が前回と同じなら実行しない
+            if use_cache:
+                cache_keys.append(
+                    self.result_cache.key(
+                        compiled.source_hash, input_data, python, runner
+                    )
+                )
+                judge_keys.append(
+                    judge_key(expected_output, limits["output_limit"], comparator)
+                )
+                cached = self.result_cache.get(
+                    cache_keys[index], timeout, judge_keys[index]
+                )
+                if cached is not None:
+                    cached_results[index] = cached
+                    continue
+
+            job_cases.append(index)
+            jobs.append(
+                {
+                    "code_file": code_file,
+                    "input_data": input_data,
+                    "timeout": timeout,
+                    "zygote": zygote,
+                    "compiled": compiled,
+                    "expected_output": expected_output,
+                    "output_limit": limits["output_limit"],
+                    "comparator": comparator,
+                    "python": python,
+                }
+            )
+
+        reports = {}
+
+        def report_result(index, result):
+            if cancelled is not None and cancelled.is_set():
+                return
+            # 実行制限と期待される出力から判定
+            verdict = judge_result(result, expected_outputs[index], limits, comparator)
+            reports[index] = {
+                "index": index,
+                "title": titles[index],
+                "verdict": verdict,
+                "result": result,
+                "expected_output": expected_outputs[index],
+            }
+            if on_result:
+                on_result(index, verdict, result)
+
+        def on_job_result(job_index, result):
+            index = job_cases[job_index]
+            if use_cache:
+                self.result_cache.put(
+                    cache_keys[index], result, timeout, judge_keys[index]
+                )
+            report_result(index, result)
+
+        for index, result in cached_results.items():
+            report_result(index, result)
+
+        self.scheduler.run(jobs, on_job_result, cancelled)
+
+        return [reports[index] for index in sorted(reports)]
+
+    def run_solution(self, code_file, cases, **options):
+        """
+        解答コードをコンパイルしてからテストケースを実行する
+
+        構文エラーなら全テストケースをCEとしたレポートを返す
+        （options は run_cases と同じ）
+        """
+        try:
+            compiled = self.compile(code_file)
+        except SyntaxError as e:
+            message = "".join(traceback.format_exception_only(type(e), e))
+            return [
+                {
+                    "index": index,
+                    "title": case[0] if len(case) == 3 else f"入力例 {index + 1}",
+                    "verdict": VERDICT_CE,
+                    "result": {"output": "", "error": message},
+                    "expected_output": case[-1],
+                }
+                for index, case in enumerate(cases)
+            ]
+        return self.run_cases(code_file, cases, compiled=compiled, **options)
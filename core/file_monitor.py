@@ -1,24 +1,233 @@
 import os
+import sys
 import time
+import select
+import struct
+import hashlib
 import threading
 
+# inotify のイベント（linux/inotify.h）
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
 
-class FileMonitor:
-    def __init__(self, file_path, callback, interval=1.0):
+# ディレクトリに対して監視するイベント
+# （書き込みの完了・別名で保存してからの置き換え・touch と、ディレクトリ自体の削除や移動）
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_TO
+    | IN_ATTRIB
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+# inotify_event の固定長部分（wd, mask, cookie, len）
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """
+    inotify で複数のディレクトリを監視する（Linux のみ）
+
+    wait() はイベントが来るか wake() が呼ばれるまでCPUを使わずに待つ
+    """
+
+    def __init__(self, libc):
+        self.libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(self._errno(), "inotify_init1 に失敗しました")
+        self.wake_r, self.wake_w = os.pipe()
+        os.set_blocking(self.wake_r, False)
+        self.watches = {}  # ウォッチ -> ディレクトリ
+        self.directories = {}  # ディレクトリ -> ウォッチ
+
+    @classmethod
+    def create(cls):
+        """inotify を使えなければNone"""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            import ctypes
+
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [
+                ctypes.c_int,
+                ctypes.c_char_p,
+                ctypes.c_uint32,
+            ]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            return cls(libc)
+        except (ImportError, AttributeError, OSError) as e:
+            print(f"inotify を使えないため定期的に確認します: {str(e)}")
+            return None
+
+    def _errno(self):
+        import ctypes
+
+        return ctypes.get_errno()
+
+    def sync(self, directories):
         """
-        ファイルの変更を監視するクラス
+        監視するディレクトリを directories にする
+
+        Returns:
+            監視できなかった（まだないなどの）ディレクトリの集合
+        """
+        for directory in list(self.directories):
+            if directory not in directories:
+                self.libc.inotify_rm_watch(self.fd, self.directories[directory])
+                self._forget(directory)
+
+        failed = set()
+        for directory in directories:
+            if directory in self.directories:
+                continue
+            wd = self.libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), WATCH_MASK
+            )
+            if wd < 0:
+                failed.add(directory)
+                continue
+            self.watches[wd] = directory
+            self.directories[directory] = wd
+        return failed
+
+    def _forget(self, directory):
+        wd = self.directories.pop(directory, None)
+        self.watches.pop(wd, None)
+
+    def wait(self, timeout=None):
+        """
+        イベントを待つ
+
+        Returns:
+            変更されたファイルのパスの集合（タイムアウトまたは wake() ならNone）
+        """
+        readable, _, _ = select.select([self.fd, self.wake_r], [], [], timeout)
+        if self.wake_r in readable:
+            try:
+                os.read(self.wake_r, 4096)
+            except BlockingIOError:
+                pass
+        if self.fd not in readable:
+            return None
+
+        paths = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + length].split(b"\0", 1)[0]
+                offset += length
+                directory = self.watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    # ディレクトリがなくなったら監視をやめる（次の sync で監視し直す）
+                    if not mask & IN_IGNORED:
+                        self.libc.inotify_rm_watch(self.fd, wd)
+                    self._forget(directory)
+                elif name:
+                    paths.add(os.path.join(directory, os.fsdecode(name)))
+        return paths
+
+    def wake(self):
+        """wait() を終わらせる（別のスレッドから呼ぶ）"""
+        try:
+            os.write(self.wake_w, b"\0")
+        except OSError:
+            pass
+
+    def close(self):
+        for fd in (self.fd, self.wake_r, self.wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
 
+class _WatchedFile:
+    """監視しているファイルの状態と購読者"""
+
+    def __init__(self, path):
+        self.path = path
+        self.callbacks = []
+        self.stat = None  # (更新時刻, サイズ)
+        self.digest = None  # 最後に通知した（または購読を始めたときの）内容のハッシュ
+
+
+class FileMonitor:
+    """
+    複数のファイルの変更を監視して、変更されたファイルの購読者だけに通知するクラス
+
+    開いている問題の解答コードや、解答コードがインポートする補助モジュールなどを
+    まとめて監視する。Linux ではファイルのあるディレクトリを inotify で監視し、
+    保存されたらすぐに確認する（別名で保存してから置き換えるエディタにも対応する）。
+    inotify を使えない環境では interval ごとに更新日時を確認する。
+    更新日時が変わっても内容のハッシュが同じなら通知しない
+    """
+
+    def __init__(self, interval=1.0):
+        """
         Args:
-            file_path: 監視するファイルのパス
-            callback: ファイルが変更されたときに呼び出す関数
-            interval: チェック間隔（秒）
+            interval: チェック間隔（秒）（inotify を使えないときとディレクトリがないとき）
         """
-        self.file_path = file_path
-        self.callback = callback
         self.interval = interval
-        self.last_modified_time = 0
+        self.files = {}  # 絶対パス -> _WatchedFile
+        self.lock = threading.Lock()
         self.running = False
         self.thread = None
+        self.inotify = None
+
+    def subscribe(self, path, callback):
+        """
+        ファイルの変更を購読する
+
+        callback(path) は内容が変わったときに監視スレッドから呼ばれる
+        （購読を始めた時点の内容は通知しない）。同じ購読を重ねても1回だけ呼ぶ
+        """
+        path = os.path.abspath(path)
+        stat, digest = _read_state(path)
+        with self.lock:
+            watched = self.files.get(path)
+            if watched is None:
+                watched = self.files[path] = _WatchedFile(path)
+                watched.stat, watched.digest = stat, digest
+            if callback not in watched.callbacks:
+                watched.callbacks.append(callback)
+        if self.inotify:
+            self.inotify.wake()
+
+    def unsubscribe(self, path, callback=None):
+        """購読をやめる（callback を省略するとそのファイルの購読をすべてやめる）"""
+        path = os.path.abspath(path)
+        with self.lock:
+            watched = self.files.get(path)
+            if watched is None:
+                return
+            if callback is not None and callback in watched.callbacks:
+                watched.callbacks.remove(callback)
+            if callback is None or not watched.callbacks:
+                del self.files[path]
+        if self.inotify:
+            self.inotify.wake()
+
+    def watched_files(self):
+        """監視しているファイルのパスのリスト"""
+        with self.lock:
+            return list(self.files)
 
     def start(self):
         """監視を開始"""
@@ -26,28 +235,95 @@ class FileMonitor:
             return
 
         self.running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
+        self.thread = threading.Thread(target=self._run, daemon=True)
         self.thread.start()
 
     def stop(self):
         """監視を停止"""
         self.running = False
+        if self.inotify:
+            self.inotify.wake()
         if self.thread:
             self.thread.join(timeout=self.interval * 2)
             self.thread = None
 
+    def _run(self):
+        # ctypes の読み込みで起動を遅らせないように、監視スレッドで準備する
+        self.inotify = _Inotify.create()
+        if self.inotify is None:
+            self._monitor_loop()
+            return
+        try:
+            self._watch_loop()
+        finally:
+            self.inotify.close()
+
     def _monitor_loop(self):
-        """監視ループ"""
+        """監視ループ（定期的にすべてのファイルを確認する）"""
         while self.running:
-            if self.file_path and os.path.exists(self.file_path):
-                current_mtime = os.path.getmtime(self.file_path)
-                if current_mtime != self.last_modified_time:
-                    self.last_modified_time = current_mtime
-                    if self.callback:
-                        self.callback()
+            self._check(self.watched_files())
             time.sleep(self.interval)
 
-    def update_file_path(self, new_path):
-        """監視するファイルを変更"""
-        self.file_path = new_path
-        self.last_modified_time = 0  # リセット
+    def _watch_loop(self):
+        """監視ループ（inotify のイベントを待つ）"""
+        unwatched = set()  # 監視できなかったディレクトリ
+        while self.running:
+            paths = self.watched_files()
+            directories = {os.path.dirname(path) for path in paths}
+            unwatched = self.inotify.sync(directories)
+
+            # ディレクトリを監視できないとき（まだないときなど）だけ定期的に確認する
+            timeout = self.interval if unwatched else None
+            changed = self.inotify.wait(timeout)
+            if not self.running:
+                break
+            if changed is None:
+                self._check(
+                    [path for path in paths if os.path.dirname(path) in unwatched]
+                )
+            else:
+                self._check(changed)
+
+    def _check(self, paths):
+        """内容が変わったファイルの購読者に通知する"""
+        for path in paths:
+            with self.lock:
+                watched = self.files.get(path)
+                if watched is None:
+                    continue
+                last_stat = watched.stat
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if (stat.st_mtime_ns, stat.st_size) == last_stat:
+                continue
+
+            stat, digest = _read_state(path)
+            with self.lock:
+                watched = self.files.get(path)
+                if watched is None:
+                    continue
+                watched.stat = stat
+                if digest is None or digest == watched.digest:
+                    # 保存し直しただけで内容が同じなら通知しない
+                    continue
+                watched.digest = digest
+                callbacks = list(watched.callbacks)
+
+            for callback in callbacks:
+                try:
+                    callback(path)
+                except Exception as e:
+                    print(f"ファイルの変更の通知に失敗しました: {str(e)}")
+
+
+def _read_state(path):
+    """ファイルの (更新時刻, サイズ) と内容のハッシュ（読めなければ None, None）"""
+    try:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+    except OSError:
+        return None, None
+    return (stat.st_mtime_ns, stat.st_size), digest
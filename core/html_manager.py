@@ -1,5 +1,10 @@
+import os
 import threading
-from core.parser import parse_problem_html
+from collections import Counter
+from core.parse_cache import ParseCache
+
+# 一括読み込みで読み込むファイルの拡張子
+PAGE_EXTENSIONS = (".html", ".htm")
 
 
 class HTMLManager:
@@ -9,11 +14,20 @@ class HTMLManager:
         self.app_controller = app_controller
         self.parsing = False
 
+        # 解析済みのHTMLの結果（同じページの貼り付けは解析し直さない）
+        self.parse_cache = ParseCache()
+
     def start_parsing(self, html_content):
         """HTML解析を別スレッドで開始"""
         if self.parsing:
             return False  # 既に解析中なら何もしない
 
+        # 解析済みのHTMLならスレッドを起動せずにすぐ結果を反映する
+        problem_info = self.parse_cache.get(html_content)
+        if problem_info is not None:
+            self._on_parsing_complete(True, problem_info)
+            return True
+
         self.parsing = True
         self.app_controller.ui.show_loading(True)  # ローディング表示を開始
 
@@ -23,25 +37,168 @@ class HTMLManager:
         ).start()
         return True
 
+    def start_import(self, paths):
+        """
+        保存した問題ページからコンテストの問題をまとめて読み込む（別スレッド）
+
+        Args:
+            paths: 問題ページのファイル（「すべての問題を印刷」のページも可）またはフォルダ
+        """
+        if self.parsing:
+            return False
+
+        self.parsing = True
+        self.app_controller.ui.show_loading(True)
+        threading.Thread(
+            target=self._import_files_thread, args=(list(paths),), daemon=True
+        ).start()
+        return True
+
+    def preload_parser(self):
+        """
+        HTMLの解析に使うモジュールを別スレッドで読み込んでおく
+
+        起動時ではなくウィンドウの表示後に呼ぶ（BeautifulSoup は高速な抽出に
+        失敗したときだけ使うため、ここでは読み込まない）
+        """
+        threading.Thread(target=self._import_parser, daemon=True).start()
+
+    def _import_parser(self):
+        try:
+            import core.parser
+        except ImportError as e:
+            print(f"HTMLの解析モジュールを読み込めません: {str(e)}")
+
     def _parse_html_thread(self, html_content):
         """別スレッドでHTML解析を実行"""
         try:
+            from core.parser import parse_problem_html, split_problem_pages
+
+            # 「すべての問題を印刷」のページならコンテストの問題をまとめて読み込む
+            pages = split_problem_pages(html_content)
+            if len(pages) > 1:
+                self._import_pages(pages)
+                return
+
             problem_info = parse_problem_html(html_content)
 
+            # 入力例が見つかったものだけ保存する（入力途中のHTMLなどは保存しない）
+            if problem_info["test_cases"]:
+                self.parse_cache.put(html_content, problem_info)
+
             # 解析成功時は、メインスレッドで情報を更新して画面切り替え
-            self.app_controller.root.after(
-                0, lambda: self._on_parsing_complete(True, problem_info)
+            self.app_controller.dispatcher.post(
+                self._on_parsing_complete, True, problem_info
             )
         except Exception as e:
             print(f"HTMLの解析に失敗しました: {str(e)}")
             # 解析失敗時はエラーメッセージを表示
-            self.app_controller.root.after(
-                0, lambda: self._on_parsing_complete(False, None, str(e))
+            self.app_controller.dispatcher.post(
+                self._on_parsing_complete, False, None, str(e)
             )
         finally:
             # 解析終了フラグを設定
             self.parsing = False
 
+    def _import_files_thread(self, paths):
+        """別スレッドでファイルを読み込んで解析"""
+        try:
+            from core.parser import split_problem_pages
+
+            pages = []
+            for path in self._list_page_files(paths):
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    pages.extend(split_problem_pages(f.read()))
+            self._import_pages(pages)
+        except Exception as e:
+            print(f"問題ページの読み込みに失敗しました: {str(e)}")
+            self.app_controller.dispatcher.post(
+                self._on_parsing_complete, False, None, str(e)
+            )
+        finally:
+            self.parsing = False
+
+    def _list_page_files(self, paths):
+        """フォルダはその中の問題ページのファイルに展開する（ファイル名の順）"""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(
+                    os.path.join(path, name)
+                    for name in sorted(os.listdir(path))
+                    if name.lower().endswith(PAGE_EXTENSIONS)
+                )
+            else:
+                files.append(path)
+        return files
+
+    def _import_pages(self, pages):
+        """
+        複数の問題ページを解析して、結果をまとめてメインスレッドに渡す
+
+        解析済みのページ以外はワーカープロセスで並列に解析する
+        """
+        from core.parser import parse_problem_pages
+
+        problem_infos = [self.parse_cache.get(page) for page in pages]
+        missing = [
+            i for i, problem_info in enumerate(problem_infos) if problem_info is None
+        ]
+        failed = 0
+        parsed = parse_problem_pages([pages[i] for i in missing])
+        for i, (problem_info, error_message) in zip(missing, parsed):
+            if problem_info is None:
+                print(f"HTMLの解析に失敗しました: {error_message}")
+                failed += 1
+                continue
+            if problem_info["test_cases"]:
+                self.parse_cache.put(pages[i], problem_info)
+            problem_infos[i] = problem_info
+
+        self.app_controller.dispatcher.post(
+            self._on_import_complete,
+            [problem_info for problem_info in problem_infos if problem_info],
+            failed,
+        )
+
+    def _on_import_complete(self, problem_infos, failed):
+        """一括読み込みの完了時の処理（問題タブをまとめて作る）"""
+        self.app_controller.ui.show_loading(False)
+
+        # タブを作れる問題だけを、問題IDごとに1つ
+        problems = {}
+        for problem_info in problem_infos:
+            if (
+                problem_info["problem_id"]
+                and problem_info["problem_title"]
+                and problem_info["contest_number"]
+                and problem_info["test_cases"]
+            ):
+                problems.setdefault(problem_info["problem_id"], problem_info)
+        if not problems:
+            self.app_controller.ui.show_status_message(
+                "問題ページが見つかりませんでした", "Error.TLabel"
+            )
+            return
+
+        # 別のコンテストのページが混ざっていたら、最も多いコンテストの問題だけを読み込む
+        contests = Counter(
+            problem_info["contest_number"] for problem_info in problems.values()
+        )
+        contest_number = contests.most_common(1)[0][0]
+        selected = [
+            problem_info
+            for problem_info in problems.values()
+            if problem_info["contest_number"] == contest_number
+        ]
+        self.app_controller.import_problems(selected)
+
+        message = f"ABC {contest_number} の{len(selected)}問を読み込みました"
+        skipped = len(problem_infos) + failed - len(selected)
+        if skipped:
+            message += f"（{skipped}ページは読み込みませんでした）"
+        self.app_controller.ui.show_status_message(message, "Success.TLabel")
+
     def _on_parsing_complete(self, success, problem_info=None, error_message=None):
         """解析完了時の処理"""
         self.app_controller.ui.show_loading(False)  # ローディング表示を終了
@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+# 解析結果の形式や解析の方法を変えたら上げる（古いキャッシュは使わない）
+PARSE_CACHE_VERSION = 1
+
+# ディスクに保存する解析結果の数の上限
+DEFAULT_MAX_ENTRIES = 500
+
+# メモリに保持する解析結果の数
+MEMORY_ENTRIES = 32
+
+
+class ParseCache:
+    """
+    問題ページのHTMLの解析結果を、HTMLのハッシュごとにディスクにキャッシュするクラス
+
+    同じページを何度貼り付けても（アプリを起動し直しても）解析し直さずに結果を返す。
+    保存数の上限を超えたら最も長く使われていないものから削除する
+    """
+
+    def __init__(self, cache_dir=None, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            cache_dir: 解析結果を保存するディレクトリ（省略時は一時ディレクトリ）
+            max_entries: 保存する解析結果の数の上限
+        """
+        self.cache_dir = cache_dir or os.path.join(
+            tempfile.gettempdir(), "atcoder_test_tool", "problems"
+        )
+        self.max_entries = max_entries
+        self.memory = OrderedDict()  # キー -> 解析結果のJSON
+        self.entry_count = None  # ディスクに保存されている数（初回の保存時に数える）
+        self.lock = threading.Lock()
+
+    def key(self, html_content):
+        """HTMLからキャッシュのキーを求める（前後の空白は無視する）"""
+        data = (html_content or "").strip().encode("utf-8", "surrogateescape")
+        digest = hashlib.sha256(data).hexdigest()
+        return f"v{PARSE_CACHE_VERSION}-{digest}"
+
+    def get(self, html_content):
+        """キャッシュされた解析結果を取得する（なければNone）"""
+        key = self.key(html_content)
+        with self.lock:
+            text = self.memory.get(key)
+            if text is not None:
+                self.memory.move_to_end(key)
+
+        if text is None:
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                # 更新時刻をLRUの順序として使う
+                os.utime(path)
+            except OSError:
+                return None
+            self._remember(key, text)
+
+        try:
+            # 呼び出し側が書き換えても影響しないように毎回作り直す
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    def put(self, html_content, problem_info):
+        """解析結果を保存する"""
+        key = self.key(html_content)
+        text = json.dumps(problem_info, ensure_ascii=False)
+        self._remember(key, text)
+
+        path = self._path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            exists = os.path.exists(path)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self.lock:
+            if self.entry_count is None:
+                self.entry_count = len(self._list_entries())
+            elif not exists:
+                self.entry_count += 1
+            if self.entry_count <= self.max_entries:
+                return
+            entries = self._list_entries()
+            self.entry_count = len(entries)
+
+        # 古いものから削除
+        entries.sort()
+        for _, name in entries[: len(entries) - self.max_entries]:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+        with self.lock:
+            self.entry_count = min(self.entry_count, self.max_entries)
+
+    def _remember(self, key, text):
+        """メモリにも保持する"""
+        with self.lock:
+            self.memory[key] = text
+            self.memory.move_to_end(key)
+            while len(self.memory) > MEMORY_ENTRIES:
+                self.memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _list_entries(self):
+        """保存されている解析結果の (更新時刻, ファイル名) のリスト"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for item in it:
+                    if item.name.endswith(".json"):
+                        entries.append((item.stat().st_mtime_ns, item.name))
+        except OSError:
+            pass
+        return entries
@@ -1,12 +1,197 @@
-from bs4 import BeautifulSoup
+import os
 import re
+from html.parser import HTMLParser
+
+# 制約の記述で使われる記号の正規化（TeXのコマンドと全角記号）
+CONSTRAINT_SYMBOLS = [
+    (r"\\leqq?|\\le(?![a-z])|≦", "≤"),
+    (r"\\geqq?|\\ge(?![a-z])|≧", "≥"),
+    (r"\\lt(?![a-z])", "<"),
+    (r"\\gt(?![a-z])", ">"),
+    (r"\\times|\\cdot", "×"),
+    (r"\\lvert|\\rvert|\\mid|\\vert", "|"),
+    (r"\\[,;! ]|\\quad|~", " "),
+    (r"\{,\}", ""),
+    (r"\\\(|\\\)|\$", ""),
+    (r"\|\s*([^|]*?)\s*\|", r"|\1|"),
+]
+
+# 数値の表記（例: 2 × 10^5, 10^{18}, 2^{30}, 200000, -10^9）
+NUMBER_PATTERN = re.compile(
+    r"^(-?)\s*(?:(\d+(?:\.\d+)?)\s*×\s*)?"
+    r"(?:(\d+)\s*\^\s*\{?\s*(\d+)\s*\}?|(\d+(?:\.\d+)?))$"
+)
+
+# 行末の添字の範囲の注記（例: 1 ≤ A_i ≤ 10^9 (1 ≤ i ≤ N) の「(1 ≤ i ≤ N)」）
+INDEX_QUALIFIER_PATTERN = re.compile(r"\s*[(（][^()（）]*[)）]\s*$")
+
+# 変数名の表記（例: N, A_i, A_{i,j}, |S|）
+VARIABLE_PATTERN = re.compile(r"^\|?[A-Za-z](?:_\{?[A-Za-z0-9, ]+\}?)?'?\|?$")
+
+# 問題の見出し（「すべての問題を印刷」のページでは問題ごとに1つある）
+TASK_HEADING_PATTERN = re.compile(r"<span\s[^>]*class=[\"']h2[\"'][^>]*>")
+CONTEST_HREF_PATTERN = re.compile(r"href=[\"'](/contests/[^\"'/?#]+)")
+
+# 複数のページを並列に解析するワーカープロセスの数の上限
+MAX_PARSE_WORKERS = 8
+
+# これより少ないページはプロセスを起動せずに順番に解析する（起動の方が時間がかかる）
+PARALLEL_MIN_PAGES = 3
 
 
 def parse_problem_html(html_content):
-    """HTMLの解析処理"""
+    """
+    HTMLの解析処理
+
+    必要な要素だけを HTMLParser で抜き出す高速な方法で解析し、
+    入力例と出力例が見つからなければ BeautifulSoup で解析し直す
+    """
+    try:
+        problem_info = extract_problem_fast(html_content)
+    except Exception:
+        problem_info = None
+    if problem_info is None or not problem_info["test_cases"]:
+        problem_info = parse_problem_soup(html_content)
+    return problem_info
+
+
+def split_problem_pages(html_content):
+    """
+    「すべての問題を印刷」（tasks_print）のページを問題ごとのHTMLに分ける
+
+    問題の見出しが1つ以下のページはそのまま返す。各問題のHTMLには
+    コンテスト番号を取得できるようにコンテストへのリンクを付ける
+
+    Returns:
+        問題ごとのHTMLのリスト
+    """
+    starts = [match.start() for match in TASK_HEADING_PATTERN.finditer(html_content)]
+    if len(starts) <= 1:
+        return [html_content]
+
+    match = CONTEST_HREF_PATTERN.search(html_content)
+    contest_link = f'<a href="{match.group(1)}"></a>' if match else ""
+    ends = starts[1:] + [len(html_content)]
+    return [contest_link + html_content[start:end] for start, end in zip(starts, ends)]
+
+
+def parse_problem_pages(pages, max_workers=None):
+    """
+    複数の問題ページを並列に解析する
+
+    ページが少なければこのスレッドで順番に解析する
+
+    Returns:
+        ページごとの (問題情報, エラーメッセージ) のリスト（ページと同じ順）
+    """
+    cpu_count = os.cpu_count() or 1
+    if len(pages) < PARALLEL_MIN_PAGES or cpu_count < 2:
+        return [_parse_page(html_content) for html_content in pages]
+
+    # ワーカープロセスを使うときだけインポートする
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(len(pages), max_workers or MAX_PARSE_WORKERS, cpu_count)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_parse_page, pages))
+    except (OSError, RuntimeError) as e:
+        # プロセスを起動できない環境では順番に解析する
+        print(f"ワーカープロセスで解析できません: {str(e)}")
+        return [_parse_page(html_content) for html_content in pages]
+
+
+def _parse_page(html_content):
+    """1ページを解析する（ワーカープロセスで呼ばれる）"""
+    try:
+        return parse_problem_html(html_content), None
+    except Exception as e:
+        return None, str(e)
+
+
+def extract_problem_fast(html_content):
+    """
+    問題ページから必要な要素だけを抜き出して解析（入力例が見つからなければNone）
+
+    日本語の問題文を読み終えた時点（英語の問題文の開始）で解析を打ち切る
+    """
+    extractor = ProblemExtractor()
+    try:
+        extractor.feed(html_content)
+        extractor.close()
+    except _StopParsing:
+        pass
+    if not extractor.sections:
+        return None
+
+    page_text = "".join(extractor.page_text)
+    section = extractor.find_section("制約") or extractor.find_section("Constraints")
+    constraint_lines = []
+    if section:
+        constraint_lines = section["items"] or section["paragraphs"]
+    return _build_problem_info(
+        extractor.title_text,
+        extractor.contest_href,
+        page_text,
+        page_text,
+        constraint_lines,
+        [(section["heading"], section["pre"]) for section in extractor.sections],
+    )
+
+
+def parse_problem_soup(html_content):
+    """BeautifulSoup でページ全体を解析"""
+    # bs4 の読み込みは時間がかかるため、高速な方法で解析できなかったときだけインポートする
+    from bs4 import BeautifulSoup
+
     # HTMLの解析
     soup = BeautifulSoup(html_content, "html.parser")
 
+    # 実行時間制限・メモリ制限はページ全体のテキストから取得
+    limits_text = soup.get_text()
+
+    # 制約の各項目（許容誤差の記述を探す前に数式をTeXのソースに戻す）
+    constraint_lines = _constraint_items(soup)
+
+    task_title = soup.select_one("span.h2")
+    contest_url = soup.select_one('a[href^="/contests/"]')
+
+    # 見出しと最初の pre があるセクション
+    sections = []
+    for part in soup.select("div.part"):
+        section_title = part.select_one("h3")
+        pre_tag = part.select_one("pre")
+        sections.append(
+            (
+                section_title.get_text() if section_title else None,
+                pre_tag.get_text() if pre_tag else None,
+            )
+        )
+
+    return _build_problem_info(
+        task_title.get_text() if task_title else None,
+        contest_url.get("href", "") if contest_url else None,
+        limits_text,
+        soup.get_text(),
+        constraint_lines,
+        sections,
+    )
+
+
+def _build_problem_info(
+    title_text, contest_href, limits_text, statement_text, constraint_lines, sections
+):
+    """
+    ページから抜き出した要素から問題情報を作成
+
+    Args:
+        title_text: span.h2 のテキスト
+        contest_href: 最初のコンテストへのリンク
+        limits_text: 実行制限を探すテキスト
+        statement_text: 許容誤差の記述を探すテキスト
+        constraint_lines: 制約のセクションの各項目のテキスト
+        sections: div.part ごとの (見出し, 最初の pre のテキスト)
+    """
     # 問題情報の初期化
     problem_info = {
         "problem_id": "",
@@ -15,44 +200,48 @@ def parse_problem_html(html_content):
         "test_cases": [],
     }
 
+    # 実行時間制限・メモリ制限の取得
+    limits = parse_limits(limits_text)
+    if limits:
+        problem_info["limits"] = limits
+
+    # 制約の取得
+    constraints = constraints_from_lines(constraint_lines)
+    if constraints["lines"]:
+        problem_info["constraints"] = constraints
+
     # 問題情報の取得
-    task_title = soup.select_one("span.h2")
-    if task_title:
-        title_text = task_title.get_text().strip()
-        match = re.search(r"([A-G]) - (.+)", title_text)
+    if title_text:
+        match = re.search(r"([A-G]) - (.+)", title_text.strip())
         if match:
             problem_info["problem_id"] = match.group(1)
             problem_info["problem_title"] = match.group(2)
 
     # コンテスト番号の取得
-    contest_url = soup.select_one('a[href^="/contests/"]')
-    if contest_url:
-        href = contest_url.get("href", "")
-        match = re.search(r"/contests/([^/]+)", href)
+    if contest_href:
+        match = re.search(r"/contests/([^/]+)", contest_href)
         if match:
             contest_id = match.group(1)
             if contest_id.startswith("abc"):
                 problem_info["contest_number"] = contest_id[3:]  # 'abc395' -> '395'
 
-    # 入力例と出力例の抽出
-    sample_sections = soup.select("div.part")
+    # 許容誤差の記述があれば誤差許容モードで判定する
+    match = re.search(
+        r"(?:絶対誤差|相対誤差|absolute or relative error)[^。.]*?10\s*\^\s*\{?\s*-\s*(\d+)",
+        statement_text,
+    )
+    if match:
+        problem_info["comparator"] = {
+            "mode": "float",
+            "tolerance": 10 ** -int(match.group(1)),
+        }
 
+    # 入力例と出力例の抽出
     input_samples = []
     output_samples = []
-
-    for section in sample_sections:
-        section_title = section.select_one("h3")
-        if not section_title:
-            continue
-
-        title_text = section_title.get_text()
-        pre_tag = section.select_one("pre")
-
-        if not pre_tag:
+    for title_text, sample_text in sections:
+        if title_text is None or sample_text is None:
             continue
-
-        sample_text = pre_tag.get_text()
-
         if "入力例" in title_text:
             input_samples.append((title_text, sample_text))
         elif "出力例" in title_text:
@@ -74,3 +263,304 @@ def parse_problem_html(html_content):
         )
 
     return problem_info
+
+
+class _StopParsing(Exception):
+    """必要な要素がそろったので解析を打ち切る"""
+
+
+class ProblemExtractor(HTMLParser):
+    """
+    問題ページから必要な要素だけを抜き出すパーサー
+
+    ツリーは作らず、タグの開始・終了のイベントから span.h2、コンテストへのリンク、
+    div.part ごとの見出し・最初の pre・項目（li / p）のテキストだけを集める。
+    KaTeXでレンダリング済みの数式は annotation（TeXのソース）だけをテキストとする
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title_text = None
+        self.contest_href = None
+        self.page_text = []  # ページ全体のテキスト（script / style を除く）
+        self.sections = []  # div.part ごとの情報
+
+        self.skip = 0  # script / style の中
+        self.title_parts = None  # 読み込み中の span.h2 のテキスト
+        self.title_depth = 0
+        self.part = None  # 読み込み中の div.part
+        self.part_depth = 0
+        self.captures = []  # テキストを集めている途中のリスト（見出し・pre・項目）
+        self.katex_depth = 0
+        self.in_annotation = False
+
+    def find_section(self, title):
+        """見出しが title のセクションを探す"""
+        for section in self.sections:
+            if section["heading"] is not None and section["heading"].strip() == title:
+                return section
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self.skip += 1
+            return
+        classes = ()
+        for name, value in attrs:
+            if name == "class" and value:
+                classes = value.split()
+            elif name == "href" and tag == "a" and self.contest_href is None:
+                if value and value.startswith("/contests/"):
+                    self.contest_href = value
+
+        if tag == "span":
+            self._start_span(classes)
+        elif tag == "div":
+            if self.part is not None:
+                self.part_depth += 1
+            elif "part" in classes:
+                self.part = {
+                    "heading": None,
+                    "pre": None,
+                    "items": [],
+                    "paragraphs": [],
+                }
+                self.part_depth = 1
+        elif self.part is not None:
+            self._start_part_element(tag)
+        elif tag == "annotation":
+            self.in_annotation = True
+
+    def _start_span(self, classes):
+        if self.title_parts is not None:
+            self.title_depth += 1
+        elif self.title_text is None and "h2" in classes:
+            self.title_parts = []
+            self.title_depth = 1
+
+        if self.katex_depth:
+            self.katex_depth += 1
+        elif "katex" in classes and self.part is not None:
+            self.katex_depth = 1
+
+        # 日本語の問題文を読み終えたら英語の問題文は読まない
+        if "lang-en" in classes and self._has_samples():
+            raise _StopParsing()
+
+    def _start_part_element(self, tag):
+        part = self.part
+        if tag == "h3" and part["heading"] is None:
+            self._begin_capture("heading")
+        elif tag == "pre" and part["pre"] is None:
+            self._begin_capture("pre")
+        elif tag == "li":
+            self._begin_capture("items")
+        elif tag == "p":
+            self._begin_capture("paragraphs")
+        elif tag == "annotation":
+            self.in_annotation = True
+
+    def _begin_capture(self, field):
+        self.captures.append((field, []))
+
+    def _end_capture(self, field):
+        # 対応する開始タグのうち最も内側のものを閉じる
+        for i in range(len(self.captures) - 1, -1, -1):
+            if self.captures[i][0] == field:
+                _, parts = self.captures.pop(i)
+                text = "".join(parts)
+                if field in ("items", "paragraphs"):
+                    self.part[field].append(text)
+                else:
+                    self.part[field] = text
+                return
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            self.skip = max(0, self.skip - 1)
+        elif tag == "span":
+            if self.title_parts is not None:
+                self.title_depth -= 1
+                if self.title_depth == 0:
+                    self.title_text = "".join(self.title_parts)
+                    self.title_parts = None
+            if self.katex_depth:
+                self.katex_depth -= 1
+        elif tag == "annotation":
+            self.in_annotation = False
+        elif self.part is None:
+            return
+        elif tag == "div":
+            self.part_depth -= 1
+            if self.part_depth == 0:
+                # 閉じられていない要素のテキストもそのまま使う
+                while self.captures:
+                    self._end_capture(self.captures[-1][0])
+                self.sections.append(self.part)
+                self.part = None
+        elif tag == "h3":
+            self._end_capture("heading")
+        elif tag == "pre":
+            self._end_capture("pre")
+        elif tag == "li":
+            self._end_capture("items")
+        elif tag == "p":
+            self._end_capture("paragraphs")
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        self.page_text.append(data)
+        if self.title_parts is not None:
+            self.title_parts.append(data)
+        # レンダリング済みの数式はTeXのソースだけを使う
+        if self.katex_depth and not self.in_annotation:
+            return
+        for _, parts in self.captures:
+            parts.append(data)
+
+    def _has_samples(self):
+        """入力例と制約のセクションを読み終えたかどうか"""
+        headings = [section["heading"] or "" for section in self.sections]
+        return any("入力例" in heading for heading in headings) and any(
+            heading.strip() == "制約" for heading in headings
+        )
+
+
+def parse_limits(text):
+    """
+    実行時間制限とメモリ制限を取得
+
+    Returns:
+        time_limit（秒）, memory_limit（KB）をキーに持つ辞書（見つかったものだけ）
+    """
+    limits = {}
+    match = re.search(
+        r"(?:実行時間制限|Time Limit)\s*[:：]\s*(\d+(?:\.\d+)?)\s*sec", text
+    )
+    if match:
+        limits["time_limit"] = float(match.group(1))
+
+    match = re.search(
+        r"(?:メモリ制限|Memory Limit)\s*[:：]\s*(\d+(?:\.\d+)?)\s*(?:MiB|MB)", text
+    )
+    if match:
+        limits["memory_limit"] = int(float(match.group(1)) * 1024)
+    return limits
+
+
+def parse_constraints(soup):
+    """
+    制約のセクションから変数の範囲を取得
+
+    Returns:
+        lines（制約の各行のテキスト）, bounds（変数名 -> {"min", "max"}）をキーに持つ辞書。
+        数値で書かれていない上限・下限はNone
+    """
+    return constraints_from_lines(_constraint_items(soup))
+
+
+def _constraint_items(soup):
+    """制約のセクションの各項目のテキスト"""
+    section = _find_section(soup, "制約") or _find_section(soup, "Constraints")
+    if section is None:
+        return []
+
+    # レンダリング済みの数式はTeXのソースに戻す
+    for rendered in section.select(".katex"):
+        annotation = rendered.select_one("annotation")
+        rendered.replace_with(annotation.get_text() if annotation else "")
+
+    items = section.select("li") or section.select("p")
+    return [item.get_text() for item in items]
+
+
+def constraints_from_lines(lines):
+    """制約の各項目のテキストから変数の範囲を求める（戻り値は parse_constraints と同じ）"""
+    constraints = {"lines": [], "bounds": {}}
+    for text in lines:
+        line = _normalize_constraint(text)
+        if not line:
+            continue
+        constraints["lines"].append(line)
+        for name, lower, upper in _parse_bounds(line):
+            bound = constraints["bounds"].setdefault(name, {"min": None, "max": None})
+            if lower is not None:
+                bound["min"] = lower
+            if upper is not None:
+                bound["max"] = upper
+
+    return constraints
+
+
+def _find_section(soup, title):
+    """見出しが title のセクションを探す"""
+    for section in soup.select("div.part"):
+        heading = section.select_one("h3")
+        if heading and heading.get_text().strip() == title:
+            return section
+    return None
+
+
+def _normalize_constraint(text):
+    """制約の1行の記号を揃える"""
+    for pattern, replacement in CONSTRAINT_SYMBOLS:
+        text = re.sub(pattern, replacement, text)
+    return " ".join(text.split())
+
+
+def _parse_number(text):
+    """数値の表記を数値に変換（数値でなければNone）"""
+    match = NUMBER_PATTERN.match(text.strip())
+    if not match:
+        return None
+    sign, coefficient, base, exponent, plain = match.groups()
+    if plain is not None:
+        value = float(plain) if "." in plain else int(plain)
+    else:
+        value = int(base) ** int(exponent)
+        if coefficient is not None:
+            value = float(coefficient) * value
+            value = int(value) if value.is_integer() else value
+    return -value if sign else value
+
+
+def _parse_bounds(line):
+    """
+    「1 ≤ N, M ≤ 2×10^5」のような不等式の連なりから変数ごとの範囲を求める
+
+    「<」で書かれた整数の範囲は「≤」の範囲に直す。
+    「1 ≤ A_i ≤ 10^9 (1 ≤ i ≤ N)」のような行末の添字の範囲は読まない
+
+    Returns:
+        (変数名, 下限, 上限) のタプルのリスト
+    """
+    line = INDEX_QUALIFIER_PATTERN.sub("", line)
+
+    # 「N ≥ 1」のような向きの不等式は逆向きに読む
+    if not re.search(r"≤|<", line):
+        tokens = re.split(r"(≥|>)", line)[::-1]
+        tokens = [{"≥": "≤", ">": "<"}.get(token, token) for token in tokens]
+    else:
+        tokens = re.split(r"(≤|<)", line)
+    parts = [part.strip() for part in tokens[::2]]
+    operators = tokens[1::2]
+    if len(parts) < 2:
+        return []
+
+    bounds = []
+    for i, part in enumerate(parts):
+        names = [name.strip() for name in part.split(",")]
+        if not all(VARIABLE_PATTERN.match(name) for name in names):
+            continue
+        lower = _parse_number(parts[i - 1]) if i > 0 else None
+        upper = _parse_number(parts[i + 1]) if i + 1 < len(parts) else None
+        if lower is None and upper is None:
+            continue
+        if isinstance(lower, int) and operators[i - 1] == "<":
+            lower += 1
+        if isinstance(upper, int) and operators[i] == "<":
+            upper -= 1
+        for name in names:
+            bounds.append((name.replace("{", "").replace("}", ""), lower, upper))
+    return bounds
@@ -0,0 +1,153 @@
+"""
+問題ページの解析のベンチマーク
+
+    python -m core.parser_benchmark 保存したページ.html ... [--repeat N]
+
+ブラウザで保存した問題ページ（またはクリップボードから貼り付けたHTML）ごとに、
+高速な抽出（extract_problem_fast）と BeautifulSoup による解析の時間を比べ、
+両者の解析結果が一致することを確認する。
+ページを指定しなければ、問題ページと同じ構造の合成ページで計測する
+"""
+
+import sys
+import time
+import argparse
+from core.parser import extract_problem_fast, parse_problem_soup
+
+# 1ページあたりの計測回数
+DEFAULT_REPEAT = 20
+
+
+def _katex(tex, rendered):
+    """KaTeXでレンダリングされた数式のHTML"""
+    return (
+        '<span class="katex"><span class="katex-mathml"><math><semantics><mrow>'
+        f"<mi>{rendered}</mi></mrow>"
+        f'<annotation encoding="application/x-tex">{tex}</annotation>'
+        '</semantics></math></span><span class="katex-html" aria-hidden="true">'
+        '<span class="base"><span class="strut" style="height:0.8em;"></span>'
+        f'<span class="mord mathnormal">{rendered}</span></span></span></span>'
+    )
+
+
+def _statement(lang, samples):
+    """1言語分の問題文"""
+    ja = lang == "ja"
+    headings = (
+        ["問題文", "制約", "入力", "出力", "入力例", "出力例"]
+        if ja
+        else ["Problem Statement", "Constraints", "Input", "Output"]
+        + ["Sample Input", "Sample Output"]
+    )
+    n = _katex("N", "N")
+    sequence = _katex(r"A=(A_1,A_2,\ldots,A_N)", "A")
+    sentence = f"長さ {n} の整数列 {sequence} が与えられます。"
+    bounds = [
+        _katex(r"1 \leq N \leq 2\times 10^5", "N"),
+        _katex(r"1 \leq A_i \leq 10^9", "A"),
+    ]
+    input_format = _katex(r"A_1 A_2 \ldots A_N", "A")
+    parts = [
+        f'<div class="part"><section><h3>{headings[0]}</h3>'
+        f"<p>{sentence * 12}</p></section></div>",
+        f'<div class="part"><section><h3>{headings[1]}</h3><ul>'
+        f"<li>{bounds[0]}</li><li>{bounds[1]}</li>"
+        f"<li>{'入力は全て整数' if ja else 'All input values are integers.'}</li>"
+        "</ul></section></div>",
+        '<hr><div class="io-style">'
+        f'<div class="part"><section><h3>{headings[2]}</h3>'
+        f"<p>{sentence}</p><pre>{n}\n{input_format}</pre></section></div>"
+        f'<div class="part"><section><h3>{headings[3]}</h3>'
+        f"<p>{sentence * 2}</p></section></div></div>",
+    ]
+    for i, (input_data, output_data) in enumerate(samples, 1):
+        for heading, text in ((headings[4], input_data), (headings[5], output_data)):
+            parts.append(
+                f'<div class="part"><section><h3>{heading} {i}'
+                '<span class="btn btn-default btn-sm btn-copy">Copy</span></h3>'
+                f'<pre id="pre-sample{i}">{text}</pre></section></div>'
+            )
+    return f'<span class="lang-{lang}">{"".join(parts)}</span>'
+
+
+def synthetic_page():
+    """問題ページと同じ構造の合成ページ（ナビゲーションやスクリプトを含む）"""
+    samples = [("3\n1 2 3\n", "6\n"), ("1\n1000000000\n", "1000000000\n")]
+    samples.append(("5\n" + " ".join(["123456789"] * 5) + "\n", "617283945\n"))
+    script = "<script>" + "var x = {a: 1, b: [1, 2, 3]};\n" * 2000 + "</script>"
+    nav = "".join(
+        f'<li><a href="/contests/abc400/tasks/abc400_{c}">{c.upper()} - 問題</a></li>'
+        for c in "abcdefg"
+    )
+    menu = "".join(
+        f'<li><a href="/posts/{i}">お知らせ {i}</a></li>' for i in range(300)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>A - Sum</title>"
+        f"{script}<style>{'.x{color:#000}' * 2000}</style></head><body>"
+        f'<nav><ul>{menu}</ul><ul><li><a href="/contests/abc400">AtCoder Beginner '
+        f"Contest 400</a></li>{nav}</ul></nav>"
+        '<div id="main-container"><span class="h2">A - Sum '
+        '<a class="btn btn-default btn-sm" href="/contests/abc400/editorial">解説</a>'
+        "</span><p>実行時間制限: 2 sec / メモリ制限: 1024 MiB</p>"
+        '<div id="task-statement"><span class="lang">'
+        f'{_statement("ja", samples)}{_statement("en", samples)}</span></div>'
+        "<form><textarea></textarea></form></div>"
+        f"<footer><ul>{menu}</ul></footer>{script}</body></html>"
+    )
+
+
+def measure(func, html_content, repeat):
+    """func(html_content) の1回あたりの最短時間（秒）と結果"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html_content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.parser_benchmark",
+        description="問題ページの解析時間を BeautifulSoup と比較する",
+    )
+    parser.add_argument("pages", nargs="*", help="保存した問題ページのHTML")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+
+    pages = []
+    for path in args.pages:
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append((path, f.read()))
+    if not pages:
+        print("ページが指定されていないため合成ページで計測します")
+        pages.append(("(合成ページ)", synthetic_page()))
+
+    # bs4 の読み込み時間は計測に含めない
+    parse_problem_soup("<html></html>")
+
+    print(f"{'ページ':<30} {'KB':>6} {'bs4 ms':>8} {'高速 ms':>8} {'倍率':>6}  結果")
+    mismatched = False
+    for name, html_content in pages:
+        soup_time, expected = measure(parse_problem_soup, html_content, args.repeat)
+        fast_time, actual = measure(extract_problem_fast, html_content, args.repeat)
+        if actual is None:
+            status = "抽出失敗（bs4で解析）"
+        elif actual == expected:
+            status = "一致"
+        else:
+            status = "不一致"
+            mismatched = True
+        print(
+            f"{name[-30:]:<30} {len(html_content.encode('utf-8')) / 1024:6.0f} "
+            f"{soup_time * 1000:8.2f} {fast_time * 1000:8.2f} "
+            f"{soup_time / fast_time:6.1f}  {status}"
+        )
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
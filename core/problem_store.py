@@ -0,0 +1,288 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from core.result_cache import CACHED_FIELDS
+
+# 問題を保存するデータベース（アプリを起動し直しても残す）
+DEFAULT_DB_PATH = os.path.join(
+    os.path.expanduser("~"), ".atcoder_test_tool", "problems.db"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    contest_number TEXT NOT NULL,
+    problem_id TEXT NOT NULL,
+    problem_title TEXT NOT NULL,
+    info TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (contest_number, problem_id)
+);
+CREATE TABLE IF NOT EXISTS test_cases (
+    contest_number TEXT NOT NULL,
+    problem_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    input_title TEXT NOT NULL,
+    input TEXT NOT NULL,
+    output_title TEXT NOT NULL,
+    expected_output TEXT NOT NULL,
+    custom INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (contest_number, problem_id, position)
+);
+CREATE TABLE IF NOT EXISTS results (
+    contest_number TEXT NOT NULL,
+    problem_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    case_hash TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    result TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (contest_number, problem_id, position)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# info ではなく専用のテーブルに保存する問題情報のフィールド
+UNSAVED_FIELDS = ("test_cases",)
+
+
+def case_hash(input_data, expected_output):
+    """テストケースの内容のハッシュ（結果がどの内容のものかを確かめる）"""
+    data = json.dumps([input_data.strip(), expected_output.strip()])
+    return hashlib.sha256(data.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+class ProblemStore:
+    """
+    問題・テストケース・最後の実行結果をSQLiteに保存するクラス
+
+    クラッシュや再起動のあとでも、最後に開いていたコンテストの問題を貼り付け直さずに復元できる。
+    どのスレッドからも呼べる（1つの接続をロックで共有する）
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path: データベースのファイル（省略時はホームディレクトリ）
+        """
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.conn = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        """初めて使うときにデータベースを開く（ロックを取ってから呼ぶ）"""
+        if self.conn is None:
+            # sqlite3 の読み込みは時間がかかるため、起動時ではなく初めて使うときにインポートする
+            import sqlite3
+
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        return self.conn
+
+    def close(self):
+        """データベースを閉じる"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def save_problem(self, problem_info):
+        """問題とテストケースを保存し、そのコンテストを最後に開いたコンテストにする"""
+        self.save_problems([problem_info])
+
+    def save_problems(self, problem_infos):
+        """
+        複数の問題とテストケースを1つのトランザクションで保存する
+
+        最後の問題のコンテストを最後に開いたコンテストにする
+        """
+        if not problem_infos:
+            return
+        with self.lock:
+            conn = self._connect()
+            with conn:
+                for problem_info in problem_infos:
+                    self._save_problem(conn, problem_info)
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('last_contest', ?)",
+                    (problem_infos[-1].get("contest_number", ""),),
+                )
+
+    def _save_problem(self, conn, problem_info):
+        """問題とテストケースを保存する（ロックを取ってトランザクションの中で呼ぶ）"""
+        contest = problem_info.get("contest_number", "")
+        problem_id = problem_info["problem_id"]
+        info = {
+            key: value
+            for key, value in problem_info.items()
+            if key not in UNSAVED_FIELDS
+        }
+        conn.execute(
+            "INSERT OR REPLACE INTO problems VALUES (?, ?, ?, ?, ?)",
+            (
+                contest,
+                problem_id,
+                problem_info.get("problem_title", ""),
+                json.dumps(info, ensure_ascii=False),
+                time.time(),
+            ),
+        )
+        conn.execute(
+            "DELETE FROM test_cases WHERE contest_number = ? AND problem_id = ?",
+            (contest, problem_id),
+        )
+        conn.executemany(
+            "INSERT INTO test_cases VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    contest,
+                    problem_id,
+                    position,
+                    test_case.get("input_title", ""),
+                    test_case.get("input", ""),
+                    test_case.get("output_title", ""),
+                    test_case.get("expected_output", ""),
+                    int(bool(test_case.get("custom"))),
+                )
+                for position, test_case in enumerate(problem_info.get("test_cases", []))
+            ],
+        )
+
+    def last_contest(self):
+        """最後に開いたコンテストの番号（なければNone）"""
+        with self.lock:
+            row = (
+                self._connect()
+                .execute("SELECT value FROM meta WHERE key = 'last_contest'")
+                .fetchone()
+            )
+        return row[0] if row else None
+
+    def load_contest(self, contest_number=None):
+        """
+        コンテストの問題を問題IDの順に読み込む（省略時は最後に開いたコンテスト）
+
+        Returns:
+            問題情報（テストケースを含む）のリスト
+        """
+        if contest_number is None:
+            contest_number = self.last_contest()
+            if contest_number is None:
+                return []
+
+        with self.lock:
+            conn = self._connect()
+            problems = conn.execute(
+                "SELECT problem_id, info FROM problems "
+                "WHERE contest_number = ? ORDER BY problem_id",
+                (contest_number,),
+            ).fetchall()
+            cases = conn.execute(
+                "SELECT problem_id, input_title, input, output_title, "
+                "expected_output, custom FROM test_cases "
+                "WHERE contest_number = ? ORDER BY problem_id, position",
+                (contest_number,),
+            ).fetchall()
+
+        test_cases = {}
+        for (
+            problem_id,
+            input_title,
+            input_data,
+            output_title,
+            expected,
+            custom,
+        ) in cases:
+            test_case = {
+                "input_title": input_title,
+                "input": input_data,
+                "output_title": output_title,
+                "expected_output": expected,
+            }
+            if custom:
+                test_case["custom"] = True
+            test_cases.setdefault(problem_id, []).append(test_case)
+
+        loaded = []
+        for problem_id, info in problems:
+            problem_info = json.loads(info)
+            problem_info["test_cases"] = test_cases.get(problem_id, [])
+            loaded.append(problem_info)
+        return loaded
+
+    def save_results(self, problem_info, results):
+        """
+        テストケースの最後の実行結果を保存する
+
+        Args:
+            results: (テストケースの番号, 入力, 期待される出力, 判定, 実行結果) のリスト
+        """
+        contest = problem_info.get("contest_number", "")
+        problem_id = problem_info["problem_id"]
+        now = time.time()
+        rows = [
+            (
+                contest,
+                problem_id,
+                position,
+                case_hash(input_data, expected_output),
+                verdict,
+                json.dumps(
+                    {field: result.get(field) for field in CACHED_FIELDS},
+                    ensure_ascii=False,
+                ),
+                now,
+            )
+            for position, input_data, expected_output, verdict, result in results
+        ]
+        with self.lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    def load_results(self, problem_info):
+        """
+        テストケースの最後の実行結果を読み込む
+
+        テストケースの内容が実行したときと変わっているものは返さない
+
+        Returns:
+            テストケースの番号 -> (判定, 実行結果)
+        """
+        with self.lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT position, case_hash, verdict, result FROM results "
+                    "WHERE contest_number = ? AND problem_id = ?",
+                    (
+                        problem_info.get("contest_number", ""),
+                        problem_info["problem_id"],
+                    ),
+                )
+                .fetchall()
+            )
+
+        test_cases = problem_info.get("test_cases", [])
+        results = {}
+        for position, saved_hash, verdict, result in rows:
+            if position >= len(test_cases):
+                continue
+            test_case = test_cases[position]
+            if saved_hash != case_hash(
+                test_case["input"], test_case["expected_output"]
+            ):
+                continue
+            results[position] = (verdict, json.loads(result))
+        return results
@@ -0,0 +1,125 @@
+import os
+import sys
+import time
+import locale
+import selectors
+
+# 一度に読み書きするバイト数
+CHUNK_SIZE = 65536
+
+# 保持するエラー出力の最大バイト数
+STDERR_LIMIT = 1024 * 1024
+
+
+def communicate_fds(
+    stdin_fd, stdout_fd, stderr_fd, input_data, timeout, on_stdout=None
+):
+    """
+    パイプのファイルディスクリプタを使って子プロセスと入出力を行う
+    （subprocess.Popen.communicate のfd版、POSIX専用）
+
+    渡されたファイルディスクリプタはすべてこの関数内で閉じられる
+
+    Args:
+        stdin_fd: 子プロセスの標準入力へ書き込むfd
+        stdout_fd: 子プロセスの標準出力を読み込むfd
+        stderr_fd: 子プロセスの標準エラー出力を読み込むfd
+        input_data: 標準入力に渡すバイト列
+        timeout: タイムアウト（秒）
+        on_stdout: 標準出力のチャンクを受け取る関数（指定時は標準出力を保持しない）。
+            Falseを返すとその時点で入出力を打ち切る
+
+    Returns:
+        (stdout, stderr, timed_out, aborted) のタプル
+    """
+    deadline = time.monotonic() + timeout
+    chunks = {stdout_fd: [], stderr_fd: []}
+    view = memoryview(input_data)
+    offset = 0
+    timed_out = False
+    aborted = False
+    stderr_size = 0
+
+    selector = selectors.DefaultSelector()
+    try:
+        if view:
+            os.set_blocking(stdin_fd, False)
+            selector.register(stdin_fd, selectors.EVENT_WRITE)
+        else:
+            os.close(stdin_fd)
+        selector.register(stdout_fd, selectors.EVENT_READ)
+        selector.register(stderr_fd, selectors.EVENT_READ)
+
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+
+            for key, _ in selector.select(remaining):
+                fd = key.fd
+                if fd == stdin_fd:
+                    try:
+                        offset += os.write(fd, view[offset : offset + CHUNK_SIZE])
+                    except BlockingIOError:
+                        continue
+                    except BrokenPipeError:
+                        # 子プロセスが入力を読み切らずに終了した
+                        offset = len(view)
+                    if offset >= len(view):
+                        selector.unregister(fd)
+                        os.close(fd)
+                else:
+                    data = os.read(fd, CHUNK_SIZE)
+                    if not data:
+                        selector.unregister(fd)
+                        os.close(fd)
+                    elif fd == stdout_fd and on_stdout is not None:
+                        if not on_stdout(data):
+                            aborted = True
+                    elif fd == stderr_fd and stderr_size >= STDERR_LIMIT:
+                        # エラー出力は先頭部分だけ保持
+                        continue
+                    else:
+                        chunks[fd].append(data)
+                        if fd == stderr_fd:
+                            stderr_size += len(data)
+
+            if aborted:
+                break
+    finally:
+        # 未クローズのfdを閉じる
+        for key in list(selector.get_map().values()):
+            selector.unregister(key.fd)
+            os.close(key.fd)
+        selector.close()
+
+    stdout = b"".join(chunks[stdout_fd])
+    stderr = b"".join(chunks[stderr_fd])
+    return stdout, stderr, timed_out, aborted
+
+
+def encode_text(text):
+    """テキストモードのsubprocessと同じエンコーディングでバイト列に変換"""
+    return text.encode(locale.getpreferredencoding(False), errors="replace")
+
+
+def decode_text(data):
+    """テキストモードのsubprocessと同じように改行を正規化して文字列に変換"""
+    text = data.decode(locale.getpreferredencoding(False), errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def rusage_stats(rusage):
+    """os.wait4 のリソース使用量をテスト結果用の辞書に変換"""
+    max_rss = rusage.ru_maxrss
+    if sys.platform == "darwin":
+        # macOSはバイト単位なのでKBに揃える
+        max_rss //= 1024
+
+    return {
+        "cpu_time": rusage.ru_utime + rusage.ru_stime,
+        "memory": max_rss,
+        "page_faults": rusage.ru_minflt + rusage.ru_majflt,
+        "context_switches": rusage.ru_nvcsw + rusage.ru_nivcsw,
+    }
@@ -0,0 +1,78 @@
+import os
+import signal
+import threading
+import subprocess
+from functools import partial
+
+
+class ProcessRegistry:
+    """
+    起動したテストプロセスのうち、まだ回収していないものを管理するクラス
+
+    テストプロセスはそれぞれ独立したプロセスグループ（セッション）で実行するため、
+    プロセスグループごと強制終了すれば解答コードが起動した子孫プロセスも残らない
+    """
+
+    def __init__(self):
+        self.processes = {}  # pid -> (コードファイル名, 強制終了する関数)
+        self.lock = threading.Lock()
+
+    def add(self, pid, code_file="", kill=None):
+        """
+        起動したプロセスを登録
+
+        Args:
+            kill: プロセスを強制終了する関数（省略時はpidでプロセスグループごと終了する）。
+                アプリが回収しないプロセス（ゾイゴートの子など）は、回収する側に
+                終了を頼む関数を渡す（回収後にpidが再利用されていることがあるため）
+        """
+        with self.lock:
+            self.processes[pid] = (code_file, kill or partial(kill_process_group, pid))
+
+    def discard(self, pid):
+        """回収したプロセスを登録から外す"""
+        with self.lock:
+            self.processes.pop(pid, None)
+
+    def count(self):
+        """回収していないプロセスの数"""
+        with self.lock:
+            return len(self.processes)
+
+    def kill_all(self):
+        """登録されているすべてのプロセスをプロセスグループごと強制終了"""
+        with self.lock:
+            kills = [kill for _, kill in self.processes.values()]
+        for kill in kills:
+            kill()
+
+
+def kill_process_group(pid):
+    """
+    プロセスグループごと強制終了する
+
+    プロセスグループを作る前（fork直後）などでグループがなければプロセスだけを終了する。
+    Windowsでは taskkill でプロセスツリーごと終了する
+    """
+    if os.name == "nt":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return
+
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(pid, signal.SIGKILL)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+# アプリ全体で共有するテストプロセスの登録簿
+live_processes = ProcessRegistry()
@@ -0,0 +1,213 @@
+import os
+import json
+import tempfile
+from core.tester import run_python_test
+from core.solution_runner import PROFILE_OPTION
+
+# 表示する関数の数
+TOP_FUNCTIONS = 30
+
+# 呼び出しツリーをたどる深さの上限
+MAX_STACK_DEPTH = 64
+
+# 呼び出しツリーで無視する短い時間（秒）
+MIN_STACK_TIME = 1e-6
+
+# ブートストラップ側の関数（呼び出しツリーの根から除く）
+BOOTSTRAP_FUNCTIONS = {"exec_solution", "<built-in method builtins.exec>"}
+
+
+def profile_test(code_file, input_data, timeout, compiled=None, python="python"):
+    """
+    cProfileで計測しながらテストケースを実行する
+
+    Returns:
+        (実行結果, プロファイル) のタプル。プロファイルが取れなければNone
+    """
+    fd, profile_path = tempfile.mkstemp(prefix="atcoder_profile_", suffix=".json")
+    os.close(fd)
+    try:
+        result = run_python_test(
+            code_file,
+            input_data,
+            timeout=timeout,
+            compiled=compiled,
+            python=python,
+            runner_args=[PROFILE_OPTION, profile_path],
+        )
+        return result, load_profile(profile_path)
+    finally:
+        try:
+            os.remove(profile_path)
+        except OSError:
+            pass
+
+
+def load_profile(profile_path):
+    """子プロセスが書き出したプロファイルを読み込む"""
+    try:
+        with open(profile_path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    functions = {}
+    for entry in data.get("functions", []):
+        key = tuple(entry["key"])
+        functions[key] = {
+            "key": key,
+            "name": function_name(key),
+            "calls": entry["calls"],
+            "primitive_calls": entry["primitive_calls"],
+            "self_time": entry["self_time"],
+            "total_time": entry["total_time"],
+            "callers": {
+                tuple(caller[0]): {
+                    "calls": caller[1],
+                    "self_time": caller[3],
+                    "total_time": caller[4],
+                }
+                for caller in entry["callers"]
+            },
+        }
+    if not functions:
+        return None
+    return {"code_file": data.get("code_file", ""), "functions": functions}
+
+
+def function_name(key):
+    """関数キー (ファイル名, 行番号, 関数名) を表示用の名前に変換"""
+    filename, line, name = key
+    if filename == "~":
+        # 組み込み関数
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def top_functions(profile, sort_key="total_time", limit=TOP_FUNCTIONS):
+    """累積時間（total_time）または自己時間（self_time）の大きい関数"""
+    functions = [
+        function
+        for function in profile["functions"].values()
+        if function["key"][2] not in BOOTSTRAP_FUNCTIONS
+    ]
+    functions.sort(key=lambda function: function[sort_key], reverse=True)
+    return functions[:limit]
+
+
+def call_stacks(profile):
+    """
+    呼び出し元と呼び出し先の関係から呼び出しツリーを復元し、スタックごとの自己時間を求める
+
+    cProfileは関数の組ごとの時間しか持たないため、呼び出し先の時間は
+    呼び出し元ごとの累積時間の比で分配する（フレームグラフ用の近似）
+
+    Returns:
+        関数名のタプル（根から順） -> 自己時間（秒） の辞書
+    """
+    functions = profile["functions"]
+
+    # 呼び出し元 -> [(呼び出し先, その呼び出し元からの累積時間)]
+    callees = {}
+    for key, function in functions.items():
+        for caller, stats in function["callers"].items():
+            callees.setdefault(caller, []).append((key, stats["total_time"]))
+
+    stacks = {}
+
+    def walk(key, total_time, stack, visiting):
+        function = functions[key]
+        stack = stack + (function["name"],)
+        ratio = total_time / function["total_time"] if function["total_time"] else 0
+
+        self_time = function["self_time"] * ratio
+        if self_time >= MIN_STACK_TIME:
+            stacks[stack] = stacks.get(stack, 0.0) + self_time
+
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, callee_time in callees.get(key, []):
+            # 再帰呼び出しは1段にまとめる
+            if callee in visiting:
+                continue
+            child_time = callee_time * ratio
+            if child_time >= MIN_STACK_TIME:
+                walk(callee, child_time, stack, visiting | {callee})
+
+    for root in _root_functions(profile, callees):
+        walk(root, functions[root]["total_time"], (), {root})
+    return stacks
+
+
+def _root_functions(profile, callees):
+    """呼び出しツリーの根（解答コードのモジュール、なければ呼び出し元のない関数）"""
+    functions = profile["functions"]
+    code_file = os.path.abspath(profile["code_file"]) if profile["code_file"] else ""
+    modules = [
+        key
+        for key in functions
+        if key[2] == "<module>" and os.path.abspath(key[0]) == code_file
+    ]
+    if modules:
+        return modules
+
+    roots = []
+    for key, function in functions.items():
+        if not function["callers"] and key[2] not in BOOTSTRAP_FUNCTIONS:
+            roots.append(key)
+        elif key[2] in BOOTSTRAP_FUNCTIONS:
+            # ブートストラップから呼ばれた関数を根にする
+            roots.extend(
+                callee
+                for callee, _ in callees.get(key, [])
+                if callee[2] not in BOOTSTRAP_FUNCTIONS
+            )
+    return list(dict.fromkeys(roots))
+
+
+def to_collapsed(stacks):
+    """
+    collapsed stack形式（flamegraph.pl や speedscope で読める）に変換
+
+    各行は「関数;関数;関数 マイクロ秒」
+    """
+    lines = []
+    for stack, seconds in sorted(stacks.items()):
+        frames = ";".join(name.replace(";", ":") for name in stack)
+        lines.append(f"{frames} {max(1, round(seconds * 1e6))}")
+    return "\n".join(lines) + "\n"
+
+
+def to_speedscope(stacks, name):
+    """speedscope のJSON形式（sampled プロファイル）に変換"""
+    frames = []
+    frame_index = {}
+    samples = []
+    weights = []
+    for stack, seconds in sorted(stacks.items()):
+        sample = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                frames.append({"name": frame})
+            sample.append(frame_index[frame])
+        samples.append(sample)
+        weights.append(seconds)
+
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+        "name": name,
+        "exporter": "atcoder-test-tool",
+    }
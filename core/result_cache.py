@@ -0,0 +1,194 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+# キャッシュ全体の容量の上限（バイト）
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 1件あたりの容量の上限（大きな出力はキャッシュしない）
+MAX_ENTRY_BYTES = 4 * 1024 * 1024
+
+# テストプロセスの起動方法（実行時間やメモリ使用量が変わるのでキーに含める）
+RUNNER_SUBPROCESS = "subprocess"
+RUNNER_ZYGOTE = "zygote"
+
+# 実行結果のうちキャッシュに保存する項目
+CACHED_FIELDS = (
+    "output",
+    "error",
+    "success",
+    "returncode",
+    "timed_out",
+    "aborted",
+    "time",
+    "cpu_time",
+    "memory",
+    "page_faults",
+    "context_switches",
+    "output_matched",
+    "output_limit_exceeded",
+)
+
+
+def _hash_text(text):
+    """文字列のハッシュ"""
+    return hashlib.sha256((text or "").encode("utf-8", "surrogateescape")).hexdigest()
+
+
+def judge_key(expected_output, output_limit, comparator):
+    """出力の比較の打ち切りに影響する設定をまとめたキー"""
+    spec = comparator.to_dict() if comparator else None
+    return _hash_text(json.dumps([expected_output, output_limit, spec]))
+
+
+class ResultCache:
+    """
+    テストケースの実行結果を (コードのハッシュ, 入力のハッシュ, ランタイム, 起動方法) ごとに
+    ディスクにキャッシュするクラス
+
+    コードも入力も変わっていないケースは実行せずに前回の結果を返す。
+    容量の上限を超えたら最も長く使われていない結果から削除する（LRU）
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: 結果を保存するディレクトリ（省略時は一時ディレクトリ）
+            max_bytes: キャッシュ全体の容量の上限
+        """
+        self.cache_dir = cache_dir or os.path.join(
+            tempfile.gettempdir(), "atcoder_test_tool", "results"
+        )
+        self.max_bytes = max_bytes
+        self.entries = None  # キー -> ファイルサイズ（古い順）
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def key(self, source_hash, input_data, python, runner=RUNNER_SUBPROCESS):
+        """
+        コードのハッシュ・入力・ランタイム・起動方法からキャッシュのキーを求める
+
+        Args:
+            runner: テストプロセスの起動方法（RUNNER_SUBPROCESS / RUNNER_ZYGOTE）
+        """
+        runtime = os.path.realpath(python) if os.path.isabs(python) else python
+        return _hash_text(
+            "\0".join([source_hash, _hash_text(input_data), runtime, runner])
+        )
+
+    def get(self, key, timeout, judge=None):
+        """
+        キャッシュされた実行結果を取得する（使えなければNone）
+
+        Args:
+            timeout: 今回の強制終了までの時間（前回の結果がこの時間内に終わっていれば使う）
+            judge: judge_key で求めた比較の設定（逐次比較した結果は同じ設定のときだけ使う）
+        """
+        with self.lock:
+            self._load_index()
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            # 更新時刻をLRUの順序として使う
+            os.utime(path)
+        except (OSError, ValueError):
+            self._discard(key)
+            return None
+
+        result = entry["result"]
+        if result.get("timed_out"):
+            # 前回より短い制限なら同じようにタイムアウトする
+            if timeout > entry["timeout"]:
+                return None
+        elif result.get("time") is None or result["time"] >= timeout:
+            return None
+        # 逐次比較の結果と打ち切りは期待される出力と比較方法によって変わる
+        if result.get("output_matched") is not None and entry.get("judge") != judge:
+            return None
+
+        return dict(result, cached=True)
+
+    def put(self, key, result, timeout, judge=None):
+        """実行結果を保存する"""
+        entry = {
+            "result": {field: result.get(field) for field in CACHED_FIELDS},
+            "timeout": timeout,
+            "judge": judge if result.get("output_matched") is not None else None,
+        }
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8", "surrogateescape")
+        if len(data) > MAX_ENTRY_BYTES:
+            return
+
+        path = self._path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        with self.lock:
+            self._load_index()
+            self.total_bytes += len(data) - self.entries.pop(key, 0)
+            self.entries[key] = len(data)
+            evicted = []
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_key, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """キャッシュをすべて削除"""
+        with self.lock:
+            self._load_index()
+            keys = list(self.entries)
+            self.entries.clear()
+            self.total_bytes = 0
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _discard(self, key):
+        """読めなくなった結果をキャッシュから外す"""
+        with self.lock:
+            self.total_bytes -= self.entries.pop(key, 0)
+
+    def _load_index(self):
+        """保存済みの結果を更新時刻の古い順に読み込む（初回のみ）"""
+        if self.entries is not None:
+            return
+
+        files = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for item in it:
+                    if item.name.endswith(".json"):
+                        stat = item.stat()
+                        files.append((stat.st_mtime_ns, item.name[:-5], stat.st_size))
+        except OSError:
+            pass
+
+        files.sort()
+        self.entries = OrderedDict((key, size) for _, key, size in files)
+        self.total_bytes = sum(size for _, _, size in files)
@@ -0,0 +1,166 @@
+import os
+import json
+import shutil
+import threading
+import subprocess
+from core.solution_runner import REPEAT_OPTION
+
+# 探索するインタプリタの実行ファイル名（先に見つかった名前を優先）
+RUNTIME_CANDIDATES = (
+    ["python", "python3"]
+    + [f"python3.{minor}" for minor in range(14, 7, -1)]
+    + ["pypy3", "pypy"]
+)
+
+# インタプリタの種類とバージョンを調べるスクリプト
+VERSION_SCRIPT = (
+    "import sys, platform; "
+    "print(platform.python_implementation(), '%d.%d.%d' % sys.version_info[:3])"
+)
+
+# バージョンの問い合わせのタイムアウト（秒）
+VERSION_TIMEOUT = 5
+
+# ランタイム比較で1つのプロセス内で解答コードを繰り返す回数
+MATRIX_REPEAT = 3
+
+
+def _query_runtime(name, path):
+    """インタプリタを起動して種類とバージョンを調べる"""
+    try:
+        completed = subprocess.run(
+            [path, "-c", VERSION_SCRIPT],
+            capture_output=True,
+            text=True,
+            timeout=VERSION_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if completed.returncode != 0:
+        return None
+
+    try:
+        implementation, version = completed.stdout.split()
+    except ValueError:
+        return None
+    return {
+        "name": name,
+        "path": path,
+        "implementation": implementation,
+        "version": version,
+        "label": f"{implementation} {version}",
+    }
+
+
+class RuntimeRegistry:
+    """
+    ローカルにあるPythonインタプリタ（CPython / PyPy）を管理するクラス
+
+    通常のテスト実行に使うランタイムと、ランタイム比較で使うランタイムを保持する
+    """
+
+    def __init__(self, candidates=RUNTIME_CANDIDATES):
+        self.candidates = candidates
+        self.runtimes = None
+        self.default = "python"
+        self.selected = None  # Noneならすべてのランタイムで比較
+        self.lock = threading.Lock()
+
+    def discover(self, refresh=False):
+        """
+        インタプリタを探索する（結果はキャッシュする）
+
+        Returns:
+            name, path, implementation, version, label をキーに持つ辞書のリスト
+        """
+        with self.lock:
+            if self.runtimes is not None and not refresh:
+                return self.runtimes
+
+            runtimes = []
+            seen = set()
+            for name in self.candidates:
+                path = shutil.which(name)
+                if not path:
+                    continue
+                # python3 と python3.x のように同じ実行ファイルを指す名前は1つにまとめる
+                real_path = os.path.realpath(path)
+                if real_path in seen:
+                    continue
+                seen.add(real_path)
+
+                runtime = _query_runtime(name, path)
+                if runtime:
+                    runtimes.append(runtime)
+
+            self.runtimes = runtimes
+            return runtimes
+
+    def get(self, name):
+        """名前からランタイムを取得"""
+        return next(
+            (runtime for runtime in self.discover() if runtime["name"] == name), None
+        )
+
+    def default_path(self):
+        """通常のテスト実行に使う実行ファイル"""
+        runtime = self.get(self.default) if self.runtimes is not None else None
+        return runtime["path"] if runtime else self.default
+
+    def set_default(self, name):
+        """通常のテスト実行に使うランタイムを変更"""
+        self.default = name
+
+    def is_selected(self, name):
+        """ランタイム比較の対象かどうか"""
+        return self.selected is None or name in self.selected
+
+    def set_selected(self, name, selected):
+        """ランタイム比較の対象を変更"""
+        if self.selected is None:
+            self.selected = {runtime["name"] for runtime in self.discover()}
+        if selected:
+            self.selected.add(name)
+        else:
+            self.selected.discard(name)
+
+    def selected_runtimes(self):
+        """ランタイム比較の対象のランタイム"""
+        return [
+            runtime for runtime in self.discover() if self.is_selected(runtime["name"])
+        ]
+
+
+def bench_args(timings_file, repeat=MATRIX_REPEAT):
+    """繰り返し実行で計測するためのブートストラップのオプション"""
+    return [REPEAT_OPTION, str(repeat), timings_file]
+
+
+def read_timings(timings_file):
+    """繰り返し実行で書き出された各回の実行時間（秒）を読み込む"""
+    try:
+        with open(timings_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+    finally:
+        try:
+            os.remove(timings_file)
+        except OSError:
+            pass
+
+
+def split_warmup(result, timings):
+    """
+    繰り返し実行の結果から、起動時間・初回（ウォームアップ込み）・定常状態の時間を求める
+
+    Returns:
+        startup, first, steady をキーに持つ辞書（求められない値はNone）
+    """
+    elapsed = result.get("time")
+    first = timings[0] if timings else None
+    steady = min(timings[1:]) if len(timings) > 1 else None
+    startup = None
+    if elapsed is not None and timings:
+        startup = max(0.0, elapsed - sum(timings))
+    return {"startup": startup, "first": first, "steady": steady}
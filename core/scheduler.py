@@ -0,0 +1,439 @@
+import os
+import time
+import selectors
+import collections
+from core.process_io import CHUNK_SIZE, STDERR_LIMIT, encode_text
+from core.tester import (
+    run_python_test,
+    create_judge,
+    spawn_test,
+    kill_test,
+    poll_test,
+    wait_test,
+    finish_test,
+    kill_timeout,
+    DEFAULT_LIMITS,
+)
+from core.zygote import Zygote
+from core.process_registry import live_processes
+
+# 並列実行モード
+MODE_AUTO = "auto"
+MODE_SERIAL = "serial"
+MODE_PARALLEL = "parallel"
+
+# 終了待ちのプロセスを確認する間隔（pidfdが使えない環境用、秒）
+REAP_INTERVAL = 0.01
+
+# 中止の指示を確認する間隔（秒）
+CANCEL_INTERVAL = 0.05
+
+
+def available_cpus():
+    """このプロセスが使用できるCPUの数"""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def auto_concurrency():
+    """CPU数と現在の負荷から並列数を決める"""
+    cpus = available_cpus()
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        load = 0
+    return max(1, min(cpus, round(cpus - load)))
+
+
+class _RunningTest:
+    """実行中のテストプロセス1つ分の状態"""
+
+    def __init__(self, index, job, spawned, deadline):
+        self.index = index
+        self.job = job
+        self.spawned = spawned
+        self.deadline = deadline
+        self.start_time = time.perf_counter()
+
+        self.judge = create_judge(
+            job.get("expected_output"), job.get("output_limit"), job.get("comparator")
+        )
+        self.input_data = memoryview(encode_text(job["input_data"]))
+        self.input_offset = 0
+        self.stdout_chunks = []
+        self.stderr_chunks = []
+        self.stderr_size = 0
+        self.status_buffer = b""
+
+        self.open_fds = set()
+        self.pidfd = None
+        self.timed_out = False
+        self.aborted = False
+        self.killed = False
+        self.returncode = None
+        self.stats = None
+        self.elapsed = None
+
+    @property
+    def finished(self):
+        """出力を読み終え、終了状態も回収できたかどうか"""
+        return not self.open_fds and self.returncode is not None
+
+
+class TestScheduler:
+    """
+    テストプロセスの並列実行を管理するクラス
+
+    POSIXでは1つのスレッドのイベントループで全プロセスの入出力と終了を扱い、
+    テストケースごとにスレッドを使わない。
+    パイプを直接扱えない環境（Windows）ではスレッドプールで実行する
+    """
+
+    def __init__(self, mode=MODE_AUTO, workers=None):
+        """
+        Args:
+            mode: 並列実行モード（auto: CPU数と負荷から決定、serial: 直列、parallel: workers並列）
+            workers: parallelモードの並列数
+        """
+        self.mode = mode
+        self.workers = workers or available_cpus()
+
+    def set_mode(self, mode, workers=None):
+        """並列実行モードを変更"""
+        self.mode = mode
+        if workers:
+            self.workers = workers
+
+    def concurrency(self, job_count=None):
+        """実行する並列数を求める（job_count を指定するとその数を上限とする）"""
+        if self.mode == MODE_SERIAL:
+            workers = 1
+        elif self.mode == MODE_PARALLEL:
+            workers = self.workers
+        else:
+            workers = auto_concurrency()
+        if job_count is not None:
+            workers = min(workers, job_count)
+        return max(1, workers)
+
+    @property
+    def label(self):
+        """表示用の名前"""
+        if self.mode == MODE_SERIAL:
+            return "直列"
+        if self.mode == MODE_PARALLEL:
+            return f"{self.workers}並列"
+        return f"自動（最大{available_cpus()}並列）"
+
+    def run(self, jobs, on_result, cancelled=None):
+        """
+        テストをまとめて実行し、終わったものから on_result(index, result) を呼ぶ
+
+        Args:
+            jobs: run_python_test のキーワード引数の辞書のリスト
+            on_result: 結果を受け取る関数（このメソッドを呼んだスレッドから呼ばれる）
+            cancelled: 中止を指示する threading.Event。セットされたら実行中の
+                プロセスを強制終了し、残りの結果は返さずに戻る
+        """
+        if not jobs:
+            return
+
+        if hasattr(os, "wait4"):
+            self._run_event_loop(jobs, on_result, cancelled)
+        else:
+            self._run_thread_pool(jobs, on_result, cancelled)
+
+    def _run_thread_pool(self, jobs, on_result, cancelled=None):
+        """スレッドプールで実行（パイプを直接扱えない環境用）"""
+        # この環境でしか使わないため、起動時間を短くするためにここでインポートする
+        import concurrent.futures
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.concurrency(len(jobs))
+        ) as executor:
+            future_to_index = {
+                executor.submit(run_python_test, **job): i for i, job in enumerate(jobs)
+            }
+            for future in concurrent.futures.as_completed(future_to_index):
+                if cancelled is not None and cancelled.is_set():
+                    # 実行中のものは止められないため、未実行のものだけ取り消す
+                    for pending_future in future_to_index:
+                        pending_future.cancel()
+                    return
+                index = future_to_index[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"output": "", "error": str(e), "success": False}
+                on_result(index, result)
+
+    def _run_event_loop(self, jobs, on_result, cancelled=None):
+        """イベントループで全プロセスの入出力を扱う"""
+        concurrency = self.concurrency(len(jobs))
+        pending = collections.deque(enumerate(jobs))
+        running = []
+        # pidfdが使えない環境で、出力を読み終えたが終了を回収できていないプロセス
+        unreaped = []
+
+        selector = selectors.DefaultSelector()
+        try:
+            while pending or running:
+                # 中止されたら実行中のプロセスは finally で強制終了する
+                if cancelled is not None and cancelled.is_set():
+                    break
+
+                # 空きがあれば次のテストを起動
+                while pending and len(running) < concurrency:
+                    index, job = pending.popleft()
+                    try:
+                        running.append(self._start(index, job, selector))
+                    except Exception as e:
+                        on_result(
+                            index, {"output": "", "error": str(e), "success": False}
+                        )
+
+                if not running:
+                    continue
+
+                timeout = self._select_timeout(running, unreaped)
+                if cancelled is not None:
+                    timeout = (
+                        CANCEL_INTERVAL
+                        if timeout is None
+                        else min(timeout, CANCEL_INTERVAL)
+                    )
+
+                for key, _ in selector.select(timeout):
+                    test, handler = key.data
+                    handler(test, key.fd, selector)
+
+                # タイムアウトしたプロセスを強制終了
+                now = time.monotonic()
+                for test in running:
+                    if not test.killed and now >= test.deadline:
+                        test.timed_out = True
+                        self._kill(test, selector)
+
+                # 終了したプロセスを回収（pidfdもゾイゴートも使えない場合は、
+                # 子孫プロセスがパイプを開いたままでも終了を検知できるように確認する）
+                unreaped = []
+                for test in running:
+                    polling = test.pidfd is None and test.spawned["zygote_conn"] is None
+                    if test.returncode is None and (not test.open_fds or polling):
+                        if not self._try_reap(test):
+                            unreaped.append(test)
+
+                for test in [test for test in running if test.finished]:
+                    running.remove(test)
+                    on_result(test.index, self._make_result(test))
+        finally:
+            # 中止された場合や途中で例外が起きた場合も子プロセスを残さない
+            for test in running:
+                self._kill(test, selector)
+                self._close_all(test, selector)
+                # ゾンビプロセスを残さないように回収（ゾイゴートの子はゾイゴートが回収）
+                if test.spawned["zygote_conn"] is not None:
+                    live_processes.discard(test.spawned["pid"])
+                elif test.returncode is None:
+                    try:
+                        wait_test(test.spawned)
+                    except ChildProcessError:
+                        live_processes.discard(test.spawned["pid"])
+            selector.close()
+
+    def _select_timeout(self, running, unreaped):
+        """次にタイムアウトするプロセスまでの時間（強制終了済みのものは除く）"""
+        deadlines = [test.deadline for test in running if not test.killed]
+        timeout = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+        if unreaped:
+            timeout = REAP_INTERVAL if timeout is None else min(timeout, REAP_INTERVAL)
+        return timeout
+
+    def _start(self, index, job, selector):
+        """テストプロセスを起動してセレクタに登録"""
+        spawned = spawn_test(
+            job["code_file"],
+            job.get("zygote"),
+            job.get("compiled"),
+            job.get("python", "python"),
+            job.get("runner_args"),
+        )
+
+        timeout = job.get("timeout") or kill_timeout(DEFAULT_LIMITS)
+        deadline = time.monotonic() + timeout
+        test = _RunningTest(index, job, spawned, deadline)
+
+        if test.input_data:
+            os.set_blocking(spawned["stdin"], False)
+            self._register(
+                test, spawned["stdin"], selectors.EVENT_WRITE, self._on_stdin, selector
+            )
+        else:
+            os.close(spawned["stdin"])
+        self._register(
+            test, spawned["stdout"], selectors.EVENT_READ, self._on_stdout, selector
+        )
+        self._register(
+            test, spawned["stderr"], selectors.EVENT_READ, self._on_stderr, selector
+        )
+
+        # 終了の通知を受け取る
+        conn = spawned["zygote_conn"]
+        if conn is not None:
+            conn.setblocking(False)
+            selector.register(conn, selectors.EVENT_READ, (test, self._on_status))
+        elif hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(spawned["pid"])
+            except OSError:
+                pass
+            else:
+                test.pidfd = pidfd
+                selector.register(pidfd, selectors.EVENT_READ, (test, self._on_exit))
+        return test
+
+    def _register(self, test, fd, events, handler, selector):
+        """パイプのfdをセレクタに登録"""
+        test.open_fds.add(fd)
+        selector.register(fd, events, (test, handler))
+
+    def _close(self, test, fd, selector):
+        """パイプのfdを閉じる"""
+        if fd in test.open_fds:
+            test.open_fds.discard(fd)
+            selector.unregister(fd)
+            os.close(fd)
+
+    def _close_all(self, test, selector):
+        """テストに関係するfdをすべて閉じる"""
+        for fd in list(test.open_fds):
+            self._close(test, fd, selector)
+        conn = test.spawned["zygote_conn"]
+        if conn is not None and conn.fileno() >= 0:
+            try:
+                selector.unregister(conn)
+            except (KeyError, ValueError):
+                pass
+            conn.close()
+        self._close_pidfd(test, selector)
+
+    def _close_pidfd(self, test, selector):
+        """pidfdを閉じる"""
+        if test.pidfd is not None:
+            selector.unregister(test.pidfd)
+            os.close(test.pidfd)
+            test.pidfd = None
+
+    def _kill(self, test, selector):
+        """プロセスを強制終了し、以降の出力は読まない"""
+        if test.killed or test.returncode is not None:
+            return
+        test.killed = True
+        kill_test(test.spawned)
+        for fd in list(test.open_fds):
+            self._close(test, fd, selector)
+        if test.elapsed is None:
+            test.elapsed = time.perf_counter() - test.start_time
+
+    def _on_stdin(self, test, fd, selector):
+        """標準入力に書き込めるようになった"""
+        view = test.input_data
+        try:
+            test.input_offset += os.write(
+                fd, view[test.input_offset : test.input_offset + CHUNK_SIZE]
+            )
+        except BlockingIOError:
+            return
+        except BrokenPipeError:
+            # 子プロセスが入力を読み切らずに終了した
+            test.input_offset = len(view)
+        if test.input_offset >= len(view):
+            self._close(test, fd, selector)
+
+    def _on_stdout(self, test, fd, selector):
+        """標準出力を読み込む"""
+        data = os.read(fd, CHUNK_SIZE)
+        if not data:
+            self._close(test, fd, selector)
+            self._mark_output_done(test)
+        elif test.judge is not None:
+            if not test.judge.feed(data):
+                test.aborted = True
+                self._kill(test, selector)
+        else:
+            test.stdout_chunks.append(data)
+
+    def _on_stderr(self, test, fd, selector):
+        """標準エラー出力を読み込む（先頭部分だけ保持）"""
+        data = os.read(fd, CHUNK_SIZE)
+        if not data:
+            self._close(test, fd, selector)
+            self._mark_output_done(test)
+        elif test.stderr_size < STDERR_LIMIT:
+            test.stderr_chunks.append(data)
+            test.stderr_size += len(data)
+
+    def _mark_output_done(self, test):
+        """出力を読み終えた時刻を実行時間として記録"""
+        if not test.open_fds and test.elapsed is None:
+            test.elapsed = time.perf_counter() - test.start_time
+
+    def _on_status(self, test, fd, selector):
+        """ゾイゴートから終了状態を受け取る"""
+        conn = test.spawned["zygote_conn"]
+        try:
+            data = conn.recv(4096)
+        except BlockingIOError:
+            return
+        test.status_buffer += data
+        if data and not test.status_buffer.endswith(b"\n"):
+            return
+
+        selector.unregister(conn)
+        conn.close()
+        live_processes.discard(test.spawned["pid"])
+        if data:
+            test.returncode, test.stats = Zygote.parse_status(test.status_buffer)
+        else:
+            # ゾイゴートが異常終了した
+            test.returncode, test.stats = -1, {}
+        self._after_exit(test, selector)
+
+    def _on_exit(self, test, fd, selector):
+        """pidfdでプロセスの終了を検知した"""
+        self._close_pidfd(test, selector)
+        self._try_reap(test)
+        if test.returncode is not None:
+            self._after_exit(test, selector)
+
+    def _try_reap(self, test):
+        """終了していればプロセスを回収"""
+        if test.spawned["zygote_conn"] is not None or test.returncode is not None:
+            return test.returncode is not None
+        reaped = poll_test(test.spawned)
+        if reaped is None:
+            return False
+        test.returncode, test.stats = reaped
+        return True
+
+    def _after_exit(self, test, selector):
+        """終了後、子プロセスが残したパイプが開いたままなら閉じる"""
+        if test.elapsed is None:
+            test.elapsed = time.perf_counter() - test.start_time
+        # 入力を読み切らずに終了した場合など
+        if test.spawned["stdin"] in test.open_fds:
+            self._close(test, test.spawned["stdin"], selector)
+
+    def _make_result(self, test):
+        """実行結果を作成"""
+        return finish_test(
+            b"".join(test.stdout_chunks),
+            b"".join(test.stderr_chunks),
+            test.returncode,
+            test.stats or {},
+            test.timed_out,
+            test.aborted,
+            test.elapsed,
+            test.judge,
+        )
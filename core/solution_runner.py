@@ -0,0 +1,202 @@
+"""
+解答コードを実行するためのブートストラップ
+
+コンパイル済みのバイトコード（.pyc）を読み込んで解答コードを実行する。
+subprocessモードではスクリプトとして起動され、ゾイゴートからはモジュールとして使われる。
+標準ライブラリのみに依存する。
+"""
+
+import os
+import sys
+import json
+import time
+import marshal
+import threading
+import traceback
+import importlib.util
+
+# .pycファイルのヘッダサイズ（マジックナンバー + フラグ + ソースハッシュ）
+PYC_HEADER_SIZE = 16
+
+# ブートストラップのオプション
+REPEAT_OPTION = "--repeat"  # --repeat 回数 計測結果の出力先
+PROFILE_OPTION = "--profile"  # --profile プロファイルの出力先
+
+
+def load_code(pyc_path, code_file):
+    """コンパイル済みのコードを読み込む（読めなければソースからコンパイル）"""
+    if pyc_path:
+        # 別のバージョンのインタプリタで作られた.pycはマジックナンバーで弾く
+        try:
+            with open(pyc_path, "rb") as f:
+                data = f.read()
+            if data[:4] == importlib.util.MAGIC_NUMBER:
+                return marshal.loads(data[PYC_HEADER_SIZE:])
+        except (OSError, ValueError, EOFError):
+            pass
+
+    with open(code_file, "rb") as f:
+        source = f.read()
+    return compile(source, code_file, "exec")
+
+
+def _exit_code_from(system_exit):
+    """SystemExitから終了コードを求める（インタプリタと同じ規則）"""
+    code = system_exit.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def exec_solution(code, code_file):
+    """解答コードを __main__ として実行し、終了コードを返す"""
+    sys.argv = [code_file]
+    sys.path[0] = os.path.dirname(os.path.abspath(code_file))
+
+    exit_code = 0
+    try:
+        exec(
+            code,
+            {
+                "__name__": "__main__",
+                "__file__": code_file,
+                "__builtins__": __builtins__,
+            },
+        )
+        # 再帰上限対策などで起動されたスレッドの終了を待つ
+        for thread in threading.enumerate():
+            if thread is not threading.main_thread() and not thread.daemon:
+                thread.join()
+    except SystemExit as e:
+        exit_code = _exit_code_from(e)
+    except BaseException as e:
+        # ブートストラップ自身のフレームを除いたトレースバックを表示
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        exit_code = 1
+
+    try:
+        sys.stdout.flush()
+    except Exception:
+        pass
+    try:
+        sys.stderr.flush()
+    except Exception:
+        pass
+    return exit_code
+
+
+def _reset_stdin(input_path):
+    """標準入力を入力ファイルの先頭から読み直せるようにする"""
+    fd = os.open(input_path, os.O_RDONLY)
+    os.dup2(fd, 0)
+    os.close(fd)
+    sys.stdin = open(0, "r", closefd=False)
+
+
+def bench_solution(code, code_file, repeat, timings_path):
+    """
+    同じ入力で解答コードを1つのプロセス内で繰り返し実行し、各回の実行時間を書き出す
+
+    PyPyのJITのウォームアップを含む初回と、2回目以降の定常状態の時間を分けて計測する。
+    出力は1回目のものだけを標準出力に書き出す
+    """
+    input_path = timings_path + ".in"
+    with open(input_path, "wb") as f:
+        f.write(sys.stdin.buffer.read())
+
+    saved_stdout = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    timings = []
+    exit_code = 0
+    try:
+        for i in range(repeat):
+            _reset_stdin(input_path)
+            if i == 1:
+                # 2回目以降の出力は捨てる
+                sys.stdout.flush()
+                os.dup2(devnull, 1)
+
+            start = time.perf_counter()
+            exit_code = exec_solution(code, code_file)
+            timings.append(time.perf_counter() - start)
+            if exit_code != 0:
+                break
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_stdout, 1)
+        os.close(saved_stdout)
+        os.close(devnull)
+        os.remove(input_path)
+
+    with open(timings_path, "w") as f:
+        json.dump(timings, f)
+    return exit_code
+
+
+def _function_key(code):
+    """cProfileの関数キー (ファイル名, 行番号, 関数名) をJSONで扱える形に変換"""
+    return list(code)
+
+
+def profile_solution(code, code_file, profile_path):
+    """
+    cProfileで計測しながら解答コードを実行し、統計をJSONで書き出す
+
+    親プロセスとインタプリタが異なっても読めるように、pstatsの形式ではなく
+    関数ごとの呼び出し回数・時間と呼び出し元の一覧をJSONにする
+    """
+    import cProfile
+
+    profiler = cProfile.Profile()
+    exit_code = profiler.runcall(exec_solution, code, code_file)
+    profiler.create_stats()
+
+    functions = []
+    for key, (
+        primitive_calls,
+        calls,
+        self_time,
+        total_time,
+        callers,
+    ) in profiler.stats.items():
+        functions.append(
+            {
+                "key": _function_key(key),
+                "primitive_calls": primitive_calls,
+                "calls": calls,
+                "self_time": self_time,
+                "total_time": total_time,
+                "callers": [
+                    [_function_key(caller)] + list(stats[:4])
+                    for caller, stats in callers.items()
+                ],
+            }
+        )
+
+    with open(profile_path, "w") as f:
+        json.dump({"code_file": code_file, "functions": functions}, f)
+    return exit_code
+
+
+def main():
+    pyc_path, code_file = sys.argv[1], sys.argv[2]
+    try:
+        code = load_code(pyc_path, code_file)
+    except SyntaxError:
+        traceback.print_exc(limit=0)
+        sys.exit(1)
+
+    options = sys.argv[3:]
+    if options[:1] == [REPEAT_OPTION]:
+        # ランタイム比較用に繰り返し実行して計測
+        sys.exit(bench_solution(code, code_file, int(options[1]), options[2]))
+    if options[:1] == [PROFILE_OPTION]:
+        sys.exit(profile_solution(code, code_file, options[1]))
+    sys.exit(exec_solution(code, code_file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+起動時間の計測
+
+main.py を --startup-profile 付きで起動すると、起動の各段階の経過時間と
+モジュールごとのインポート時間（python -X importtime と同じ形式）を標準エラーに表示する。
+起動直後に読み込まれるため、標準ライブラリ以外はインポートしない
+"""
+
+import sys
+import time
+import threading
+
+# 起動時間の計測を有効にするコマンドライン引数
+PROFILE_FLAG = "--startup-profile"
+
+# インポート時間の表示を省略する累積時間（マイクロ秒）
+MIN_IMPORT_US = 1000
+
+
+class _TimedLoader:
+    """モジュールの実行時間を計測するローダー（それ以外は元のローダーに委譲）"""
+
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        spec = module.__spec__
+        # 計測中はローダーを元に戻しておく（importlib.reload などのため）
+        spec.loader = module.__loader__ = self._loader
+        self._timer.enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave(spec.name)
+
+
+class ImportTimer:
+    """
+    メインスレッドでのモジュールのインポート時間を記録するファインダー
+
+    sys.meta_path の先頭に入れ、他のファインダーが見つけたモジュールの実行を計測する
+    """
+
+    def __init__(self):
+        self.records = (
+            []
+        )  # (深さ, モジュール名, 自身の時間, 累積時間) を読み込み終わった順に
+        self.stack = []  # 読み込み中のモジュールの [開始時刻, 子の累積時間]
+        self.thread_id = threading.get_ident()
+        self.finding = False
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path, target=None):
+        # 別スレッドのインポートと、このファインダー自身の再帰は計測しない
+        if self.finding or threading.get_ident() != self.thread_id:
+            return None
+        self.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self.finding = False
+
+        if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def enter(self):
+        self.stack.append([time.perf_counter(), 0.0])
+
+    def leave(self, name):
+        start, children = self.stack.pop()
+        elapsed = time.perf_counter() - start
+        if self.stack:
+            self.stack[-1][1] += elapsed
+        self.records.append((len(self.stack), name, elapsed - children, elapsed))
+
+    def format(self, min_us=MIN_IMPORT_US):
+        """累積時間が min_us 以上のモジュールを -X importtime の形式で整形"""
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for depth, name, self_time, total in self.records:
+            if total * 1e6 < min_us:
+                continue
+            lines.append(
+                f"import time: {self_time * 1e6:9.0f} | {total * 1e6:10.0f} | "
+                f"{'  ' * depth}{name}"
+            )
+        return "\n".join(lines)
+
+
+class StartupProfile:
+    """起動の各段階の経過時間を記録するクラス（無効なら何もしない）"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.phases = []  # (段階の名前, 開始からの経過時間)
+        self.import_timer = None
+        if enabled:
+            self.import_timer = ImportTimer()
+            self.import_timer.install()
+
+    @classmethod
+    def from_argv(cls, argv):
+        """コマンドライン引数に PROFILE_FLAG があれば有効にする"""
+        return cls(PROFILE_FLAG in argv)
+
+    def mark(self, phase):
+        """段階が終わった時刻を記録"""
+        if self.enabled:
+            self.phases.append((phase, time.perf_counter() - self.start))
+
+    def report(self, file=None):
+        """記録した時間を表示して計測を終える"""
+        if not self.enabled:
+            return
+        file = file or sys.stderr
+        self.import_timer.uninstall()
+
+        print(self.import_timer.format(), file=file)
+        print("", file=file)
+        print("startup time: elapsed [ms] | delta [ms] | phase", file=file)
+        previous = 0.0
+        for phase, elapsed in self.phases:
+            print(
+                f"startup time: {elapsed * 1000:12.1f} | "
+                f"{(elapsed - previous) * 1000:10.1f} | {phase}",
+                file=file,
+            )
+            previous = elapsed
+        file.flush()
@@ -0,0 +1,107 @@
+import codecs
+import locale
+from core.comparators import Comparator
+
+# 画面に表示するために保持する出力の最大文字数
+DISPLAY_LIMIT = 1024 * 1024
+
+
+class StreamingJudge:
+    """
+    子プロセスの標準出力を受け取りながら期待される出力と比較するクラス
+
+    比較方法は Comparator（判定モード）に従う。
+    不一致が見つかった時点や出力サイズ制限を超えた時点で feed が False を返すので、
+    呼び出し側はその場でプロセスを強制終了できる。
+    """
+
+    def __init__(
+        self, expected, output_limit, comparator=None, display_limit=DISPLAY_LIMIT
+    ):
+        """
+        Args:
+            expected: 期待される出力
+            output_limit: 出力サイズ制限（バイト）
+            comparator: 判定モード（省略時はデフォルト）
+            display_limit: 表示用に保持する出力の最大文字数
+        """
+        self.expected_empty = not expected.strip()
+        self.matcher = (comparator or Comparator()).matcher(expected)
+        self.output_limit = output_limit
+        self.display_limit = display_limit
+        self.decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(
+            errors="replace"
+        )
+
+        self.output_size = 0
+        self.pending_cr = False
+
+        self.display_chunks = []
+        self.display_size = 0
+        self.truncated = False
+
+        self.mismatch = False
+        self.output_limit_exceeded = False
+
+    def feed(self, data):
+        """
+        標準出力のチャンクを受け取る
+
+        Returns:
+            実行を続けてよければTrue、打ち切るべきならFalse
+        """
+        self.output_size += len(data)
+        if self.output_size > self.output_limit:
+            self.output_limit_exceeded = True
+            return False
+
+        text = self._normalize_newlines(self.decoder.decode(data))
+        self._keep_for_display(text)
+
+        if not self.mismatch and not self.matcher.feed(text):
+            self.mismatch = True
+            # 期待される出力が空のケースは出力を確認するために最後まで実行する
+            return self.expected_empty
+
+        return True
+
+    def finish(self):
+        """出力の終わりを処理し、期待される出力と一致したかどうかを返す"""
+        text = self._normalize_newlines(self.decoder.decode(b"", final=True))
+        if self.pending_cr:
+            text += "\n"
+            self.pending_cr = False
+        self._keep_for_display(text)
+        if not self.mismatch and not self.matcher.feed(text):
+            self.mismatch = True
+
+        return not self.mismatch and self.matcher.finish()
+
+    def output(self):
+        """表示用の出力を返す"""
+        output = "".join(self.display_chunks).strip()
+        if self.truncated:
+            output += "\n\n--- 出力が長いため省略しました ---"
+        return output
+
+    def _normalize_newlines(self, text):
+        """チャンクをまたぐ改行も含めて \\r\\n と \\r を \\n に揃える"""
+        if self.pending_cr:
+            text = "\r" + text
+            self.pending_cr = False
+        if text.endswith("\r"):
+            self.pending_cr = True
+            text = text[:-1]
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def _keep_for_display(self, text):
+        """表示用に出力の先頭部分だけを保持"""
+        if self.display_size >= self.display_limit:
+            self.truncated = self.truncated or bool(text)
+            return
+        remaining = self.display_limit - self.display_size
+        if len(text) > remaining:
+            self.truncated = True
+            text = text[:remaining]
+        self.display_chunks.append(text)
+        self.display_size += len(text)
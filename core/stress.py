@@ -0,0 +1,201 @@
+import os
+import time
+import threading
+from core.tester import judge_result, kill_timeout, VERDICT_AC
+
+# ジェネレータと愚直解の強制終了までの時間（秒）
+HELPER_TIMEOUT = 10
+
+# 1回にまとめて実行するケース数（並列数に対する倍率と最小値）
+BATCH_FACTOR = 4
+MIN_BATCH_SIZE = 16
+
+# 進捗を通知する間隔（秒）
+PROGRESS_INTERVAL = 0.2
+
+
+def companion_file(code_file, suffix):
+    """解答コードと同じ場所に置く補助プログラムのファイル名（例: 123A_gen.py）"""
+    base, ext = os.path.splitext(code_file)
+    return f"{base}{suffix}{ext or '.py'}"
+
+
+def stress_file_paths(code_file):
+    """解答コードのファイル名からジェネレータと愚直解のデフォルトのファイル名を求める"""
+    return companion_file(code_file, "_gen"), companion_file(code_file, "_brute")
+
+
+class StressTester:
+    """
+    ランダム入力のジェネレータと愚直解を使ってストレステストを行うクラス
+
+    シード値ごとに ジェネレータ → 愚直解 → 解答コード の順に実行し、
+    解答コードの結果が愚直解と一致しないケースが見つかった時点で止める。
+    ジェネレータには標準入力でシード値を渡す
+    """
+
+    def __init__(self, scheduler):
+        """
+        Args:
+            scheduler: テストプロセスを並列実行する TestScheduler
+        """
+        self.scheduler = scheduler
+        self.stopped = threading.Event()
+
+    def stop(self):
+        """
+        ストレステストを止める（実行中のプロセスも強制終了する）
+
+        run を呼ぶ前に止めた場合も実行しない。止めた後は新しい StressTester を作る
+        """
+        self.stopped.set()
+
+    def run(
+        self,
+        solution,
+        generator,
+        brute,
+        limits,
+        comparator=None,
+        zygote=None,
+        python="python",
+        start_seed=1,
+        max_cases=None,
+        on_progress=None,
+    ):
+        """
+        ストレステストを実行する
+
+        Args:
+            solution, generator, brute: (ファイル名, コンパイル済みのコード) のタプル
+            limits: 解答コードの実行制限
+            on_progress: on_progress(実行したケース数, 経過時間) を呼ぶ関数
+
+        Returns:
+            cases, elapsed, failure をキーに持つ辞書。
+            failure は見つかった失敗ケース（seed, stage, input, expected_output,
+            result, verdict をキーに持つ辞書）で、見つからなければNone
+        """
+        start_time = time.perf_counter()
+        last_progress = start_time
+        cases = 0
+        seed = start_seed
+        batch_size = max(MIN_BATCH_SIZE, self.scheduler.concurrency() * BATCH_FACTOR)
+
+        options = {"zygote": zygote, "python": python}
+        failure = None
+        while not self.stopped.is_set() and failure is None:
+            if max_cases is not None:
+                batch_size = min(batch_size, max_cases - cases)
+                if batch_size <= 0:
+                    break
+            seeds = list(range(seed, seed + batch_size))
+            seed += batch_size
+
+            failure = self._run_batch(
+                seeds, solution, generator, brute, limits, comparator, options
+            )
+            if failure is None and self.stopped.is_set():
+                # 途中で止めたまとまりは数えない
+                break
+            if failure is None:
+                cases += len(seeds)
+            else:
+                cases += seeds.index(failure["seed"]) + 1
+
+            now = time.perf_counter()
+            if on_progress and now - last_progress >= PROGRESS_INTERVAL:
+                on_progress(cases, now - start_time)
+                last_progress = now
+
+        elapsed = time.perf_counter() - start_time
+        if on_progress:
+            on_progress(cases, elapsed)
+        return {"cases": cases, "elapsed": elapsed, "failure": failure}
+
+    def _run_batch(
+        self, seeds, solution, generator, brute, limits, comparator, options
+    ):
+        """
+        シード値のまとまりを実行し、最初に失敗したケースを返す
+
+        途中で止められた場合は結果がそろわないのでNoneを返す
+        """
+        # 入力を生成
+        generated = self._run_stage(
+            generator, [str(seed) for seed in seeds], HELPER_TIMEOUT, options
+        )
+        if self.stopped.is_set():
+            return None
+        for seed, result in zip(seeds, generated):
+            if not result["success"]:
+                return self._failure(seed, "generator", "", None, result)
+        inputs = [result["output"] for result in generated]
+
+        # 愚直解で期待される出力を求める
+        answers = self._run_stage(brute, inputs, HELPER_TIMEOUT, options)
+        if self.stopped.is_set():
+            return None
+        for seed, input_data, result in zip(seeds, inputs, answers):
+            if not result["success"]:
+                return self._failure(seed, "brute", input_data, None, result)
+        expected_outputs = [result["output"] for result in answers]
+
+        # 解答コードを実行して判定
+        results = self._run_stage(
+            solution,
+            inputs,
+            kill_timeout(limits),
+            dict(options, output_limit=limits["output_limit"], comparator=comparator),
+            expected_outputs,
+        )
+        if self.stopped.is_set():
+            return None
+        for seed, input_data, expected_output, result in zip(
+            seeds, inputs, expected_outputs, results
+        ):
+            verdict = judge_result(result, expected_output, limits, comparator)
+            if verdict != VERDICT_AC:
+                return self._failure(
+                    seed, "solution", input_data, expected_output, result, verdict
+                )
+        return None
+
+    def _run_stage(self, program, inputs, timeout, options, expected_outputs=None):
+        """
+        1つのプログラムを入力ごとに並列実行し、入力の順に結果を返す
+
+        止められた場合は実行中のプロセスを強制終了し、実行していない入力の結果はNoneになる
+        """
+        code_file, compiled = program
+        jobs = []
+        for i, input_data in enumerate(inputs):
+            job = dict(
+                options,
+                code_file=code_file,
+                compiled=compiled,
+                input_data=input_data,
+                timeout=timeout,
+            )
+            if expected_outputs is not None:
+                job["expected_output"] = expected_outputs[i]
+            jobs.append(job)
+
+        results = [None] * len(jobs)
+
+        def on_result(index, result):
+            results[index] = result
+
+        self.scheduler.run(jobs, on_result, self.stopped)
+        return results
+
+    def _failure(self, seed, stage, input_data, expected_output, result, verdict=None):
+        """失敗したケースの情報"""
+        return {
+            "seed": seed,
+            "stage": stage,
+            "input": input_data,
+            "expected_output": expected_output,
+            "result": result,
+            "verdict": verdict,
+        }
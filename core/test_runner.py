@@ -1,13 +1,34 @@
 import os
+import shutil
+import tempfile
 import threading
-import time
-from ui.test_case_frame import TestCaseFrame
-from ui.widgets import create_scrolledtext
-import tkinter as tk
-from tkinter import ttk
-from core.tester import run_python_test, compare_outputs
-from ui.styles import ICON_WARNING
-import concurrent.futures
+import traceback
+from core.tester import (
+    judge_result,
+    kill_timeout,
+    DEFAULT_LIMITS,
+    VERDICT_CE,
+)
+from core.engine import TestEngine, all_passed
+from core.scheduler import TestScheduler
+from core.stress import StressTester
+from core.profiler import profile_test
+from core.complexity import scaling_sizes, run_scaling, fit_complexity, estimate_time
+from core.runtimes import (
+    RuntimeRegistry,
+    MATRIX_REPEAT,
+    bench_args,
+    read_timings,
+    split_warmup,
+)
+from core.zygote import Zygote
+from core.compile_cache import CompileCache
+from core.result_cache import ResultCache
+from core.process_registry import live_processes
+from core.comparators import Comparator
+
+# 保存が続いた場合に自動実行を待つ時間（ミリ秒）
+AUTO_RUN_DELAY_MS = 300
 
 
 class TestRunner:
@@ -16,10 +37,156 @@ class TestRunner:
     def __init__(self, app_controller):
         self.app_controller = app_controller
         self.test_cases = []
+        self.case_views = []  # テストタブの一覧に表示しているテストケース
+
+        # 実行に使うインタプリタ
+        self.runtimes = RuntimeRegistry()
+
+        # ゾイゴート（fork実行モード）はサポートされている環境ではデフォルトで有効
+        self.zygote = Zygote() if Zygote.is_supported() else None
+        self.use_zygote = self.zygote is not None
+
+        # 判定に使う実行制限
+        self.limits = dict(DEFAULT_LIMITS)
+
+        # 解答コードのバイトコードキャッシュ
+        self.compile_cache = CompileCache()
+
+        # コードと入力が変わっていないテストケースの実行結果のキャッシュ
+        self.result_cache = ResultCache()
+        self.use_result_cache = True
+
+        # テストプロセスの並列実行（デフォルトはCPU数と負荷から自動で決定）
+        self.scheduler = TestScheduler()
+
+        # GUIに依存しない実行エンジン（スケジューラとキャッシュを共有する）
+        self.engine = TestEngine(self.scheduler, self.compile_cache, self.result_cache)
+
+        # 実行中のストレステスト
+        self.stress_tester = None
+
+        # 実行中のテストの中止の指示（新しく実行したら前の実行は中止する）
+        self.test_run_cancel = None
+
+        # 保存時の自動実行
+        self.auto_run = False
+        self.auto_run_after_id = None
+
+    def set_limits(
+        self, time_limit=None, memory_limit=None, output_limit=None, problem_id=None
+    ):
+        """
+        実行制限を変更（時間は秒、メモリはKB、出力サイズはバイト）
+
+        problem_id を指定するとその問題の制限だけを変更する
+        """
+        limits = self.limits
+        if problem_id is not None and problem_id in self.app_controller.problems:
+            limits = self.app_controller.problems[problem_id].setdefault("limits", {})
+        if time_limit is not None:
+            limits["time_limit"] = time_limit
+        if memory_limit is not None:
+            limits["memory_limit"] = memory_limit
+        if output_limit is not None:
+            limits["output_limit"] = output_limit
+
+    def get_limits(self, problem_id=None):
+        """問題の実行制限（問題文から取得できなかった項目は全体の設定）"""
+        limits = dict(self.limits)
+        problem_info = self.app_controller.problems.get(problem_id)
+        if problem_info:
+            limits.update(problem_info.get("limits", {}))
+        return limits
+
+    def set_parallelism(self, mode, workers=None):
+        """テストの並列実行モードを変更（auto / serial / parallel）"""
+        self.scheduler.set_mode(mode, workers)
+
+    def discover_runtimes(self):
+        """
+        インタプリタを別スレッドで探索し、終わったらランタイムメニューを作り直す
+
+        候補のインタプリタを順に起動して調べるため、起動時ではなくウィンドウの表示後に呼ぶ
+        """
+        threading.Thread(target=self._discover_runtimes_thread, daemon=True).start()
+
+    def _discover_runtimes_thread(self):
+        try:
+            self.runtimes.discover()
+        except Exception as e:
+            print(f"インタプリタの探索に失敗しました: {str(e)}")
+            return
+        self.app_controller.dispatcher.post(self.app_controller.ui.update_runtime_menu)
+
+    def set_runtime(self, name):
+        """通常のテスト実行に使うランタイムを変更（ゾイゴートも起動し直す）"""
+        self.runtimes.set_default(name)
+        if self.zygote:
+            self.zygote.stop()
+            self.zygote = Zygote(self.runtimes.default_path())
+
+    def set_use_zygote(self, enabled):
+        """ゾイゴートによる実行モードを切り替え"""
+        self.use_zygote = enabled and self.zygote is not None
+        if not self.use_zygote and self.zygote:
+            self.zygote.stop()
+
+    def set_use_result_cache(self, enabled):
+        """実行結果のキャッシュの有効・無効を切り替え"""
+        self.use_result_cache = enabled
+
+    def set_auto_run(self, enabled):
+        """保存時の自動実行の有効・無効を切り替え"""
+        self.auto_run = enabled
+
+    def on_code_saved(self):
+        """
+        コードファイルが保存されたときの処理（ファイル監視のスレッドから呼ばれる）
+
+        古いコードの実行はすぐに中止し、保存が続いている間は実行を待つ
+        """
+        if not self.auto_run:
+            return
+        self.cancel_test_run()
+        self.app_controller.dispatcher.post(self._schedule_auto_run)
+
+    def _schedule_auto_run(self):
+        """最後の保存から AUTO_RUN_DELAY_MS 後にテストを実行"""
+        root = self.app_controller.root
+        if self.auto_run_after_id is not None:
+            root.after_cancel(self.auto_run_after_id)
+        self.auto_run_after_id = root.after(AUTO_RUN_DELAY_MS, self._auto_run)
+
+    def _auto_run(self):
+        """表示中の問題のテストを実行"""
+        self.auto_run_after_id = None
+        if self.auto_run:
+            self.app_controller.run_all_tests()
+
+    def cancel_test_run(self):
+        """実行中のテストを中止（子プロセスは強制終了し、結果は表示しない）"""
+        if self.test_run_cancel is not None:
+            self.test_run_cancel.set()
+
+    def _begin_test_run(self):
+        """前の実行を中止して、新しい実行の中止の指示を作る"""
+        self.cancel_test_run()
+        self.test_run_cancel = threading.Event()
+        return self.test_run_cancel
+
+    def shutdown(self):
+        """実行中のテストと常駐プロセスを停止"""
+        self.cancel_test_run()
+        self.stop_stress_test()
+        # 実行中のテストプロセスは子孫プロセスも含めて終了させる
+        live_processes.kill_all()
+        if self.zygote:
+            self.zygote.stop()
 
     def clear_test_cases(self):
         """テストケースをクリア"""
         self.test_cases = []
+        self.case_views = []
 
     def update_test_cases(self, test_cases):
         """テストケースを更新"""
@@ -28,61 +195,9 @@ class TestRunner:
 
     def _update_test_ui(self):
         """テストケースのUIを更新"""
-        ui = self.app_controller.ui
-
-        # テストケースコンテナをクリア
-        for widget in ui.test_container.winfo_children():
-            widget.destroy()
-
-        # テストケースを表示
-        for i, test_case in enumerate(self.test_cases):
-            # 通常のフレームを作成（常に展開）
-            test_frame = TestCaseFrame(
-                ui.test_container,
-                f"テストケース {i+1}",
-            )
-            test_frame.pack(fill=tk.X, expand=True, padx=5, pady=5)
-
-            # コンテンツ部分（3列レイアウト）
-            content_frame = test_frame.content_frame
-
-            # 入力例（左）
-            input_frame = ttk.Frame(content_frame, style="Light.TFrame")
-            input_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
-
-            ttk.Label(input_frame, text=test_case["input_title"], style="TLabel").pack(
-                anchor=tk.W, padx=5, pady=2
-            )
-            input_text = create_scrolledtext(input_frame, height=6, width=30)
-            input_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            input_text.insert(tk.END, test_case["input"])
-            test_case["input_widget"] = input_text
-
-            # 期待される出力（中央）
-            expected_frame = ttk.Frame(content_frame, style="Light.TFrame")
-            expected_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
-
-            ttk.Label(
-                expected_frame, text=test_case["output_title"], style="TLabel"
-            ).pack(anchor=tk.W, padx=5, pady=2)
-            expected_text = create_scrolledtext(expected_frame, height=6, width=30)
-            expected_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            expected_text.insert(tk.END, test_case["expected_output"])
-            test_case["output_widget"] = expected_text
-
-            # 実際の出力（右）
-            actual_frame = ttk.Frame(content_frame, style="Light.TFrame")
-            actual_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
-
-            ttk.Label(actual_frame, text="実際の出力", style="TLabel").pack(
-                anchor=tk.W, padx=5, pady=2
-            )
-            actual_text = create_scrolledtext(actual_frame, height=6, width=30)
-            actual_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            test_case["actual_output_widget"] = actual_text
-
-            # 結果表示用の参照を保持
-            test_case["result_frame"] = test_frame
+        self.case_views = self.app_controller.ui.test_case_list.set_cases(
+            self.test_cases
+        )
 
         # テストケースがあればタブを有効化
         if self.test_cases:
@@ -103,62 +218,18 @@ class TestRunner:
             )
             return
 
-        # 別スレッドで実行してUIをブロックしないようにする
-        threading.Thread(target=self._run_all_tests_thread).start()
-
-    def _run_all_tests_thread(self):
-        """並列ですべてのテストを実行"""
-        # まず全てのテストの出力をクリア
-        for i in range(len(self.test_cases)):
-            test_case = self.test_cases[i]
-
-            # UIスレッドで安全に更新
-            def clear_output(index):
-                test_case = self.test_cases[index]
-                actual_output_widget = test_case["actual_output_widget"]
-                actual_output_widget.config(state="normal")
-                actual_output_widget.delete("1.0", tk.END)
-                # クリア後にdisabledにしない - これが出力が表示されない原因
-                test_case["result_frame"].set_running()
-
-            self.app_controller.root.after(0, lambda idx=i: clear_output(idx))
-
-        # UIが更新される時間を少し待つ
-        time.sleep(0.1)
-
-        # 並列処理のためのスレッドプール
-        all_passed = True
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=min(4, len(self.test_cases))
-        ) as executor:
-            # テスト実行をスレッドプールに投入
-            future_to_test = {
-                executor.submit(self._run_test, i): i
-                for i in range(len(self.test_cases))
-            }
+        # 現在の問題の判定モードで比較
+        problem_info = self.app_controller.problems.get(self.app_controller.problem_id)
+        comparator = Comparator.from_dict(
+            problem_info.get("comparator") if problem_info else None
+        )
 
-            # 完了したテストの結果を処理
-            for future in concurrent.futures.as_completed(future_to_test):
-                test_index = future_to_test[future]
-                try:
-                    passed = future.result()
-                    if not passed:
-                        all_passed = False
-                except Exception as e:
-                    print(
-                        f"テスト {test_index} の実行中にエラーが発生しました: {str(e)}"
-                    )
-                    all_passed = False
+        # 問題文の実行制限で判定
+        limits = self.get_limits(self.app_controller.problem_id)
 
-        # 結果を表示
-        if all_passed:
-            self.app_controller.ui.show_status_message(
-                "すべてのテストに合格しました！", "Success.TLabel"
-            )
-        else:
-            self.app_controller.ui.show_status_message(
-                "テストに不合格があります", "Error.TLabel"
-            )
+        self._start_test_run(
+            self.case_views, comparator, limits, self.app_controller.problem_id
+        )
 
     def run_tests_for_tab(self, tab_info):
         """指定されたタブのテストケースを実行"""
@@ -175,201 +246,633 @@ class TestRunner:
             )
             return
 
+        # タブで選択されている判定モードと問題文の実行制限で判定
+        comparator = self.app_controller.ui.get_tab_comparator(tab_info)
+        limits = self.get_limits(tab_info.get("problem_id"))
+
+        self._start_test_run(
+            tab_info["test_cases"], comparator, limits, tab_info.get("problem_id")
+        )
+
+    def _start_test_run(self, test_cases, comparator, limits, problem_id=None):
+        """
+        テストケースの表示をクリアして、別スレッドでテストを開始する（メインスレッドから呼ぶ）
+
+        入力と期待される出力はウィジェットから最新の値を取得して別スレッドに渡す。
+        problem_id を指定すると実行結果をその問題の最後の結果として保存する
+        """
+        cases = []
+        for test_case in test_cases:
+            cases.append(self._read_case(test_case))
+            test_case["case_list"].set_running(test_case)
+
+        # 実行中のテストがあれば中止してから実行
+        cancelled = self._begin_test_run()
+
         # 別スレッドで実行してUIをブロックしないようにする
-        threading.Thread(target=lambda: self._run_tab_tests_thread(tab_info)).start()
-
-    def _run_tab_tests_thread(self, tab_info):
-        """並列で指定されたタブのテストを実行"""
-        test_cases = tab_info["test_cases"]
-
-        # まず全てのテストの出力をクリア
-        for i in range(len(test_cases)):
-            test_case = test_cases[i]
-
-            # UIスレッドで安全に更新
-            def clear_output(test_case):
-                actual_output_widget = test_case["actual_output_widget"]
-                actual_output_widget.config(state="normal")
-                actual_output_widget.delete("1.0", tk.END)
-                # クリア後にdisabledにしない
-                test_case["result_frame"].set_running()
-
-            self.app_controller.root.after(0, lambda tc=test_case: clear_output(tc))
-
-        # UIが更新される時間を少し待つ
-        time.sleep(0.1)
-
-        # 並列処理のためのスレッドプール
-        all_passed = True
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=min(4, len(test_cases))
-        ) as executor:
-            # テスト実行をスレッドプールに投入
-            future_to_test = {
-                executor.submit(self._run_tab_test, test_case): i
-                for i, test_case in enumerate(test_cases)
-            }
+        threading.Thread(
+            target=lambda: self._run_tests_thread(
+                test_cases, cases, comparator, limits, cancelled, problem_id
+            )
+        ).start()
+
+    def _read_case(self, test_case):
+        """テストケースの入力と期待される出力（画面で編集された内容）を取得"""
+        return test_case["case_list"].read_case(test_case)
+
+    def _run_tests_thread(
+        self, test_cases, cases, comparator, limits, cancelled, problem_id=None
+    ):
+        """テストを実行して結果を表示"""
+        # プロセスを起動する前に一度だけコンパイル
+        compiled = self._compile_solution(test_cases, cancelled)
+        if compiled is None:
+            return
 
-            # 完了したテストの結果を処理
-            for future in concurrent.futures.as_completed(future_to_test):
-                test_index = future_to_test[future]
-                try:
-                    passed = future.result()
-                    if not passed:
-                        all_passed = False
-                except Exception as e:
-                    print(
-                        f"タブテスト {test_index} の実行中にエラーが発生しました: {str(e)}"
-                    )
-                    all_passed = False
+        # スケジューラでまとめて実行
+        passed = self._run_cases(
+            test_cases, cases, compiled, comparator, limits, cancelled, problem_id
+        )
+
+        # 中止された場合は新しい実行が結果を表示する
+        if cancelled.is_set():
+            return
 
         # 結果を表示
-        if all_passed:
-            self.app_controller.ui.show_status_message(
-                "すべてのテストに合格しました！", "Success.TLabel"
-            )
+        if passed:
+            self._post_status("すべてのテストに合格しました！", "Success.TLabel")
         else:
+            self._post_status("テストに不合格があります", "Error.TLabel")
+
+    def _post_status(self, message, style="Status.TLabel"):
+        """別スレッドからステータスメッセージを表示"""
+        self.app_controller.dispatcher.post(
+            self.app_controller.ui.show_status_message, message, style
+        )
+
+    def run_runtime_matrix(self, tab_info):
+        """指定されたタブのテストケースを比較対象のすべてのランタイムで実行"""
+        if not tab_info or not tab_info.get("test_cases"):
             self.app_controller.ui.show_status_message(
-                "テストに不合格があります", "Error.TLabel"
+                "テストケースがありません", "Warning.TLabel"
             )
+            return
 
-    def _run_test(self, test_index):
-        """指定されたインデックスのテストケースを実行"""
         code_file = self.app_controller.code_manager.code_file
         if not code_file or not os.path.exists(code_file):
             self.app_controller.ui.show_status_message(
                 "Pythonファイルが存在しません", "Warning.TLabel"
             )
-            return False
+            return
 
-        test_case = self.test_cases[test_index]
+        comparator = self.app_controller.ui.get_tab_comparator(tab_info)
+        cases = [self._read_case(test_case) for test_case in tab_info["test_cases"]]
 
-        # 入力と期待される出力を取得（ウィジェットから最新の値を取得）
-        input_data = test_case["input_widget"].get("1.0", tk.END).strip()
-        expected_output = test_case["output_widget"].get("1.0", tk.END).strip()
+        # インタプリタの探索も含めて別スレッドで実行
+        threading.Thread(
+            target=lambda: self._run_runtime_matrix_thread(tab_info, cases, comparator)
+        ).start()
+
+    def _run_runtime_matrix_thread(self, tab_info, cases, comparator=None):
+        """ランタイム × テストケースの表を作りながら実行"""
+        dispatcher = self.app_controller.dispatcher
+        ui = self.app_controller.ui
+
+        runtimes = self.runtimes.selected_runtimes()
+        if not runtimes:
+            self._post_status("比較できるランタイムが見つかりません", "Warning.TLabel")
+            return
+
+        compiled = self._compile_solution(tab_info["test_cases"])
+        if compiled is None:
+            return
+
+        code_file = self.app_controller.code_manager.code_file
+        limits = self.get_limits(tab_info.get("problem_id"))
+
+        # 起動時間を含めて計測するため、ゾイゴートは使わずに1プロセス内で繰り返し実行
+        timings_dir = tempfile.mkdtemp(prefix="atcoder_matrix_")
+        jobs = []
+        cells = []
+        timings_files = []
+        for runtime in runtimes:
+            for case_index, (input_data, expected_output) in enumerate(cases):
+                timings_files.append(os.path.join(timings_dir, f"{len(jobs)}.json"))
+                jobs.append(
+                    {
+                        "code_file": code_file,
+                        "input_data": input_data,
+                        "timeout": kill_timeout(limits) * MATRIX_REPEAT,
+                        "compiled": compiled,
+                        "expected_output": expected_output,
+                        "output_limit": limits["output_limit"],
+                        "comparator": comparator,
+                        "python": runtime["path"],
+                        "runner_args": bench_args(timings_files[-1]),
+                    }
+                )
+                cells.append((runtime["name"], case_index))
+
+        dispatcher.post(ui.show_runtime_matrix, tab_info, runtimes, len(cases))
+
+        def on_result(index, result):
+            runtime_name, case_index = cells[index]
+            times = split_warmup(result, read_timings(timings_files[index]))
+
+            # 判定は繰り返し全体ではなく1回分の実行時間で行う
+            single_run = dict(result, cpu_time=None)
+            if times["first"] is not None:
+                single_run["time"] = times["startup"] + times["first"]
+            verdict = judge_result(single_run, cases[case_index][1], limits, comparator)
+
+            dispatcher.post(
+                ui.set_runtime_matrix_cell,
+                tab_info,
+                runtime_name,
+                case_index,
+                verdict,
+                times,
+            )
 
         try:
-            # テスト実行
-            result = run_python_test(code_file, input_data)
-
-            # 実際の出力を表示
-            actual_output_widget = test_case["actual_output_widget"]
-            result_frame = test_case["result_frame"]
-
-            # UIスレッドで安全に更新
-            def update_ui():
-                # 出力結果を表示
-                actual_output_widget.config(state="normal")  # 編集可能に
-                actual_output_widget.delete("1.0", tk.END)
-                actual_output_widget.insert(tk.END, result["output"])
-
-                # 結果を比較
-                passed = compare_outputs(result["output"], expected_output)
-
-                # 結果ラベルを更新
-                result_frame.set_result(passed)
-
-                # エラーがあれば表示
-                if result["error"]:
-                    actual_output_widget.insert(
-                        tk.END, f"\n\n--- エラー出力 ---\n{result['error']}"
-                    )
+            self.scheduler.run(jobs, on_result)
+        finally:
+            shutil.rmtree(timings_dir, ignore_errors=True)
 
-                # 状態を読み取り専用に戻す必要がある場合はここでセット
-                # actual_output_widget.config(state="disabled")
+        self._post_status("ランタイム比較が完了しました", "Success.TLabel")
 
-            # UIスレッドで更新
-            self.app_controller.root.after(0, update_ui)
+    def profile_test_case(self, tab_info, case_index):
+        """指定されたタブのテストケースを1つだけcProfileで計測しながら実行"""
+        ui = self.app_controller.ui
+        test_cases = tab_info.get("test_cases", [])
+        if not 0 <= case_index < len(test_cases):
+            ui.show_status_message("テストケースがありません", "Warning.TLabel")
+            return
 
-            # 大文字小文字を区別せずに比較
-            passed = compare_outputs(result["output"], expected_output)
+        code_file = self.app_controller.code_manager.code_file
+        if not code_file or not os.path.exists(code_file):
+            ui.show_status_message("Pythonファイルが存在しません", "Warning.TLabel")
+            return
 
-            # 処理が完了するまで少し待機して、UIの更新が反映されるようにする
-            time.sleep(0.1)
+        # テスト実行と同じく、ウィジェットに入力されている最新の値を使う
+        test_case = test_cases[case_index]
+        input_data, expected_output = self._read_case(test_case)
+        comparator = ui.get_tab_comparator(tab_info)
+        limits = self.get_limits(tab_info.get("problem_id"))
+
+        test_case["case_list"].set_running(test_case)
+        ui.show_status_message(
+            f"テストケース {case_index + 1} をプロファイル中...", "Running.TLabel"
+        )
+        threading.Thread(
+            target=lambda: self._run_profile_thread(
+                tab_info,
+                case_index,
+                input_data,
+                expected_output,
+                comparator,
+                limits,
+            )
+        ).start()
 
-            return passed
+    def _run_profile_thread(
+        self, tab_info, case_index, input_data, expected_output, comparator, limits
+    ):
+        """プロファイルを取って結果を表示"""
+        ui = self.app_controller.ui
+        test_case = tab_info["test_cases"][case_index]
 
+        compiled = self._compile_solution([test_case])
+        if compiled is None:
+            return
+
+        try:
+            result, profile = profile_test(
+                self.app_controller.code_manager.code_file,
+                input_data,
+                kill_timeout(limits),
+                compiled=compiled,
+                python=self.runtimes.default_path(),
+            )
         except Exception as e:
-            # エラーメッセージを表示
-            def show_error():
-                test_case["actual_output_widget"].config(state="normal")
-                test_case["actual_output_widget"].delete("1.0", tk.END)
-                test_case["actual_output_widget"].insert(
-                    tk.END, f"エラーが発生しました: {str(e)}"
+            traceback.print_exc()
+            self._show_error(test_case, e)
+            return
+
+        # プロファイラの分だけ遅くなるので、判定は参考として表示する
+        verdict = judge_result(result, expected_output, limits, comparator)
+        self._show_result(test_case, verdict, result, limits)
+
+        if profile is None:
+            self._post_status(
+                "プロファイル結果を取得できませんでした", "Warning.TLabel"
+            )
+            return
+
+        title = f"テストケース {case_index + 1}"
+        self.app_controller.dispatcher.post(ui.show_profile, tab_info, title, profile)
+        self._post_status(f"{title} のプロファイルが完了しました", "Success.TLabel")
+
+    def run_stress_test(self, tab_info, generator_file, brute_file):
+        """ジェネレータと愚直解を使って指定されたタブの解答コードをストレステスト"""
+        ui = self.app_controller.ui
+        if self.stress_tester is not None:
+            ui.show_status_message("ストレステストは実行中です", "Warning.TLabel")
+            return
+
+        code_file = self.app_controller.code_manager.code_file
+        for path, name in (
+            (code_file, "Pythonファイル"),
+            (generator_file, "ジェネレータ"),
+            (brute_file, "愚直解"),
+        ):
+            if not path or not os.path.exists(path):
+                ui.show_status_message(f"{name}が存在しません", "Warning.TLabel")
+                return
+
+        comparator = ui.get_tab_comparator(tab_info)
+        self.stress_tester = StressTester(self.scheduler)
+        ui.set_stress_running(tab_info, True)
+
+        threading.Thread(
+            target=lambda: self._run_stress_thread(
+                tab_info, code_file, generator_file, brute_file, comparator
+            )
+        ).start()
+
+    def stop_stress_test(self):
+        """実行中のストレステストを止める"""
+        if self.stress_tester is not None:
+            self.stress_tester.stop()
+
+    def _run_stress_thread(
+        self, tab_info, code_file, generator_file, brute_file, comparator=None
+    ):
+        """ストレステストを実行し、失敗したケースをテストケースに追加"""
+        dispatcher = self.app_controller.dispatcher
+        ui = self.app_controller.ui
+
+        try:
+            programs = []
+            for path in (code_file, generator_file, brute_file):
+                compiled = self._compile_program(path, tab_info)
+                if compiled is None:
+                    return
+                programs.append((path, compiled))
+
+            def on_progress(cases, elapsed):
+                # 1フレームに複数の進捗が届いたら最新のものだけを表示
+                dispatcher.post_latest(
+                    ("stress_progress", id(tab_info)),
+                    ui.show_stress_progress,
+                    tab_info,
+                    cases,
+                    elapsed,
                 )
-                test_case["result_frame"].result_icon.config(
-                    text=ICON_WARNING, style="Warning.TLabel"
+
+            summary = self.stress_tester.run(
+                *programs,
+                self.get_limits(tab_info.get("problem_id")),
+                comparator,
+                zygote=self.zygote if self.use_zygote else None,
+                python=self.runtimes.default_path(),
+                on_progress=on_progress,
+            )
+        except Exception as e:
+            traceback.print_exc()
+            dispatcher.post(
+                ui.show_stress_message,
+                tab_info,
+                f"エラーが発生しました: {str(e)}",
+                "Error.TLabel",
+            )
+            return
+        finally:
+            self.stress_tester = None
+            dispatcher.post(ui.set_stress_running, tab_info, False)
+
+        dispatcher.post(self._show_stress_summary, tab_info, summary)
+
+    def _show_stress_summary(self, tab_info, summary):
+        """ストレステストの結果を表示（UIスレッドで呼ぶ）"""
+        ui = self.app_controller.ui
+        failure = summary["failure"]
+        if failure is None:
+            ui.show_stress_message(
+                tab_info,
+                f"{summary['cases']} ケースすべて一致しました"
+                f" ({summary['elapsed']:.1f} 秒)",
+                "Success.TLabel",
+            )
+            return
+
+        seed = failure["seed"]
+        if failure["stage"] != "solution":
+            # ジェネレータか愚直解が異常終了した
+            name = "ジェネレータ" if failure["stage"] == "generator" else "愚直解"
+            error = failure["result"]["error"].strip().splitlines()
+            ui.show_stress_message(
+                tab_info,
+                f"シード {seed} で{name}が異常終了しました: "
+                f"{error[-1] if error else ''}",
+                "Error.TLabel",
+            )
+            return
+
+        # 失敗したケースをテストケースとして追加し、タブのテストを実行して表示
+        ui.show_stress_message(
+            tab_info,
+            f"シード {seed} で {failure['verdict']} になりました"
+            f" ({summary['cases']} ケース目)",
+            "Error.TLabel",
+        )
+        problem_id = tab_info["problem_id"]
+        problem_info = self.app_controller.problems.get(problem_id)
+        if problem_info is None:
+            return
+        problem_info["test_cases"].append(
+            {
+                "input_title": f"ストレステスト (シード {seed})",
+                "input": failure["input"],
+                "output_title": "愚直解の出力",
+                "expected_output": failure["expected_output"],
+                "custom": True,
+            }
+        )
+        self.app_controller.save_problem(problem_id)
+        ui.update_problem_tab_test_cases(problem_id, problem_info["test_cases"])
+        if problem_id == self.app_controller.problem_id:
+            self.update_test_cases(problem_info["test_cases"])
+        self.run_tests_for_tab(ui.get_problem_tab_info(problem_id))
+
+    def run_scaling_analysis(self, tab_info, generator_file, max_n):
+        """入力サイズを変えながら解答コードを実行し、計算量を推定"""
+        ui = self.app_controller.ui
+        code_file = self.app_controller.code_manager.code_file
+        for path, name in (
+            (code_file, "Pythonファイル"),
+            (generator_file, "ジェネレータ"),
+        ):
+            if not path or not os.path.exists(path):
+                ui.show_status_message(f"{name}が存在しません", "Warning.TLabel")
+                return
+
+        ui.set_scaling_running(tab_info, True)
+        threading.Thread(
+            target=lambda: self._run_scaling_thread(
+                tab_info, code_file, generator_file, max_n
+            )
+        ).start()
+
+    def _run_scaling_thread(self, tab_info, code_file, generator_file, max_n):
+        """計測して結果を表示"""
+        dispatcher = self.app_controller.dispatcher
+        ui = self.app_controller.ui
+        limits = self.get_limits(tab_info.get("problem_id"))
+        measurements = []
+
+        def on_measure(n, used_time):
+            measurements.append((n, used_time))
+            text = "計測中... " + self._format_measurements(measurements)
+            dispatcher.post(ui.show_scaling_message, tab_info, text)
+
+        try:
+            programs = []
+            for path in (code_file, generator_file):
+                compiled = self._compile_program(path, tab_info, "scaling")
+                if compiled is None:
+                    return
+                programs.append((path, compiled))
+
+            sizes, times, error = run_scaling(
+                *programs,
+                limits,
+                scaling_sizes(max_n),
+                zygote=self.zygote if self.use_zygote else None,
+                python=self.runtimes.default_path(),
+                on_measure=on_measure,
+            )
+            if error:
+                message, style = error, "Error.TLabel"
+            else:
+                message, style = self._format_scaling_report(
+                    sizes, times, max_n, limits
                 )
-                test_case["result_frame"].result_label.config(
-                    text="エラー", style="Error.TLabel"
+        except Exception as e:
+            traceback.print_exc()
+            message, style = f"エラーが発生しました: {str(e)}", "Error.TLabel"
+        finally:
+            dispatcher.post(ui.set_scaling_running, tab_info, False)
+
+        dispatcher.post(ui.show_scaling_message, tab_info, message, style)
+
+    def _format_measurements(self, measurements):
+        """計測結果を表示用の文字列に整形"""
+        return ", ".join(f"N={n}: {t * 1000:.0f} ms" for n, t in measurements)
+
+    def _format_scaling_report(self, sizes, times, max_n, limits):
+        """
+        計算量の推定結果を表示用の文字列に整形
+
+        Returns:
+            (メッセージ, スタイル) のタプル
+        """
+        time_limit = limits["time_limit"]
+        lines = [self._format_measurements(list(zip(sizes, times)))]
+
+        fits = fit_complexity(sizes, times) if len(sizes) >= 3 else []
+        if fits:
+            lines.append(
+                "推定: "
+                + " / ".join(
+                    f"{fit['label']} (誤差 {fit['error']:.0%})" for fit in fits[:3]
                 )
-                # test_case["actual_output_widget"].config(state="disabled")
+            )
 
-            self.app_controller.root.after(0, show_error)
-            return False
+        # 最大Nまで計測できていれば実測値、できていなければ推定値で判断
+        if sizes and sizes[-1] == max_n:
+            expected_time = times[-1]
+            lines.append(
+                f"N={max_n} の実測: {expected_time:.2f} 秒 (制限 {time_limit} 秒)"
+            )
+        elif fits:
+            expected_time = estimate_time(fits[0], max_n)
+            lines.append(
+                f"N={max_n} の推定: 約 {expected_time:.2f} 秒 (制限 {time_limit} 秒)"
+            )
+        else:
+            lines.append("計測点が少ないため推定できません")
+            return "\n".join(lines), "Warning.TLabel"
 
-    def _run_tab_test(self, test_case):
-        """タブのテストケースを実行"""
-        code_file = self.app_controller.code_manager.code_file
-        if not code_file or not os.path.exists(code_file):
-            return False
+        if expected_time > time_limit:
+            lines.append("→ TLEの恐れがあります")
+            return "\n".join(lines), "Error.TLabel"
+        return "\n".join(lines), "Success.TLabel"
 
-        # 入力と期待される出力を取得（ウィジェットから最新の値を取得）
-        input_data = test_case["input_widget"].get("1.0", tk.END).strip()
-        expected_output = test_case["output_widget"].get("1.0", tk.END).strip()
+    def _compile_program(self, code_file, tab_info, panel="stress"):
+        """ストレステストや計算量の推定に使うプログラムをコンパイル（失敗したらNone）"""
+        try:
+            return self.compile_cache.compile(code_file)
+        except (SyntaxError, OSError) as e:
+            message = f"{os.path.basename(code_file)} をコンパイルできません: {str(e)}"
+            ui = self.app_controller.ui
+            show = (
+                ui.show_scaling_message
+                if panel == "scaling"
+                else ui.show_stress_message
+            )
+            self.app_controller.dispatcher.post(show, tab_info, message, "Error.TLabel")
+            return None
 
+    def _compile_solution(self, test_cases, cancelled=None):
+        """
+        解答コードをコンパイルする
+
+        構文エラーの場合は全テストケースをCEとして表示し、Noneを返す
+        （cancelled がセットされていれば表示しない）
+        """
+        code_file = self.app_controller.code_manager.code_file
         try:
-            # テスト実行
-            result = run_python_test(code_file, input_data)
-
-            # 実際の出力を表示
-            actual_output_widget = test_case["actual_output_widget"]
-            result_frame = test_case["result_frame"]
-
-            # UIスレッドで安全に更新
-            def update_ui():
-                # 出力結果を表示
-                actual_output_widget.config(state="normal")  # 編集可能に
-                actual_output_widget.delete("1.0", tk.END)
-                actual_output_widget.insert(tk.END, result["output"])
-
-                # 結果を比較
-                passed = compare_outputs(result["output"], expected_output)
-
-                # 結果ラベルを更新
-                result_frame.set_result(passed)
-
-                # エラーがあれば表示
-                if result["error"]:
-                    actual_output_widget.insert(
-                        tk.END, f"\n\n--- エラー出力 ---\n{result['error']}"
+            return self.compile_cache.compile(code_file)
+        except SyntaxError as e:
+            message = "".join(traceback.format_exception_only(type(e), e))
+
+            def show_compile_error():
+                # 反映までの間に新しい実行が始まっていれば表示しない
+                if cancelled is not None and cancelled.is_set():
+                    return
+
+                for test_case in test_cases:
+                    test_case["case_list"].set_result(
+                        test_case,
+                        VERDICT_CE,
+                        output=f"--- コンパイルエラー ---\n{message}",
                     )
 
-            # UIスレッドで更新
-            self.app_controller.root.after(0, update_ui)
+                self.app_controller.ui.show_status_message(
+                    f"構文エラーがあります: {e.msg} ({e.lineno}行目)", "Error.TLabel"
+                )
+
+            self.app_controller.dispatcher.post(show_compile_error)
+            return None
+        except OSError as e:
+            self._post_status(
+                f"ファイルの読み込みに失敗しました: {str(e)}", "Error.TLabel"
+            )
+            return None
+
+    def _run_cases(
+        self,
+        test_cases,
+        cases,
+        compiled=None,
+        comparator=None,
+        limits=None,
+        cancelled=None,
+        problem_id=None,
+    ):
+        """
+        テストケースをスケジューラで実行し、終わったものから結果を表示する
+
+        cases はテストケースごとの (入力, 期待される出力)。
+        cancelled がセットされたら残りのケースは実行せず、結果も表示しない。
+        problem_id を指定すると結果をその問題の最後の実行結果として保存する
+
+        Returns:
+            すべてACならTrue
+        """
+        code_file = self.app_controller.code_manager.code_file
+        if not code_file or not os.path.exists(code_file):
+            return False
+
+        limits = limits or dict(self.limits)
+        shown = set()
 
-            # 大文字小文字を区別せずに比較
-            passed = compare_outputs(result["output"], expected_output)
+        def on_result(index, verdict, result):
+            shown.add(index)
+            self._show_result(test_cases[index], verdict, result, limits, cancelled)
 
-            # 処理が完了するまで少し待機して、UIの更新が反映されるようにする
-            time.sleep(0.1)
+        try:
+            reports = self.engine.run_cases(
+                code_file,
+                cases,
+                compiled=compiled,
+                limits=limits,
+                comparator=comparator,
+                python=self.runtimes.default_path(),
+                zygote=self.zygote if self.use_zygote else None,
+                use_cache=self.use_result_cache,
+                cancelled=cancelled,
+                on_result=on_result,
+            )
+        except Exception as e:
+            print(f"テストの実行中にエラーが発生しました: {str(e)}")
+            for index, test_case in enumerate(test_cases):
+                if index not in shown:
+                    self._show_error(test_case, e)
+            return False
 
-            return passed
+        if problem_id is not None and not (cancelled and cancelled.is_set()):
+            self._save_results(problem_id, cases, reports)
 
+        return len(reports) == len(test_cases) and all_passed(reports)
+
+    def _save_results(self, problem_id, cases, reports):
+        """実行結果を問題の最後の結果として保存（次回の起動時に表示する）"""
+        problem_info = self.app_controller.problems.get(problem_id)
+        if problem_info is None:
+            return
+        results = [
+            (
+                report["index"],
+                cases[report["index"]][0],
+                cases[report["index"]][1],
+                report["verdict"],
+                report["result"],
+            )
+            for report in reports
+        ]
+        try:
+            self.app_controller.problem_store.save_results(problem_info, results)
         except Exception as e:
-            # エラーメッセージを表示
-            def show_error():
-                test_case["actual_output_widget"].config(state="normal")
-                test_case["actual_output_widget"].delete("1.0", tk.END)
-                test_case["actual_output_widget"].insert(
-                    tk.END, f"エラーが発生しました: {str(e)}"
-                )
-                test_case["result_frame"].result_icon.config(
-                    text=ICON_WARNING, style="Warning.TLabel"
-                )
-                test_case["result_frame"].result_label.config(
-                    text="エラー", style="Error.TLabel"
-                )
+            print(f"実行結果の保存に失敗しました: {str(e)}")
+
+    def show_saved_results(self, tab_info, results):
+        """
+        保存されていた最後の実行結果を問題タブに表示（メインスレッドから呼ぶ）
+
+        Args:
+            results: テストケースの番号 -> (判定, 実行結果)
+        """
+        limits = self.get_limits(tab_info.get("problem_id"))
+        test_cases = tab_info.get("test_cases", [])
+        for index, (verdict, result) in results.items():
+            if index < len(test_cases):
+                self._show_result(test_cases[index], verdict, result, limits)
+
+    def _show_result(self, test_case, verdict, result, limits, cancelled=None):
+        """テストケースの実行結果を表示（cancelled がセットされていれば表示しない）"""
+
+        # UIスレッドで安全に更新
+        def update_ui():
+            # 反映までの間に新しい実行が始まっていれば古い結果は捨てる
+            if cancelled is not None and cancelled.is_set():
+                return
+
+            # 出力結果と、エラーがあればエラー出力を表示
+            output = result["output"]
+            if result["error"]:
+                output += f"\n\n--- エラー出力 ---\n{result['error']}"
+            test_case["case_list"].set_result(
+                test_case, verdict, result, limits, output=output
+            )
 
-            self.app_controller.root.after(0, show_error)
-            return False
+        self.app_controller.dispatcher.post(update_ui)
+
+    def _show_error(self, test_case, error):
+        """テストケースの実行中に発生したエラーを表示"""
+        self.app_controller.dispatcher.post(
+            test_case["case_list"].set_error,
+            test_case,
+            f"エラーが発生しました: {str(error)}",
+        )
@@ -1,48 +1,429 @@
+import os
+import time
 import subprocess
+from core.process_io import communicate_fds, encode_text, decode_text, rusage_stats
+from core.streaming_judge import StreamingJudge
+from core.comparators import Comparator
+from core.zygote import Zygote
+from core.process_registry import live_processes, kill_process_group
+
+# デフォルトの実行制限（AtCoderの標準的な制限）
+DEFAULT_LIMITS = {
+    "time_limit": 2.0,  # 秒
+    "memory_limit": 1024 * 1024,  # KB
+    "output_limit": 32 * 1024 * 1024,  # バイト
+}
+
+# 強制終了までの時間に加える余裕（秒）
+KILL_MARGIN = 0.5
+
+# 判定結果
+VERDICT_AC = "AC"
+VERDICT_WA = "WA"
+VERDICT_TLE = "TLE"
+VERDICT_MLE = "MLE"
+VERDICT_RE = "RE"
+VERDICT_OLE = "OLE"
+VERDICT_CE = "CE"
+
+
+def _timeout_result():
+    """タイムアウト時の結果"""
+    return {
+        "output": "Timeout: プログラムの実行が長すぎます",
+        "error": "タイムアウトにより強制終了されました",
+        "success": False,
+    }
+
+
+def _make_result(execution, judge=None):
+    """実行結果からテスト結果を作成"""
+    aborted = execution.get("aborted", False)
+    matched = judge.finish() if judge else None
+
+    if execution["timed_out"]:
+        result = _timeout_result()
+    else:
+        output = judge.output() if judge else execution["stdout"].strip()
+        if judge and judge.output_limit_exceeded:
+            output += "\n\n--- 出力サイズ制限を超えたため実行を打ち切りました ---"
+        elif aborted:
+            output += "\n\n--- 出力が一致しないため実行を打ち切りました ---"
+        result = {
+            "output": output,
+            "error": execution["stderr"],
+            "success": execution["returncode"] == 0 and not aborted,
+        }
+
+    # リソース使用量（取得できない環境ではNone）
+    result.update(
+        {
+            "returncode": execution["returncode"],
+            "timed_out": execution["timed_out"],
+            "aborted": aborted,
+            "time": execution["time"],
+            "cpu_time": execution.get("cpu_time"),
+            "memory": execution.get("memory"),
+            "page_faults": execution.get("page_faults"),
+            "context_switches": execution.get("context_switches"),
+        }
+    )
+
+    # 逐次比較の結果
+    if judge:
+        result["output_matched"] = matched
+        result["output_limit_exceeded"] = judge.output_limit_exceeded
+    return result
+
+
+def kill_timeout(limits):
+    """
+    実行制限から強制終了までの時間を求める
+
+    TLEの判定はCPU時間で行うため、並列実行で遅れた分の余裕を持たせる
+    """
+    return limits["time_limit"] * 2 + KILL_MARGIN
+
+
+# コンパイル済みコードを実行するブートストラップ
+SOLUTION_RUNNER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "solution_runner.py"
+)
+
+
+def _solution_command(code_file, compiled, python="python", runner_args=None):
+    """
+    解答コードを実行するコマンドを作成
+
+    runner_args はブートストラップ（solution_runner.py）に渡すオプションで、
+    繰り返し実行の計測やプロファイルに使う
+    """
+    pyc_path = compiled.pyc_path if compiled is not None else ""
+    if runner_args:
+        return [python, SOLUTION_RUNNER, pyc_path, code_file] + list(runner_args)
+    if compiled is not None:
+        return [python, SOLUTION_RUNNER, pyc_path, code_file]
+    return [python, code_file]
 
 
 # tester.py の変更
-def run_python_test(code_file, input_data, timeout=5):
-    """指定されたPythonファイルで入力データを実行し、結果を返す"""
+def run_python_test(
+    code_file,
+    input_data,
+    timeout=None,
+    zygote=None,
+    compiled=None,
+    expected_output=None,
+    output_limit=None,
+    comparator=None,
+    python="python",
+    runner_args=None,
+):
+    """
+    指定されたPythonファイルで入力データを実行し、結果を返す
+
+    compiled に CompileCache でコンパイル済みのコードを渡すと、
+    子プロセスでのソースの読み込みとコンパイルを省略する。
+    expected_output を渡すと出力を受け取りながら比較し、不一致や
+    出力サイズ制限の超過が分かった時点で実行を打ち切る（比較方法は comparator）。
+    python には実行するインタプリタ、runner_args には繰り返し実行の計測や
+    プロファイルのためのブートストラップのオプションを指定する
+    """
+    if timeout is None:
+        timeout = kill_timeout(DEFAULT_LIMITS)
+    judge = create_judge(expected_output, output_limit, comparator)
+    on_stdout = judge.feed if judge else None
+
+    # パイプを直接扱える環境ではwait4やゾイゴートでリソース使用量も回収する
+    if hasattr(os, "wait4"):
+        spawn_options = {
+            "zygote": zygote,
+            "compiled": compiled,
+            "python": python,
+            "runner_args": runner_args,
+        }
+        return _run_posix(code_file, input_data, timeout, spawn_options, judge)
+
+    command = _solution_command(code_file, compiled, python, runner_args)
+
     process = None
     try:
         # Pythonプロセスを実行
+        start_time = time.perf_counter()
         process = subprocess.Popen(
-            ["python", code_file],
+            command,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
+            **_new_group_options(),
         )
+        live_processes.add(process.pid, code_file)
 
         # タイムアウトを設定して入力データを渡す
         stdout, stderr = process.communicate(input=input_data, timeout=timeout)
+        elapsed = time.perf_counter() - start_time
 
-        # 出力を整形
-        actual_output = stdout.strip()
+        # 逐次読み込みできない環境では終了後にまとめて比較する
+        if on_stdout:
+            on_stdout(encode_text(stdout))
 
-        return {
-            "output": actual_output,
-            "error": stderr,
-            "success": process.returncode == 0,
-        }
+        return _make_result(
+            {
+                "stdout": stdout,
+                "stderr": stderr,
+                "returncode": process.returncode,
+                "timed_out": False,
+                "time": elapsed,
+            },
+            judge,
+        )
     except subprocess.TimeoutExpired:
-        # タイムアウトした場合、プロセスを強制終了
+        # タイムアウトした場合、子孫プロセスも含めて強制終了
         if process:
-            process.kill()
+            kill_process_group(process.pid)
             stdout, stderr = process.communicate()
-        return {
-            "output": "Timeout: プログラムの実行が長すぎます",
-            "error": "タイムアウトにより強制終了されました",
-            "success": False,
-        }
+        return _make_result(
+            {
+                "stdout": "",
+                "stderr": "",
+                "returncode": process.returncode if process else None,
+                "timed_out": True,
+                "time": time.perf_counter() - start_time,
+            },
+            judge,
+        )
     except Exception as e:
         # その他のエラーが発生した場合もプロセスを終了
         if process and process.poll() is None:
-            process.kill()
+            kill_process_group(process.pid)
+            process.wait()
         return {"output": "", "error": str(e), "success": False}
+    finally:
+        if process:
+            live_processes.discard(process.pid)
+
+
+def create_judge(expected_output, output_limit=None, comparator=None):
+    """期待される出力があれば逐次比較用の StreamingJudge を作成"""
+    if expected_output is None:
+        return None
+    return StreamingJudge(
+        expected_output,
+        output_limit or DEFAULT_LIMITS["output_limit"],
+        comparator,
+    )
+
+
+def spawn_test(
+    code_file, zygote=None, compiled=None, python="python", runner_args=None
+):
+    """
+    テストプロセスを起動する（POSIX専用）
+
+    ゾイゴートが使える場合はゾイゴートからfork、それ以外はsubprocessで起動する。
+    ブートストラップのオプション（runner_args）を指定した場合は
+    インタプリタの起動時間も含めて測るため常にsubprocessで起動する
+
+    Returns:
+        pid, stdin, stdout, stderr（親側のfd）, process（Popen）,
+        zygote_conn（ゾイゴートの接続ソケット）をキーに持つ辞書
+    """
+    pyc_path = compiled.pyc_path if compiled is not None else None
+    if zygote is not None and not runner_args and zygote.ensure_started():
+        pid, stdin_w, stdout_r, stderr_r, conn = zygote.spawn(code_file, pyc_path)
+        # ゾイゴートの子はアプリが回収しないので、終了はゾイゴートに頼む
+        live_processes.add(pid, code_file, kill=lambda: Zygote.kill(conn))
+        return {
+            "pid": pid,
+            "stdin": stdin_w,
+            "stdout": stdout_r,
+            "stderr": stderr_r,
+            "process": None,
+            "zygote_conn": conn,
+        }
+
+    stdin_r, stdin_w = os.pipe()
+    stdout_r, stdout_w = os.pipe()
+    stderr_r, stderr_w = os.pipe()
+    try:
+        process = subprocess.Popen(
+            _solution_command(code_file, compiled, python, runner_args),
+            stdin=stdin_r,
+            stdout=stdout_w,
+            stderr=stderr_w,
+            start_new_session=True,
+        )
+    except Exception:
+        for fd in (stdin_w, stdout_r, stderr_r):
+            os.close(fd)
+        raise
+    finally:
+        # 子プロセス側の端は親では不要
+        for fd in (stdin_r, stdout_w, stderr_w):
+            os.close(fd)
+
+    live_processes.add(process.pid, code_file)
+    return {
+        "pid": process.pid,
+        "stdin": stdin_w,
+        "stdout": stdout_r,
+        "stderr": stderr_r,
+        "process": process,
+        "zygote_conn": None,
+    }
+
+
+def _new_group_options():
+    """テストプロセスを独立したプロセスグループで起動するための Popen の引数"""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def kill_test(spawned):
+    """テストプロセスを子孫プロセスも含めて強制終了"""
+    if spawned["zygote_conn"] is not None:
+        Zygote.kill(spawned["zygote_conn"])
+    else:
+        kill_process_group(spawned["pid"])
+
+
+def reap_test(spawned, status, rusage):
+    """
+    subprocessで起動したテストプロセスの os.wait4 の結果から
+    (終了コード, リソース使用量) を求める
+    """
+    returncode = os.waitstatus_to_exitcode(status)
+    # Popenにも終了を伝えておく
+    spawned["process"].returncode = returncode
+    live_processes.discard(spawned["pid"])
+    return returncode, rusage_stats(rusage)
+
+
+def poll_test(spawned):
+    """
+    subprocessで起動したテストプロセスが終了していれば回収する
+
+    回収する前にプロセスグループに残った子孫プロセスを終了させる
+    （回収前ならpidが再利用されないため、無関係なプロセスを終了させることはない）
+
+    Returns:
+        (終了コード, リソース使用量) のタプル。実行中ならNone
+    """
+    pid = spawned["pid"]
+    if hasattr(os, "waitid"):
+        if os.waitid(os.P_PID, pid, os.WEXITED | os.WNOHANG | os.WNOWAIT) is None:
+            return None
+        kill_process_group(pid)
+        _, status, rusage = os.wait4(pid, 0)
+    else:
+        reaped_pid, status, rusage = os.wait4(pid, os.WNOHANG)
+        if reaped_pid == 0:
+            return None
+        kill_process_group(pid)
+    return reap_test(spawned, status, rusage)
+
+
+def wait_test(spawned):
+    """テストプロセスの終了を待って (終了コード, リソース使用量) を返す"""
+    if spawned["zygote_conn"] is not None:
+        try:
+            return Zygote.read_status(spawned["zygote_conn"])
+        finally:
+            live_processes.discard(spawned["pid"])
+
+    pid = spawned["pid"]
+    if hasattr(os, "waitid"):
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        kill_process_group(pid)
+        _, status, rusage = os.wait4(pid, 0)
+    else:
+        _, status, rusage = os.wait4(pid, 0)
+        kill_process_group(pid)
+    return reap_test(spawned, status, rusage)
+
+
+def finish_test(
+    stdout, stderr, returncode, stats, timed_out, aborted, elapsed, judge=None
+):
+    """子プロセスの出力と終了状態からテスト結果を作成"""
+    execution = {
+        "stdout": decode_text(stdout),
+        "stderr": decode_text(stderr),
+        "returncode": returncode,
+        "timed_out": timed_out,
+        "aborted": aborted,
+        "time": elapsed,
+    }
+    execution.update(stats)
+    return _make_result(execution, judge)
+
+
+def _run_posix(code_file, input_data, timeout, spawn_options, judge=None):
+    """パイプのfdを直接扱ってテストを実行し、リソース使用量とともに結果を返す"""
+    try:
+        spawned = spawn_test(code_file, **spawn_options)
+    except Exception as e:
+        return {"output": "", "error": str(e), "success": False}
+
+    start_time = time.perf_counter()
+    try:
+        stdout, stderr, timed_out, aborted = communicate_fds(
+            spawned["stdin"],
+            spawned["stdout"],
+            spawned["stderr"],
+            encode_text(input_data),
+            timeout,
+            judge.feed if judge else None,
+        )
+    except Exception as e:
+        kill_test(spawned)
+        wait_test(spawned)
+        return {"output": "", "error": str(e), "success": False}
+
+    if timed_out or aborted:
+        kill_test(spawned)
+
+    returncode, stats = wait_test(spawned)
+    elapsed = time.perf_counter() - start_time
+    return finish_test(
+        stdout, stderr, returncode, stats, timed_out, aborted, elapsed, judge
+    )
+
+
+def compare_outputs(actual, expected, comparator=None):
+    """実際の出力と期待される出力を比較（デフォルトは大文字小文字を区別しない）"""
+    return (comparator or Comparator()).compare(actual, expected)
+
+
+def judge_result(result, expected, limits=None, comparator=None):
+    """実行結果を実行制限と期待される出力からAC/WA/TLE/MLE/OLE/REに判定"""
+    limits = limits or DEFAULT_LIMITS
+
+    # CPU時間が取れる場合は並列実行の影響を受けにくいCPU時間で判定
+    used_time = result.get("cpu_time")
+    if used_time is None:
+        used_time = result.get("time")
 
+    if result.get("timed_out") or (
+        used_time is not None and used_time > limits["time_limit"]
+    ):
+        return VERDICT_TLE
+    if result.get("output_limit_exceeded"):
+        return VERDICT_OLE
+    memory = result.get("memory")
+    if memory is not None and memory > limits["memory_limit"]:
+        return VERDICT_MLE
+    # 出力の不一致で打ち切った場合は終了コードによらずWA
+    if result.get("aborted"):
+        return VERDICT_WA
+    if not result["success"]:
+        return VERDICT_RE
 
-def compare_outputs(actual, expected):
-    """実際の出力と期待される出力を比較（大文字小文字を区別しない）"""
-    return actual.lower() == expected.lower()
+    matched = result.get("output_matched")
+    if matched is None:
+        matched = compare_outputs(result["output"], expected, comparator)
+    if not matched:
+        return VERDICT_WA
+    return VERDICT_AC
@@ -0,0 +1,71 @@
+import threading
+import collections
+
+# UIの更新をまとめて反映する間隔（ミリ秒、約60fps）
+FRAME_INTERVAL_MS = 16
+
+
+class UIDispatcher:
+    """
+    ワーカースレッドからのUI更新をメインスレッドでまとめて反映するクラス
+
+    ワーカースレッドは post で更新処理をキューに積むだけで、Tkのウィジェットには
+    触れない。メインスレッドのポンプが1フレームごとにキューを空にして反映する。
+    post_latest で積んだ更新はキーごとに最新のものだけを反映する（進捗表示など）
+    """
+
+    def __init__(self, root, interval_ms=FRAME_INTERVAL_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.queue = collections.deque()
+        self.latest = {}  # キー -> 最新の (関数, 引数)
+        self.lock = threading.Lock()
+        self.main_thread = threading.current_thread()
+        self.after_id = None
+
+    def start(self):
+        """ポンプを開始"""
+        if self.after_id is None:
+            self.after_id = self.root.after(self.interval_ms, self._pump)
+
+    def stop(self):
+        """ポンプを停止"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def post(self, func, *args):
+        """UIの更新をキューに積む（どのスレッドからでも呼べる）"""
+        self.queue.append((func, args))
+
+    def post_latest(self, key, func, *args):
+        """同じキーの更新が反映前に積まれていれば、最新のものだけを反映する"""
+        with self.lock:
+            pending = key in self.latest
+            self.latest[key] = (func, args)
+        if not pending:
+            self.queue.append((self._run_latest, (key,)))
+
+    def call(self, func, *args):
+        """メインスレッドならすぐに実行し、それ以外のスレッドからはキューに積む"""
+        if threading.current_thread() is self.main_thread:
+            func(*args)
+        else:
+            self.post(func, *args)
+
+    def _run_latest(self, key):
+        with self.lock:
+            func, args = self.latest.pop(key)
+        func(*args)
+
+    def _pump(self):
+        """このフレームまでに積まれた更新をまとめて反映"""
+        try:
+            for _ in range(len(self.queue)):
+                func, args = self.queue.popleft()
+                try:
+                    func(*args)
+                except Exception as e:
+                    print(f"UIの更新に失敗しました: {str(e)}")
+        finally:
+            self.after_id = self.root.after(self.interval_ms, self._pump)
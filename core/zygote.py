@@ -0,0 +1,181 @@
+import os
+import json
+import shutil
+import socket
+import tempfile
+import threading
+import subprocess
+from types import SimpleNamespace
+from core.process_io import rusage_stats
+
+
+class Zygote:
+    """
+    事前にモジュールを読み込んだ常駐プロセス（ゾイゴート）を管理するクラス
+
+    テストケースごとにゾイゴートからforkした子プロセスで解答コードを実行するため、
+    インタプリタの起動やモジュールのインポートにかかる時間を省略できる
+    """
+
+    def __init__(self, python="python"):
+        """
+        Args:
+            python: ゾイゴートを起動するPythonの実行ファイル
+        """
+        self.python = python
+        self.process = None
+        self.sock_dir = None
+        self.sock_path = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def is_supported():
+        """この環境でゾイゴートが使用できるかどうか"""
+        return (
+            hasattr(os, "fork")
+            and hasattr(socket, "AF_UNIX")
+            and hasattr(socket, "send_fds")
+        )
+
+    def ensure_started(self):
+        """ゾイゴートが起動していなければ起動する"""
+        with self.lock:
+            if self.process and self.process.poll() is None:
+                return True
+
+            self._cleanup()
+            try:
+                self.sock_dir = tempfile.mkdtemp(prefix="atcoder_zygote_")
+                self.sock_path = os.path.join(self.sock_dir, "zygote.sock")
+                server_script = os.path.join(
+                    os.path.dirname(os.path.abspath(__file__)), "zygote_server.py"
+                )
+                self.process = subprocess.Popen(
+                    [self.python, server_script, self.sock_path],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+
+                # 事前インポートが終わるまで待機
+                if self.process.stdout.readline().strip() != b"ready":
+                    raise RuntimeError("ゾイゴートの起動に失敗しました")
+                return True
+            except Exception as e:
+                print(f"ゾイゴートの起動に失敗しました: {str(e)}")
+                self._cleanup()
+                return False
+
+    def stop(self):
+        """ゾイゴートを停止"""
+        with self.lock:
+            self._cleanup()
+
+    def _cleanup(self):
+        """プロセスと一時ファイルを片付ける"""
+        if self.process:
+            try:
+                # 標準入力を閉じるとゾイゴートは子プロセスを終了させて停止する
+                self.process.stdin.close()
+                self.process.wait(timeout=1)
+            except Exception:
+                self.process.kill()
+                self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+
+        if self.sock_dir:
+            shutil.rmtree(self.sock_dir, ignore_errors=True)
+            self.sock_dir = None
+            self.sock_path = None
+
+    def spawn(self, code_file, pyc_path=None):
+        """
+        ゾイゴートからforkした子プロセスでコードの実行を開始
+
+        pyc_path を渡すとゾイゴートが読み込んだコンパイル済みコードを共有して実行する。
+        終了状態は返された接続ソケットに1行のJSONとして届く（parse_status で解釈する）
+
+        Returns:
+            (pid, 標準入力のfd, 標準出力のfd, 標準エラー出力のfd, 接続ソケット) のタプル
+        """
+        stdin_r, stdin_w = os.pipe()
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            try:
+                conn.connect(self.sock_path)
+                request = {
+                    "code_file": code_file,
+                    "pyc_path": pyc_path,
+                    "cwd": os.getcwd(),
+                }
+                socket.send_fds(
+                    conn,
+                    [json.dumps(request).encode("utf-8")],
+                    [stdin_r, stdout_w, stderr_w],
+                )
+            finally:
+                # 子プロセス側の端はゾイゴートに渡したので閉じる
+                for fd in (stdin_r, stdout_w, stderr_w):
+                    os.close(fd)
+
+            # forkの結果（pid）は直後に届く
+            reply = self._read_line(conn)
+            if "error" in reply:
+                raise RuntimeError(reply["error"])
+        except Exception:
+            for fd in (stdin_w, stdout_r, stderr_r):
+                os.close(fd)
+            conn.close()
+            raise
+
+        return reply["pid"], stdin_w, stdout_r, stderr_r, conn
+
+    @staticmethod
+    def kill(conn):
+        """
+        ゾイゴートに子プロセスを子孫プロセスも含めて強制終了させる
+
+        子プロセスを回収するのはゾイゴートなので、アプリからpidで終了させると
+        回収された後に再利用された無関係なプロセスを終了させるおそれがある。
+        ゾイゴートは回収する前の子プロセスだけを終了させる
+        """
+        try:
+            conn.send(b"kill\n")
+        except OSError:
+            # 終了状態を受け取って接続を閉じた後（すでに終了している）
+            pass
+
+    @staticmethod
+    def read_status(conn):
+        """
+        子プロセスの終了を待って終了状態を受け取る
+
+        Returns:
+            (終了コード, リソース使用量) のタプル
+        """
+        try:
+            return Zygote.parse_status(Zygote._read_line(conn))
+        finally:
+            conn.close()
+
+    @staticmethod
+    def parse_status(message):
+        """ゾイゴートから届いた終了状態を (終了コード, リソース使用量) に変換"""
+        if isinstance(message, (bytes, str)):
+            message = json.loads(message)
+        stats = rusage_stats(SimpleNamespace(**message["rusage"]))
+        return message["returncode"], stats
+
+    @staticmethod
+    def _read_line(conn):
+        """接続ソケットから1行のJSONを読み込む（次の行を読みすぎないよう1バイトずつ）"""
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = conn.recv(1)
+            if not chunk:
+                raise RuntimeError("ゾイゴートとの接続が切断されました")
+            data += chunk
+        return json.loads(data)
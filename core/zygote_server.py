@@ -0,0 +1,294 @@
+"""
+ゾイゴートプロセス本体
+
+よく使うモジュールを事前にインポートした状態で常駐し、
+テストケースごとに fork した子プロセスで解答コードを実行する。
+アプリケーションからは core/zygote.py の Zygote クラス経由で起動される。
+このファイルはスクリプトとして直接実行されるため、標準ライブラリと solution_runner のみに依存する。
+"""
+
+import os
+import sys
+import json
+import signal
+import socket
+import selectors
+import traceback
+from solution_runner import load_code, exec_solution
+
+# 事前にインポートしておくモジュール（コードテンプレートの先頭行と同じもの）
+PRELOAD_MODULES = [
+    "bisect",
+    "collections",
+    "copy",
+    "heapq",
+    "itertools",
+    "math",
+    "numpy",
+    "string",
+]
+
+# 子プロセスのリソース使用量として返す項目
+RUSAGE_FIELDS = [
+    "ru_utime",
+    "ru_stime",
+    "ru_maxrss",
+    "ru_minflt",
+    "ru_majflt",
+    "ru_nvcsw",
+    "ru_nivcsw",
+]
+
+# リクエストの最大サイズ
+MAX_REQUEST_SIZE = 65536
+
+# 保持するコンパイル済みコードの数
+CODE_CACHE_SIZE = 16
+
+
+def kill_process_group(pid):
+    """子プロセスのプロセスグループごと強制終了（グループを作る前ならプロセスだけ）"""
+    try:
+        os.killpg(pid, signal.SIGKILL)
+        return
+    except (ProcessLookupError, PermissionError):
+        pass
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def preload_modules():
+    """よく使うモジュールを事前にインポート"""
+    for name in PRELOAD_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+
+def run_child(request, code, fds, close_fds):
+    """fork後の子プロセスで解答コードを実行する（戻らない）"""
+    exit_code = 1
+    try:
+        # 解答コードが起動した子孫プロセスもまとめて終了できるように新しいセッションにする
+        os.setsid()
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        for fd in close_fds:
+            os.close(fd)
+
+        # 標準入出力をテスト用のパイプに差し替え
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", closefd=False)
+        sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+        os.chdir(request["cwd"])
+        code_file = request["code_file"]
+        if code is None:
+            code = load_code(None, code_file)
+        exit_code = exec_solution(code, code_file)
+    except BaseException:
+        traceback.print_exc(limit=0)
+        sys.stderr.flush()
+    finally:
+        os._exit(exit_code)
+
+
+class ZygoteServer:
+    """接続ごとに解答コードの子プロセスをforkするサーバー"""
+
+    def __init__(self, sock_path):
+        self.sock_path = sock_path
+        self.children = {}  # pid -> 接続ソケット
+        self.code_cache = {}  # .pycのパス -> コードオブジェクト
+        self.selector = selectors.DefaultSelector()
+        self.running = False
+
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(sock_path)
+        self.listener.listen(64)
+
+        # SIGCHLDをセレクタで受け取るためのパイプ
+        self.wakeup_r, self.wakeup_w = os.pipe()
+        os.set_blocking(self.wakeup_r, False)
+        os.set_blocking(self.wakeup_w, False)
+        signal.set_wakeup_fd(self.wakeup_w)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+        self.selector.register(self.listener, selectors.EVENT_READ, self._accept)
+        self.selector.register(self.wakeup_r, selectors.EVENT_READ, self._reap)
+        # 親プロセス（アプリ）の終了は標準入力のEOFで検知する
+        self.selector.register(sys.stdin.fileno(), selectors.EVENT_READ, self._stop)
+
+    def serve_forever(self):
+        """リクエストを処理し続ける"""
+        self.running = True
+        while self.running:
+            try:
+                events = self.selector.select()
+            except InterruptedError:
+                continue
+            for key, _ in events:
+                key.data()
+
+    def _stop(self):
+        """アプリの終了を検知したらサーバーを止める"""
+        if not os.read(sys.stdin.fileno(), 1024):
+            self.running = False
+            for pid in list(self.children):
+                kill_process_group(pid)
+
+    def _accept(self):
+        """新しいリクエストを受け付けて子プロセスをfork"""
+        conn, _ = self.listener.accept()
+        fds = []
+        try:
+            message, fds, _, _ = socket.recv_fds(conn, MAX_REQUEST_SIZE, 3)
+            if len(fds) != 3:
+                raise ValueError("ファイルディスクリプタが不足しています")
+            request = json.loads(message.decode("utf-8"))
+            code = self._get_code(request.get("pyc_path"), request["code_file"])
+
+            close_fds = [
+                self.listener.fileno(),
+                self.wakeup_r,
+                self.wakeup_w,
+                self.selector.fileno(),
+                conn.fileno(),
+            ] + [sock.fileno() for sock in self.children.values()]
+
+            pid = os.fork()
+            if pid == 0:
+                run_child(request, code, fds, close_fds)
+
+            self.children[pid] = conn
+            self._send(conn, {"pid": pid})
+            # 強制終了の依頼は接続ソケットで受け取る
+            self.selector.register(
+                conn,
+                selectors.EVENT_READ,
+                lambda pid=pid, conn=conn: self._on_kill_request(pid, conn),
+            )
+        except Exception as e:
+            self._send(conn, {"error": str(e)})
+            conn.close()
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _on_kill_request(self, pid, conn):
+        """
+        アプリから強制終了を頼まれたら子プロセスを終了させる
+
+        回収する前の子プロセスだけを終了させるので、pidが再利用されていることはない。
+        アプリが接続を閉じた（結果を待たなくなった）場合も終了させる
+        """
+        try:
+            data = conn.recv(1024)
+        except OSError:
+            data = b""
+        if not data:
+            self._unregister(conn)
+        if pid in self.children:
+            kill_process_group(pid)
+
+    def _unregister(self, conn):
+        """接続ソケットをセレクタから外す（外してあれば何もしない）"""
+        try:
+            self.selector.unregister(conn)
+        except (KeyError, ValueError):
+            pass
+
+    def _get_code(self, pyc_path, code_file):
+        """
+        コンパイル済みコードを読み込んでキャッシュする
+
+        fork前に読み込んでおくことで、すべての子プロセスが同じコードオブジェクトを共有する
+        """
+        if not pyc_path:
+            return None
+        if pyc_path not in self.code_cache:
+            try:
+                code = load_code(pyc_path, code_file)
+            except Exception:
+                # 読み込めなければ子プロセス側でコンパイルさせる
+                return None
+            if len(self.code_cache) >= CODE_CACHE_SIZE:
+                self.code_cache.pop(next(iter(self.code_cache)))
+            self.code_cache[pyc_path] = code
+        return self.code_cache[pyc_path]
+
+    def _reap(self):
+        """終了した子プロセスを回収して結果を返す"""
+        try:
+            while os.read(self.wakeup_r, 1024):
+                pass
+        except BlockingIOError:
+            pass
+
+        while self.children:
+            try:
+                pid, status, rusage = self._wait_child()
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+
+            conn = self.children.pop(pid, None)
+            if conn is None:
+                continue
+            self._unregister(conn)
+            self._send(
+                conn,
+                {
+                    "returncode": os.waitstatus_to_exitcode(status),
+                    "rusage": {name: getattr(rusage, name) for name in RUSAGE_FIELDS},
+                },
+            )
+            conn.close()
+
+    def _wait_child(self):
+        """
+        終了した子プロセスを1つ回収する（なければpidは0）
+
+        回収する前に、子プロセスのセッションに残った子孫プロセスを終了させる
+        """
+        if not hasattr(os, "waitid"):
+            pid, status, rusage = os.wait4(-1, os.WNOHANG)
+            if pid:
+                kill_process_group(pid)
+            return pid, status, rusage
+
+        info = os.waitid(os.P_ALL, 0, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+        if info is None:
+            return 0, 0, None
+        kill_process_group(info.si_pid)
+        return os.wait4(info.si_pid, 0)
+
+    def _send(self, conn, message):
+        """1行のJSONとしてメッセージを送信"""
+        try:
+            conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+
+
+def main():
+    sock_path = sys.argv[1]
+    preload_modules()
+    server = ZygoteServer(sock_path)
+
+    # 準備完了を通知
+    sys.stdout.write("ready\n")
+    sys.stdout.flush()
+
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,54 @@
-import tkinter as tk
-from core.app import AtCoderTestTool
+import sys
+import threading
+from core.startup_profile import StartupProfile
 
+# --startup-profile を付けて起動すると起動時間の内訳を表示する
+startup_profile = StartupProfile.from_argv(sys.argv)
 
-def main():
-    root = tk.Tk()
-    app = AtCoderTestTool(root)
-
-    # ウィンドウ閉じる時のイベントを設定
-    root.protocol("WM_DELETE_WINDOW", app.on_closing)
 
-    # グローバルホットキーの設定
-    import keyboard
+def setup_hotkey(root, app):
+    """グローバルホットキーを設定（keyboard の読み込みに時間がかかるため別スレッドで呼ぶ）"""
+    try:
+        import keyboard
+    except ImportError as e:
+        print(f"グローバルホットキーを設定できません: {str(e)}")
+        return
 
     def activate_window_handler():
         # Tkinterのメインスレッドで実行
         root.after(0, app.activate_window)
 
     # Alt+Hのホットキー設定
-    keyboard.add_hotkey("alt+h", activate_window_handler)
+    try:
+        keyboard.add_hotkey("alt+h", activate_window_handler)
+    except Exception as e:
+        print(f"グローバルホットキーを設定できません: {str(e)}")
+
+
+def main():
+    import tkinter as tk
+
+    startup_profile.mark("tkinter の読み込み")
+    from core.app import AtCoderTestTool
+
+    startup_profile.mark("アプリの読み込み")
+
+    root = tk.Tk()
+    startup_profile.mark("Tk の初期化")
+    app = AtCoderTestTool(root, startup_profile)
+
+    # ウィンドウ閉じる時のイベントを設定
+    root.protocol("WM_DELETE_WINDOW", app.on_closing)
+
+    def on_first_frame():
+        startup_profile.mark("ウィンドウの表示")
+        # 起動直後に必要ないものはウィンドウの表示後に準備する
+        app.finish_startup()
+        threading.Thread(target=setup_hotkey, args=(root, app), daemon=True).start()
+        startup_profile.mark("表示後の準備")
+        startup_profile.report()
+
+    root.after_idle(on_first_frame)
 
     root.mainloop()
 
@@ -1,7 +1,19 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, simpledialog, filedialog
 from ui.widgets import create_scrolledtext
-from ui.styles import COLOR_BG_MEDIUM
+from ui.test_case_list import TestCaseList
+from ui.runtime_matrix import RuntimeMatrixFrame
+from ui.stress_frame import StressFrame
+from ui.scaling_frame import ScalingFrame
+from ui.profile_frame import ProfileFrame
+from core.comparators import Comparator, COMPARATOR_MODES, MODE_FLOAT
+from core.scheduler import MODE_AUTO, MODE_SERIAL, MODE_PARALLEL
+from core.stress import stress_file_paths, companion_file
+from core.complexity import default_max_n
+from core.process_registry import live_processes
+
+# 実行中のプロセス数の表示を更新する間隔（ミリ秒）
+PROCESS_COUNT_INTERVAL_MS = 500
 
 
 class MainWindow:
@@ -27,6 +39,9 @@ class MainWindow:
         # 問題タブ管理の初期化
         self.problem_tabs = {}  # 問題ID -> タブIDのマッピング
         self.tab_test_frames = {}  # タブID -> テストフレームのマッピング
+        self.pending_tabs = (
+            {}
+        )  # タブID -> ウィジェットをまだ作っていない問題タブのフレーム
 
         # メニューバーの設定
         menubar = tk.Menu(root)
@@ -59,6 +74,61 @@ class MainWindow:
             command=self.app_controller.run_all_tests,
             accelerator="F5",
         )
+        test_runner = self.app_controller.test_runner
+        self.auto_run_var = tk.BooleanVar(value=test_runner.auto_run)
+        runmenu.add_checkbutton(
+            label="保存時に自動でテスト実行",
+            variable=self.auto_run_var,
+            command=lambda: test_runner.set_auto_run(self.auto_run_var.get()),
+        )
+        self.zygote_var = tk.BooleanVar(value=test_runner.use_zygote)
+        runmenu.add_checkbutton(
+            label="ゾイゴートで高速実行",
+            variable=self.zygote_var,
+            command=lambda: test_runner.set_use_zygote(self.zygote_var.get()),
+            state="normal" if test_runner.zygote else "disabled",
+        )
+        self.result_cache_var = tk.BooleanVar(value=test_runner.use_result_cache)
+        runmenu.add_checkbutton(
+            label="変更のないケースは前回の結果を使う",
+            variable=self.result_cache_var,
+            command=lambda: test_runner.set_use_result_cache(
+                self.result_cache_var.get()
+            ),
+        )
+        runmenu.add_command(
+            label="実行結果のキャッシュを削除", command=test_runner.result_cache.clear
+        )
+        runmenu.add_command(label="実行制限の設定...", command=self._ask_limits)
+
+        # 実行に使うランタイム（インタプリタは起動後に別スレッドで探索する）
+        self.runtime_var = tk.StringVar(value=test_runner.runtimes.default)
+        self.runtime_menu = tk.Menu(
+            runmenu, tearoff=0, postcommand=self.update_runtime_menu
+        )
+        runmenu.add_cascade(label="ランタイム", menu=self.runtime_menu)
+
+        # 並列実行モード
+        runmenu.add_separator()
+        self.parallel_var = tk.StringVar(value=test_runner.scheduler.mode)
+        runmenu.add_radiobutton(
+            label="並列数を自動で決定",
+            variable=self.parallel_var,
+            value=MODE_AUTO,
+            command=lambda: self._set_parallelism(MODE_AUTO),
+        )
+        runmenu.add_radiobutton(
+            label="1つずつ実行",
+            variable=self.parallel_var,
+            value=MODE_SERIAL,
+            command=lambda: self._set_parallelism(MODE_SERIAL),
+        )
+        runmenu.add_radiobutton(
+            label="並列数を指定...",
+            variable=self.parallel_var,
+            value=MODE_PARALLEL,
+            command=self._ask_parallelism,
+        )
         menubar.add_cascade(label="実行", menu=runmenu)
 
         root.config(menu=menubar)
@@ -87,10 +157,21 @@ class MainWindow:
         )
         self.info_label.pack(side=tk.LEFT, padx=10, pady=5)
 
+        # 実行中のテストプロセスの数
+        self.process_label = ttk.Label(header_frame, text="", style="Status.TLabel")
+        self.process_label.pack(side=tk.RIGHT, padx=10, pady=5)
+        self._update_process_count()
+
         # ステータスメッセージ
         self.status_label = ttk.Label(header_frame, text="", style="Status.TLabel")
         self.status_label.pack(side=tk.RIGHT, padx=10, pady=5)
 
+    def _update_process_count(self):
+        """回収していないテストプロセスの数を定期的に表示"""
+        count = live_processes.count()
+        self.process_label.config(text=f"実行中のプロセス: {count}" if count else "")
+        self.root.after(PROCESS_COUNT_INTERVAL_MS, self._update_process_count)
+
     def _create_loading_indicator(self):
         """ローディングインジケータを作成"""
         # 解析中インジケータフレーム
@@ -150,6 +231,23 @@ class MainWindow:
         )
         paste_button.pack(side=tk.RIGHT)
 
+        # 保存した問題ページからコンテストの問題をまとめて読み込むボタン
+        import_folder_button = ttk.Button(
+            html_header,
+            text="フォルダから一括読み込み",
+            command=self._import_folder,
+            style="Primary.TButton",
+        )
+        import_folder_button.pack(side=tk.RIGHT, padx=(0, 5))
+
+        import_files_button = ttk.Button(
+            html_header,
+            text="ファイルから一括読み込み",
+            command=self._import_files,
+            style="Primary.TButton",
+        )
+        import_files_button.pack(side=tk.RIGHT, padx=(0, 5))
+
         # HTML入力エリア
         self.html_text = create_scrolledtext(html_tab, height=6)
         self.html_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
@@ -157,6 +255,21 @@ class MainWindow:
         # HTMLテキストエリアの変更を監視
         self.html_text.bind("<KeyRelease>", self.app_controller.on_html_change)
 
+    def _import_files(self):
+        """問題ページのファイル（「すべての問題を印刷」のページも可）を選んで読み込む"""
+        paths = filedialog.askopenfilenames(
+            title="問題ページを選択",
+            filetypes=[("HTML", "*.html *.htm"), ("すべてのファイル", "*.*")],
+        )
+        if paths:
+            self.app_controller.import_pages(paths)
+
+    def _import_folder(self):
+        """問題ページを保存したフォルダを選んで読み込む"""
+        folder = filedialog.askdirectory(title="問題ページを保存したフォルダを選択")
+        if folder:
+            self.app_controller.import_pages([folder])
+
     def _create_test_tab(self):
         """テストケースタブを作成"""
         test_tab = ttk.Frame(self.notebook, style="Medium.TFrame")
@@ -213,40 +326,19 @@ class MainWindow:
         right_frame = ttk.Frame(test_split, style="Medium.TFrame")
         test_split.add(right_frame, weight=3)
 
-        # テストケースコンテナのスクロール機能
-        self.test_canvas = tk.Canvas(
-            right_frame, bg=COLOR_BG_MEDIUM, highlightthickness=0
-        )
-        scrollbar = ttk.Scrollbar(
-            right_frame, orient="vertical", command=self.test_canvas.yview
-        )
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.test_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.test_canvas.configure(yscrollcommand=scrollbar.set)
-
-        # テストケースを格納するフレーム
-        self.test_container = ttk.Frame(self.test_canvas, style="Medium.TFrame")
-        window_id = self.test_canvas.create_window(
-            (0, 0),
-            window=self.test_container,
-            anchor="nw",
-            width=self.test_canvas.winfo_reqwidth(),
-        )
-
-        def on_canvas_configure(event):
-            canvas_width = event.width
-            self.test_canvas.itemconfig(window_id, width=canvas_width)
-            self.test_canvas.configure(scrollregion=self.test_canvas.bbox("all"))
-
-        self.test_container.bind(
-            "<Configure>",
-            lambda e: self.test_canvas.configure(
-                scrollregion=self.test_canvas.bbox("all")
-            ),
-        )
-        self.test_canvas.bind("<Configure>", on_canvas_configure)
-
-    def create_problem_tab(self, problem_id, problem_title, contest_number, test_cases):
+        # テストケースの一覧（見えている行だけウィジェットを作る）
+        self.test_case_list = TestCaseList(right_frame)
+        self.test_case_list.pack(fill=tk.BOTH, expand=True)
+
+    def create_problem_tab(
+        self,
+        problem_id,
+        problem_title,
+        contest_number,
+        test_cases,
+        comparator=None,
+        constraints=None,
+    ):
         """問題ごとのタブを作成"""
         # 既に同じ問題のタブが存在する場合は選択して終了
         if problem_id in self.problem_tabs:
@@ -254,17 +346,82 @@ class MainWindow:
             self.notebook.select(tab_id)
             return
 
-        # タブタイトル
-        tab_title = f"{problem_id}: {problem_title}"
+        tab_index = self.add_problem_tab(problem_id, problem_title)
+        self._build_problem_tab(
+            self.pending_tabs.pop(tab_index),
+            tab_index,
+            problem_id,
+            contest_number,
+            test_cases,
+            comparator,
+            constraints,
+        )
+
+        # 新しいタブを選択
+        self.notebook.select(tab_index)
+
+        return tab_index
+
+    def add_problem_tab(self, problem_id, problem_title):
+        """
+        問題タブを追加する（中身のウィジェットは初めて開いたときに作る）
+
+        Returns:
+            タブのインデックス
+        """
+        if problem_id in self.problem_tabs:
+            return self.problem_tabs[problem_id]
 
         # 新しいタブを作成
         problem_tab = ttk.Frame(self.notebook, style="Medium.TFrame")
-        self.notebook.add(problem_tab, text=tab_title)
+        self.notebook.add(problem_tab, text=f"{problem_id}: {problem_title}")
 
         # タブインデックスを保存
         tab_index = self.notebook.index(problem_tab)
         self.problem_tabs[problem_id] = tab_index
+        self.pending_tabs[tab_index] = problem_tab
+        return tab_index
 
+    def clear_problem_tabs(self):
+        """すべての問題タブを閉じる（別のコンテストの問題を開いたときなど）"""
+        for tab in self.notebook.tabs()[2:]:
+            self.notebook.forget(tab)
+            self.root.nametowidget(tab).destroy()
+        self.problem_tabs.clear()
+        self.tab_test_frames.clear()
+        self.pending_tabs.clear()
+
+    def _ensure_problem_tab(self, tab_index):
+        """まだウィジェットを作っていない問題タブなら作る"""
+        problem_tab = self.pending_tabs.pop(tab_index, None)
+        if problem_tab is None:
+            return
+
+        problem_id = next(
+            pid for pid, index in self.problem_tabs.items() if index == tab_index
+        )
+        problem_info = self.app_controller.problems.get(problem_id, {})
+        self._build_problem_tab(
+            problem_tab,
+            tab_index,
+            problem_id,
+            problem_info.get("contest_number", ""),
+            problem_info.get("test_cases", []),
+            problem_info.get("comparator"),
+            problem_info.get("constraints"),
+        )
+
+    def _build_problem_tab(
+        self,
+        problem_tab,
+        tab_index,
+        problem_id,
+        contest_number,
+        test_cases,
+        comparator=None,
+        constraints=None,
+    ):
+        """問題タブの中身のウィジェットを作成"""
         # テスト画面の分割（水平方向）
         test_split = ttk.PanedWindow(problem_tab, orient=tk.HORIZONTAL)
         test_split.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -273,8 +430,8 @@ class MainWindow:
         left_frame = ttk.Frame(test_split, style="Medium.TFrame")
         test_split.add(left_frame, weight=1)
 
-        # コードファイル名の設定
-        code_file = self.app_controller.code_manager.update_code_file_path(
+        # コードファイル名（表示していないタブも作るので、選択中のコードファイルは変えない）
+        code_file = self.app_controller.code_manager.code_file_for(
             contest_number, problem_id
         )
 
@@ -321,55 +478,196 @@ class MainWindow:
         )
         run_btn.pack(side=tk.LEFT, padx=5)
 
-        # 右側のテストケースエリア
-        right_frame = ttk.Frame(test_split, style="Medium.TFrame")
-        test_split.add(right_frame, weight=3)
+        # ランタイムごとの実行時間を比較するボタン
+        matrix_btn = ttk.Button(
+            button_frame,
+            text="ランタイム比較",
+            command=lambda pid=problem_id: self.app_controller.compare_runtimes_for_problem(
+                pid
+            ),
+            style="Primary.TButton",
+        )
+        matrix_btn.pack(side=tk.LEFT, padx=5)
 
-        # テストケースコンテナのスクロール機能
-        test_canvas = tk.Canvas(right_frame, bg=COLOR_BG_MEDIUM, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(
-            right_frame, orient="vertical", command=test_canvas.yview
+        # 判定モードの選択
+        judge_frame = ttk.Frame(left_frame, style="Medium.TFrame")
+        judge_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
+        comparator_var, tolerance_var = self._create_judge_selector(
+            judge_frame, problem_id, Comparator.from_dict(comparator)
         )
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        test_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        test_canvas.configure(yscrollcommand=scrollbar.set)
 
-        # テストケースを格納するフレーム
-        test_container = ttk.Frame(test_canvas, style="Medium.TFrame")
-        window_id = test_canvas.create_window(
-            (0, 0),
-            window=test_container,
-            anchor="nw",
-            width=test_canvas.winfo_reqwidth(),
+        # 判定に使う実行制限
+        limits_label = ttk.Label(
+            judge_frame,
+            text=self._format_limits(
+                self.app_controller.test_runner.get_limits(problem_id)
+            ),
+            style="TLabel",
+        )
+        limits_label.pack(side=tk.LEFT, padx=5)
+
+        # ストレステスト（ジェネレータと愚直解はコードファイル名から推測）
+        generator_file, brute_file = stress_file_paths(code_file or "")
+        stress_frame = StressFrame(
+            left_frame,
+            generator_file,
+            brute_file,
+            on_start=lambda gen, brute, pid=problem_id: (
+                self.app_controller.start_stress_test(pid, gen, brute)
+            ),
+            on_stop=self.app_controller.test_runner.stop_stress_test,
+        )
+        stress_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        # 入力サイズを変えた計測による計算量の推定
+        scaling_frame = ScalingFrame(
+            left_frame,
+            companion_file(code_file or "", "_scale"),
+            default_max_n(constraints),
+            on_start=lambda gen, max_n, pid=problem_id: (
+                self.app_controller.start_scaling_analysis(pid, gen, max_n)
+            ),
         )
+        scaling_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        # ランタイム比較の表（実行するまでは表示しない）
+        runtime_matrix = RuntimeMatrixFrame(left_frame)
 
-        def on_canvas_configure(event):
-            canvas_width = event.width
-            test_canvas.itemconfig(window_id, width=canvas_width)
-            test_canvas.configure(scrollregion=test_canvas.bbox("all"))
+        # プロファイル結果（実行するまでは表示しない）
+        profile_frame = ProfileFrame(left_frame)
+
+        # 右側のテストケースエリア
+        right_frame = ttk.Frame(test_split, style="Medium.TFrame")
+        test_split.add(right_frame, weight=3)
 
-        test_container.bind(
-            "<Configure>",
-            lambda e: test_canvas.configure(scrollregion=test_canvas.bbox("all")),
+        # テストケースの一覧（見えている行だけウィジェットを作る）
+        case_list = TestCaseList(
+            right_frame,
+            on_profile=lambda index, pid=problem_id: (
+                self.app_controller.profile_test_case(pid, index)
+            ),
         )
-        test_canvas.bind("<Configure>", on_canvas_configure)
+        case_list.pack(fill=tk.BOTH, expand=True)
 
         # タブ情報を保存
         self.tab_test_frames[tab_index] = {
             "code_frame": code_frame,
             "code_text": code_text,
-            "test_container": test_container,
+            "case_list": case_list,
             "problem_id": problem_id,
+            "comparator_var": comparator_var,
+            "tolerance_var": tolerance_var,
+            "runtime_matrix": runtime_matrix,
+            "profile_frame": profile_frame,
+            "stress_frame": stress_frame,
+            "scaling_frame": scaling_frame,
+            "limits_label": limits_label,
             "test_cases": [],
         }
 
         # テストケースを表示
         self.update_problem_tab_test_cases(problem_id, test_cases)
 
-        # 新しいタブを選択
-        self.notebook.select(tab_index)
+        # 前回の実行結果があれば表示
+        self.app_controller.on_problem_tab_built(problem_id)
 
-        return tab_index
+    def _create_judge_selector(self, parent, problem_id, comparator):
+        """判定モードと許容誤差の入力欄を作成"""
+        ttk.Label(parent, text="判定:", style="TLabel").pack(side=tk.LEFT, padx=5)
+
+        comparator_var = tk.StringVar(value=COMPARATOR_MODES[comparator.mode])
+        mode_combo = ttk.Combobox(
+            parent,
+            textvariable=comparator_var,
+            values=list(COMPARATOR_MODES.values()),
+            state="readonly",
+            width=18,
+        )
+        mode_combo.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(parent, text="許容誤差:", style="TLabel").pack(side=tk.LEFT, padx=5)
+        tolerance_var = tk.StringVar(value=f"{comparator.tolerance:g}")
+        tolerance_entry = ttk.Entry(parent, textvariable=tolerance_var, width=10)
+        tolerance_entry.pack(side=tk.LEFT, padx=5)
+
+        def on_change(event=None):
+            tab_info = self.get_problem_tab_info(problem_id)
+            selected = self.get_tab_comparator(tab_info) if tab_info else comparator
+            # 許容誤差は誤差許容モードのときだけ編集可能
+            tolerance_entry.config(
+                state="normal" if selected.mode == MODE_FLOAT else "disabled"
+            )
+            # 問題情報にも反映して保存しておく
+            problem_info = self.app_controller.problems.get(problem_id)
+            if problem_info is not None:
+                problem_info["comparator"] = selected.to_dict()
+                self.app_controller.save_problem(problem_id)
+
+        mode_combo.bind("<<ComboboxSelected>>", on_change)
+        tolerance_entry.bind("<FocusOut>", on_change)
+        tolerance_entry.config(
+            state="normal" if comparator.mode == MODE_FLOAT else "disabled"
+        )
+
+        return comparator_var, tolerance_var
+
+    def show_runtime_matrix(self, tab_info, runtimes, case_count):
+        """問題タブにランタイム比較の表を表示"""
+        runtime_matrix = tab_info["runtime_matrix"]
+        runtime_matrix.reset(runtimes, case_count)
+        if not runtime_matrix.winfo_ismapped():
+            runtime_matrix.pack(fill=tk.X, padx=5, pady=5)
+
+    def set_runtime_matrix_cell(
+        self, tab_info, runtime_name, case_index, verdict, times
+    ):
+        """ランタイム比較の表に1つの結果を表示"""
+        tab_info["runtime_matrix"].set_cell(runtime_name, case_index, verdict, times)
+
+    def show_profile(self, tab_info, case_title, profile):
+        """問題タブにプロファイル結果を表示"""
+        profile_frame = tab_info["profile_frame"]
+        profile_frame.show_profile(case_title, profile)
+        if not profile_frame.winfo_ismapped():
+            profile_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+    def set_stress_running(self, tab_info, running):
+        """ストレステストの実行状態を問題タブに反映"""
+        tab_info["stress_frame"].set_running(running)
+
+    def show_stress_progress(self, tab_info, cases, elapsed):
+        """ストレステストの進捗を問題タブに表示"""
+        tab_info["stress_frame"].show_progress(cases, elapsed)
+
+    def show_stress_message(self, tab_info, message, style="TLabel"):
+        """ストレステストの結果を問題タブに表示"""
+        tab_info["stress_frame"].show_message(message, style)
+
+    def set_scaling_running(self, tab_info, running):
+        """計算量の推定の実行状態を問題タブに反映"""
+        tab_info["scaling_frame"].set_running(running)
+
+    def show_scaling_message(self, tab_info, message, style="TLabel"):
+        """計算量の推定の経過や結果を問題タブに表示"""
+        tab_info["scaling_frame"].show_message(message, style)
+
+    def get_tab_comparator(self, tab_info):
+        """問題タブで選択されている判定モードを取得"""
+        if not tab_info or "comparator_var" not in tab_info:
+            return Comparator()
+
+        label = tab_info["comparator_var"].get()
+        mode = next(
+            (mode for mode, text in COMPARATOR_MODES.items() if text == label), None
+        )
+        try:
+            tolerance = float(tab_info["tolerance_var"].get())
+        except ValueError:
+            tolerance = Comparator().tolerance
+
+        if mode is None:
+            return Comparator()
+        return Comparator(mode, tolerance)
 
     def update_problem_tab_test_cases(self, problem_id, test_cases):
         """問題タブのテストケースを更新"""
@@ -380,75 +678,9 @@ class MainWindow:
         if tab_index not in self.tab_test_frames:
             return False
 
+        # テストケースを表示（実行結果は消える）
         tab_info = self.tab_test_frames[tab_index]
-        test_container = tab_info["test_container"]
-
-        # テストケースコンテナをクリア
-        for widget in test_container.winfo_children():
-            widget.destroy()
-
-        # テストケースを表示
-        from ui.test_case_frame import TestCaseFrame
-
-        tab_test_cases = []
-        for i, test_case in enumerate(test_cases):
-            # フレームを作成
-            test_frame = TestCaseFrame(
-                test_container,
-                f"テストケース {i+1}",
-            )
-            test_frame.pack(fill=tk.X, expand=True, padx=5, pady=5)
-
-            # コンテンツ部分（3列レイアウト）
-            content_frame = test_frame.content_frame
-
-            # 入力例（左）
-            input_frame = ttk.Frame(content_frame, style="Light.TFrame")
-            input_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
-
-            ttk.Label(input_frame, text=test_case["input_title"], style="TLabel").pack(
-                anchor=tk.W, padx=5, pady=2
-            )
-            input_text = create_scrolledtext(input_frame, height=6, width=30)
-            input_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            input_text.insert(tk.END, test_case["input"])
-
-            # 期待される出力（中央）
-            expected_frame = ttk.Frame(content_frame, style="Light.TFrame")
-            expected_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
-
-            ttk.Label(
-                expected_frame, text=test_case["output_title"], style="TLabel"
-            ).pack(anchor=tk.W, padx=5, pady=2)
-            expected_text = create_scrolledtext(expected_frame, height=6, width=30)
-            expected_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-            expected_text.insert(tk.END, test_case["expected_output"])
-
-            # 実際の出力（右）
-            actual_frame = ttk.Frame(content_frame, style="Light.TFrame")
-            actual_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
-
-            ttk.Label(actual_frame, text="実際の出力", style="TLabel").pack(
-                anchor=tk.W, padx=5, pady=2
-            )
-            actual_text = create_scrolledtext(actual_frame, height=6, width=30)
-            actual_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-
-            # テストケース情報を保存
-            case_info = {
-                "input_title": test_case["input_title"],
-                "input": test_case["input"],
-                "output_title": test_case["output_title"],
-                "expected_output": test_case["expected_output"],
-                "input_widget": input_text,
-                "output_widget": expected_text,
-                "actual_output_widget": actual_text,
-                "result_frame": test_frame,
-            }
-            tab_test_cases.append(case_info)
-
-        # タブのテストケース情報を更新
-        self.tab_test_frames[tab_index]["test_cases"] = tab_test_cases
+        tab_info["test_cases"] = tab_info["case_list"].set_cases(test_cases)
 
         return True
 
@@ -461,17 +693,24 @@ class MainWindow:
             return None
 
         # 問題タブの場合
+        self._ensure_problem_tab(current_tab)
         if current_tab in self.tab_test_frames:
             return self.tab_test_frames[current_tab]
 
         return None
 
-    def get_problem_tab_info(self, problem_id):
-        """指定された問題IDのタブ情報を取得"""
+    def get_problem_tab_info(self, problem_id, build=True):
+        """
+        指定された問題IDのタブ情報を取得
+
+        build=False ならまだ中身を作っていないタブは作らずにNoneを返す
+        """
         if problem_id not in self.problem_tabs:
             return None
 
         tab_index = self.problem_tabs[problem_id]
+        if build:
+            self._ensure_problem_tab(tab_index)
         if tab_index not in self.tab_test_frames:
             return None
 
@@ -494,6 +733,141 @@ class MainWindow:
         # 一定時間後にメッセージをクリア
         self.root.after(duration, lambda: self.status_label.config(text=""))
 
+    def update_runtime_menu(self):
+        """
+        ランタイムメニューを見つかったインタプリタで作り直す
+
+        探索は TestRunner.discover_runtimes が別スレッドで行うので、ここでは結果を読むだけ
+        """
+        runtimes = self.app_controller.test_runner.runtimes
+        menu = self.runtime_menu
+        menu.delete(0, tk.END)
+
+        found = runtimes.runtimes
+        if found is None:
+            menu.add_command(label="インタプリタを探しています…", state="disabled")
+            return
+        if not found:
+            menu.add_command(label="インタプリタが見つかりません", state="disabled")
+            return
+
+        # 通常のテスト実行に使うランタイム
+        for runtime in found:
+            menu.add_radiobutton(
+                label=f"{runtime['label']} ({runtime['name']})",
+                variable=self.runtime_var,
+                value=runtime["name"],
+                command=lambda name=runtime["name"]: self._set_runtime(name),
+            )
+
+        # ランタイム比較の対象
+        menu.add_separator()
+        self.runtime_compare_vars = {}
+        for runtime in found:
+            var = tk.BooleanVar(value=runtimes.is_selected(runtime["name"]))
+            self.runtime_compare_vars[runtime["name"]] = var
+            menu.add_checkbutton(
+                label=f"比較: {runtime['label']}",
+                variable=var,
+                command=lambda name=runtime["name"], v=var: runtimes.set_selected(
+                    name, v.get()
+                ),
+            )
+
+    def _set_runtime(self, name):
+        """通常のテスト実行に使うランタイムを変更"""
+        test_runner = self.app_controller.test_runner
+        test_runner.set_runtime(name)
+        runtime = test_runner.runtimes.get(name)
+        label = runtime["label"] if runtime else name
+        self.show_status_message(f"テストを {label} で実行します", "Success.TLabel")
+
+    def _set_parallelism(self, mode, workers=None):
+        """テストの並列実行モードを変更"""
+        test_runner = self.app_controller.test_runner
+        test_runner.set_parallelism(mode, workers)
+        scheduler = test_runner.scheduler
+        self.parallel_var.set(mode)
+        self.show_status_message(
+            f"テストの並列実行: {scheduler.label}", "Success.TLabel"
+        )
+
+    def _ask_parallelism(self):
+        """テストの並列数を入力してもらう"""
+        scheduler = self.app_controller.test_runner.scheduler
+        workers = simpledialog.askinteger(
+            "並列実行",
+            "同時に実行するテストの数:",
+            initialvalue=scheduler.workers,
+            minvalue=1,
+            parent=self.root,
+        )
+        if workers is None:
+            # キャンセルされた場合は元のモードに戻す
+            self.parallel_var.set(scheduler.mode)
+            return
+        self._set_parallelism(MODE_PARALLEL, workers)
+
+    def _format_limits(self, limits):
+        """実行制限を表示用の文字列に整形"""
+        return (
+            f"制限: {limits['time_limit']:g} 秒 / {limits['memory_limit'] // 1024} MB"
+        )
+
+    def _ask_limits(self):
+        """
+        実行制限（TLE/MLEの判定基準）を入力してもらう
+
+        問題タブを表示している場合はその問題の制限を変更する
+        """
+        test_runner = self.app_controller.test_runner
+        tab_info = self.get_current_tab_info()
+        problem_id = tab_info.get("problem_id") if tab_info else None
+        limits = test_runner.get_limits(problem_id)
+        time_limit = simpledialog.askfloat(
+            "実行制限",
+            "実行時間制限（秒）:",
+            initialvalue=limits["time_limit"],
+            minvalue=0.1,
+            parent=self.root,
+        )
+        if time_limit is None:
+            return
+
+        memory_limit = simpledialog.askinteger(
+            "実行制限",
+            "メモリ制限（MB）:",
+            initialvalue=limits["memory_limit"] // 1024,
+            minvalue=1,
+            parent=self.root,
+        )
+        if memory_limit is None:
+            return
+
+        output_limit = simpledialog.askinteger(
+            "実行制限",
+            "出力サイズ制限（MB）:",
+            initialvalue=limits["output_limit"] // (1024 * 1024),
+            minvalue=1,
+            parent=self.root,
+        )
+        if output_limit is None:
+            return
+
+        test_runner.set_limits(
+            time_limit, memory_limit * 1024, output_limit * 1024 * 1024, problem_id
+        )
+        if problem_id is not None:
+            self.app_controller.save_problem(problem_id)
+        if tab_info and "limits_label" in tab_info:
+            tab_info["limits_label"].config(
+                text=self._format_limits(test_runner.get_limits(problem_id))
+            )
+        self.show_status_message(
+            f"実行制限を {time_limit} 秒 / {memory_limit} MB / 出力 {output_limit} MB に設定しました",
+            "Success.TLabel",
+        )
+
     def enable_testcase_tab(self, enable=True):
         """テストケースタブの有効/無効を切り替え"""
         if enable:
@@ -0,0 +1,117 @@
+import json
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from core.profiler import top_functions, call_stacks, to_collapsed, to_speedscope
+
+# 並べ替えの基準（表示名 -> プロファイルのキー）
+SORT_KEYS = {"累積時間": "total_time", "自己時間": "self_time"}
+
+
+class ProfileFrame(ttk.LabelFrame):
+    """テストケース1つ分のプロファイル結果を表示するフレーム"""
+
+    def __init__(self, parent):
+        super().__init__(parent, text="プロファイル")
+        self.profile = None
+        self.case_title = ""
+
+        control_frame = ttk.Frame(self, style="Medium.TFrame")
+        control_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.case_label = ttk.Label(control_frame, text="", style="TLabel")
+        self.case_label.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(control_frame, text="並べ替え:", style="TLabel").pack(
+            side=tk.LEFT, padx=5
+        )
+        self.sort_var = tk.StringVar(value="累積時間")
+        sort_combo = ttk.Combobox(
+            control_frame,
+            textvariable=self.sort_var,
+            values=list(SORT_KEYS),
+            state="readonly",
+            width=8,
+        )
+        sort_combo.pack(side=tk.LEFT, padx=5)
+        sort_combo.bind("<<ComboboxSelected>>", lambda event: self._refresh())
+
+        ttk.Button(
+            control_frame,
+            text="speedscope形式で保存",
+            command=self._save_speedscope,
+        ).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(
+            control_frame,
+            text="collapsed形式で保存",
+            command=self._save_collapsed,
+        ).pack(side=tk.RIGHT, padx=5)
+
+        columns = ("function", "calls", "self_time", "total_time")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=8)
+        self.tree.heading("function", text="関数")
+        self.tree.column("function", width=260)
+        self.tree.heading("calls", text="呼出回数")
+        self.tree.column("calls", width=90, stretch=False, anchor=tk.E)
+        self.tree.heading("self_time", text="自己時間")
+        self.tree.column("self_time", width=90, stretch=False, anchor=tk.E)
+        self.tree.heading("total_time", text="累積時間")
+        self.tree.column("total_time", width=90, stretch=False, anchor=tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+
+    def show_profile(self, case_title, profile):
+        """プロファイル結果を表示"""
+        self.case_title = case_title
+        self.profile = profile
+        self.case_label.config(text=case_title)
+        self._refresh()
+
+    def _refresh(self):
+        """選択されている基準で並べ替えて表を作り直す"""
+        self.tree.delete(*self.tree.get_children())
+        if not self.profile:
+            return
+
+        for function in top_functions(self.profile, SORT_KEYS[self.sort_var.get()]):
+            calls = str(function["calls"])
+            if function["primitive_calls"] != function["calls"]:
+                # 再帰呼び出しがある場合は 総数/再帰以外 を表示
+                calls += f"/{function['primitive_calls']}"
+            self.tree.insert(
+                "",
+                tk.END,
+                values=(
+                    function["name"],
+                    calls,
+                    f"{function['self_time'] * 1000:.1f} ms",
+                    f"{function['total_time'] * 1000:.1f} ms",
+                ),
+            )
+
+    def _ask_save_path(self, extension, filetypes):
+        """保存先のファイル名を尋ねる"""
+        if not self.profile:
+            messagebox.showwarning("警告", "プロファイル結果がありません")
+            return None
+        return filedialog.asksaveasfilename(
+            defaultextension=extension, filetypes=filetypes
+        )
+
+    def _save_collapsed(self):
+        """collapsed stack形式（flamegraph.pl など）で保存"""
+        path = self._ask_save_path(
+            ".txt", [("Collapsed stacks", "*.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(to_collapsed(call_stacks(self.profile)))
+
+    def _save_speedscope(self):
+        """speedscope のJSON形式で保存"""
+        path = self._ask_save_path(
+            ".speedscope.json", [("speedscope", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(to_speedscope(call_stacks(self.profile), self.case_title), f)
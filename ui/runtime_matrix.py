@@ -0,0 +1,65 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+def format_matrix_cell(verdict, times):
+    """ランタイム比較の1マス分を表示用の文字列に整形"""
+    if times["first"] is None:
+        return verdict
+
+    text = f"{verdict} {times['first'] * 1000:.0f} ms"
+    if times["steady"] is not None:
+        text += f" / 定常 {times['steady'] * 1000:.0f} ms"
+    return text
+
+
+class RuntimeMatrixFrame(ttk.LabelFrame):
+    """ランタイムごと・テストケースごとの実行時間を表で表示するフレーム"""
+
+    def __init__(self, parent):
+        super().__init__(parent, text="ランタイム比較")
+
+        self.tree = ttk.Treeview(self, show="headings", height=4)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        ttk.Label(
+            self,
+            text="初回はJITのウォームアップを含む時間、定常は2回目以降の最短時間",
+            style="TLabel",
+        ).pack(anchor=tk.W, padx=5, pady=(0, 5))
+
+        self.rows = {}  # ランタイム名 -> 行のID
+        self.startup_set = set()
+
+    def reset(self, runtimes, case_count):
+        """表を作り直す"""
+        columns = ["runtime", "startup"] + [f"case{i}" for i in range(case_count)]
+        self.tree.delete(*self.tree.get_children())
+        self.tree.config(columns=columns)
+
+        self.tree.heading("runtime", text="ランタイム")
+        self.tree.column("runtime", width=120, stretch=False)
+        self.tree.heading("startup", text="起動")
+        self.tree.column("startup", width=60, stretch=False)
+        for i in range(case_count):
+            self.tree.heading(f"case{i}", text=f"#{i + 1}")
+            self.tree.column(f"case{i}", width=150)
+
+        self.rows = {}
+        self.startup_set = set()
+        for runtime in runtimes:
+            values = [runtime["label"], "-"] + ["実行中"] * case_count
+            self.rows[runtime["name"]] = self.tree.insert("", tk.END, values=values)
+
+    def set_cell(self, runtime_name, case_index, verdict, times):
+        """1つのランタイム・テストケースの結果を表示"""
+        row = self.rows.get(runtime_name)
+        if row is None:
+            return
+
+        self.tree.set(row, f"case{case_index}", format_matrix_cell(verdict, times))
+
+        # 起動時間はランタイムごとに最初に分かったものを表示
+        if times["startup"] is not None and runtime_name not in self.startup_set:
+            self.startup_set.add(runtime_name)
+            self.tree.set(row, "startup", f"{times['startup'] * 1000:.0f} ms")
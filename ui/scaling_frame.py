@@ -0,0 +1,66 @@
+import tkinter as tk
+from tkinter import ttk
+from ui.widgets import create_file_entry
+
+
+class ScalingFrame(ttk.LabelFrame):
+    """入力サイズを変えた計測から計算量を推定するフレーム"""
+
+    def __init__(self, parent, generator_file, max_n, on_start):
+        """
+        Args:
+            generator_file: Nを受け取るジェネレータのデフォルトのファイル名
+            max_n: 制約の最大N
+            on_start: on_start(ジェネレータ, 最大N) を呼ぶ関数
+        """
+        super().__init__(parent, text="計算量の推定")
+        self.on_start = on_start
+
+        self.generator_var = tk.StringVar(value=generator_file)
+        create_file_entry(self, "ジェネレータ:", self.generator_var)
+
+        control_frame = ttk.Frame(self, style="Medium.TFrame")
+        control_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Label(control_frame, text="最大N:", style="TLabel").pack(side=tk.LEFT)
+        self.max_n_var = tk.StringVar(value=str(max_n))
+        ttk.Entry(control_frame, textvariable=self.max_n_var, width=12).pack(
+            side=tk.LEFT, padx=5
+        )
+
+        self.start_button = ttk.Button(
+            control_frame,
+            text="計測",
+            command=self._start,
+            style="Primary.TButton",
+        )
+        self.start_button.pack(side=tk.LEFT, padx=5)
+
+        self.result_label = ttk.Label(
+            self,
+            text="ジェネレータには標準入力でNが渡されます",
+            style="TLabel",
+            justify=tk.LEFT,
+        )
+        self.result_label.pack(anchor=tk.W, padx=5, pady=(0, 5))
+
+    def _start(self):
+        """入力された最大Nで計測を開始"""
+        try:
+            max_n = int(float(self.max_n_var.get()))
+        except ValueError:
+            self.show_message("最大Nには数値を入力してください", "Warning.TLabel")
+            return
+        self.on_start(self.generator_var.get(), max_n)
+
+    def set_max_n(self, max_n):
+        """最大Nを設定"""
+        self.max_n_var.set(str(max_n))
+
+    def set_running(self, running):
+        """実行中はボタンを無効にする"""
+        self.start_button.config(state="disabled" if running else "normal")
+
+    def show_message(self, message, style="TLabel"):
+        """計測の経過や結果を表示"""
+        self.result_label.config(text=message, style=style)
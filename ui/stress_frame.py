@@ -0,0 +1,66 @@
+import tkinter as tk
+from tkinter import ttk
+from ui.widgets import create_file_entry
+
+
+class StressFrame(ttk.LabelFrame):
+    """ストレステストの設定と進捗を表示するフレーム"""
+
+    def __init__(self, parent, generator_file, brute_file, on_start, on_stop):
+        """
+        Args:
+            generator_file, brute_file: ジェネレータと愚直解のデフォルトのファイル名
+            on_start: on_start(ジェネレータ, 愚直解) を呼ぶ関数
+            on_stop: 停止ボタンで呼ぶ関数
+        """
+        super().__init__(parent, text="ストレステスト")
+        self.on_start = on_start
+        self.on_stop = on_stop
+        self.running = False
+
+        self.generator_var = tk.StringVar(value=generator_file)
+        self.brute_var = tk.StringVar(value=brute_file)
+        create_file_entry(self, "ジェネレータ:", self.generator_var)
+        create_file_entry(self, "愚直解:", self.brute_var)
+
+        control_frame = ttk.Frame(self, style="Medium.TFrame")
+        control_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        self.start_button = ttk.Button(
+            control_frame,
+            text="開始",
+            command=self._toggle,
+            style="Primary.TButton",
+        )
+        self.start_button.pack(side=tk.LEFT, padx=5)
+
+        self.progress_label = ttk.Label(
+            control_frame,
+            text="ジェネレータには標準入力でシード値が渡されます",
+            style="TLabel",
+        )
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+
+    def _toggle(self):
+        """開始・停止を切り替え"""
+        if self.running:
+            self.on_stop()
+        else:
+            self.on_start(self.generator_var.get(), self.brute_var.get())
+
+    def set_running(self, running):
+        """実行中かどうかを表示に反映"""
+        self.running = running
+        self.start_button.config(text="停止" if running else "開始")
+
+    def show_progress(self, cases, elapsed):
+        """実行したケース数と1秒あたりのケース数を表示"""
+        rate = cases / elapsed if elapsed > 0 else 0
+        self.progress_label.config(
+            text=f"{cases} ケース / {elapsed:.1f} 秒 ({rate:.0f} ケース/秒)",
+            style="TLabel",
+        )
+
+    def show_message(self, message, style="TLabel"):
+        """結果のメッセージを表示"""
+        self.progress_label.config(text=message, style=style)
@@ -1,18 +1,65 @@
 import tkinter as tk
 from tkinter import ttk
 from ui.styles import (
-    COLOR_BG_MEDIUM,
     ICON_PENDING,
     ICON_SUCCESS,
     ICON_ERROR,
+    ICON_WARNING,
     ICON_RUNNING,
 )
 
+# 判定ごとのアイコンとスタイル
+VERDICT_DISPLAY = {
+    "AC": (ICON_SUCCESS, "Success.TLabel"),
+    "WA": (ICON_ERROR, "Error.TLabel"),
+    "RE": (ICON_ERROR, "Error.TLabel"),
+    "TLE": (ICON_WARNING, "Warning.TLabel"),
+    "MLE": (ICON_WARNING, "Warning.TLabel"),
+    "OLE": (ICON_WARNING, "Warning.TLabel"),
+    "CE": (ICON_ERROR, "Error.TLabel"),
+}
+
+
+def format_stats(result, limits=None):
+    """実行時間やメモリ使用量を表示用の文字列に整形"""
+    parts = []
+
+    if result.get("time") is not None:
+        text = f"時間 {result['time'] * 1000:.0f} ms"
+        if result.get("cpu_time") is not None:
+            text += f" (CPU {result['cpu_time'] * 1000:.0f} ms"
+            if limits:
+                text += f", {result['cpu_time'] / limits['time_limit']:.0%}"
+            text += ")"
+        parts.append(text)
+
+    if result.get("memory") is not None:
+        text = f"メモリ {result['memory'] / 1024:.1f} MB"
+        if limits:
+            text += f" ({result['memory'] / limits['memory_limit']:.0%})"
+        parts.append(text)
+
+    if result.get("page_faults") is not None:
+        parts.append(f"PF {result['page_faults']}")
+
+    if result.get("context_switches") is not None:
+        parts.append(f"CS {result['context_switches']}")
+
+    text = " | ".join(parts)
+    if result.get("cached"):
+        # コードと入力が前回と同じため実行を省略した結果
+        text = f"{text} (キャッシュ)" if text else "キャッシュ"
+    return text
+
 
 class TestCaseFrame(ttk.Frame):
     """テストケースを表示するフレーム"""
 
-    def __init__(self, parent, title, style="Medium.TFrame", **kwargs):
+    def __init__(self, parent, title, style="Medium.TFrame", on_profile=None, **kwargs):
+        """
+        Args:
+            on_profile: プロファイルボタンで呼ぶ関数（Noneならボタンを表示しない）
+        """
         ttk.Frame.__init__(self, parent, style=style)
 
         # ヘッダーフレーム
@@ -37,6 +84,18 @@ class TestCaseFrame(ttk.Frame):
         )
         self.result_label.pack(side=tk.RIGHT, padx=10, pady=5)
 
+        # 実行時間・メモリ使用量
+        self.stats_label = ttk.Label(self.header_frame, text="", style="Status.TLabel")
+        self.stats_label.pack(side=tk.RIGHT, padx=10, pady=5)
+
+        # プロファイルボタン
+        if on_profile:
+            ttk.Button(
+                self.header_frame,
+                text="プロファイル",
+                command=on_profile,
+            ).pack(side=tk.RIGHT, padx=5, pady=2)
+
         # コンテンツフレーム
         self.content_frame = ttk.Frame(self, style="Light.TFrame")
         self.content_frame.pack(fill=tk.BOTH, expand=True, padx=2, pady=2)
@@ -45,18 +104,34 @@ class TestCaseFrame(ttk.Frame):
         """テスト実行中の状態を設定"""
         self.result_icon.config(text=ICON_RUNNING, style="Running.TLabel")
         self.result_label.config(text="実行中", style="Running.TLabel")
+        self.stats_label.config(text="")
         # フレームをハイライト
         self.configure(style="Highlight.TFrame")
 
-    def set_result(self, passed=None):
-        """テスト結果を設定"""
+    def set_error(self):
+        """テストの実行中にエラーが発生した状態を設定"""
         self.configure(style="Medium.TFrame")
-        if passed is None:
+        self.result_icon.config(text=ICON_WARNING, style="Warning.TLabel")
+        self.result_label.config(text="エラー", style="Error.TLabel")
+        self.stats_label.config(text="")
+
+    def set_result(self, verdict=None, result=None, limits=None):
+        """
+        テスト結果を設定
+
+        Args:
+            verdict: 判定（AC/WA/TLE/MLE/OLE/RE/CE）、Noneなら未実行
+            result: run_python_test の実行結果（リソース使用量の表示用）
+            limits: 実行制限（制限に対する割合の表示用）
+        """
+        self.configure(style="Medium.TFrame")
+        if verdict is None:
             self.result_icon.config(text=ICON_PENDING, style="Status.TLabel")
             self.result_label.config(text="未実行", style="Status.TLabel")
-        elif passed:
-            self.result_icon.config(text=ICON_SUCCESS, style="Success.TLabel")
-            self.result_label.config(text="合格", style="Success.TLabel")
-        else:
-            self.result_icon.config(text=ICON_ERROR, style="Error.TLabel")
-            self.result_label.config(text="不合格", style="Error.TLabel")
+            self.stats_label.config(text="")
+            return
+
+        icon, style = VERDICT_DISPLAY.get(verdict, (ICON_ERROR, "Error.TLabel"))
+        self.result_icon.config(text=icon, style=style)
+        self.result_label.config(text=verdict, style=style)
+        self.stats_label.config(text=format_stats(result, limits) if result else "")
@@ -0,0 +1,263 @@
+import tkinter as tk
+from tkinter import ttk
+from ui.styles import COLOR_BG_MEDIUM
+from ui.test_case_frame import TestCaseFrame
+from ui.widgets import create_scrolledtext
+
+# 行の周りの余白（ピクセル）
+ROW_PADDING = 5
+
+
+class _CaseRow(TestCaseFrame):
+    """テストケース1つ分の行（表示するテストケースを入れ替えて使い回す）"""
+
+    def __init__(self, parent, on_profile=None):
+        self.case = None  # 表示しているテストケース
+        self.window_id = None
+        TestCaseFrame.__init__(
+            self,
+            parent,
+            "",
+            on_profile=(lambda: on_profile(self.case["index"])) if on_profile else None,
+        )
+
+        # コンテンツ部分（3列レイアウト）: 入力例・期待される出力・実際の出力
+        self.input_label, self.input_text = self._create_column()
+        self.expected_label, self.expected_text = self._create_column()
+        self.actual_label, self.actual_text = self._create_column()
+        self.actual_label.config(text="実際の出力")
+
+        # 入力例と期待される出力は編集できる（編集した内容で実行する）
+        for widget, field in (
+            (self.input_text, "input"),
+            (self.expected_text, "expected_output"),
+        ):
+            widget.bind(
+                "<<Modified>>", lambda e, w=widget, f=field: self._save_edit(w, f)
+            )
+
+    def _create_column(self):
+        frame = ttk.Frame(self.content_frame, style="Light.TFrame")
+        frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=2, pady=2)
+        label = ttk.Label(frame, text="", style="TLabel")
+        label.pack(anchor=tk.W, padx=5, pady=2)
+        text = create_scrolledtext(frame, height=6, width=30)
+        text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        return label, text
+
+    def _save_edit(self, widget, field):
+        """編集された内容をテストケースに反映"""
+        if self.case is None or not widget.edit_modified():
+            return
+        self.case[field] = widget.get("1.0", "end-1c")
+        widget.edit_modified(False)
+
+    def save_edits(self):
+        """まだ反映していない編集をテストケースに反映"""
+        self._save_edit(self.input_text, "input")
+        self._save_edit(self.expected_text, "expected_output")
+
+    def show(self, case):
+        """テストケースを表示する（None なら内容を消す）"""
+        self.save_edits()
+        self.case = case
+        if case is None:
+            for widget in (self.input_text, self.expected_text, self.actual_text):
+                self._set_text(widget, "")
+            return
+
+        self.title_label.config(text=f"テストケース {case['index'] + 1}")
+        self.input_label.config(text=case["input_title"])
+        self.expected_label.config(text=case["output_title"])
+        self._set_text(self.input_text, case["input"])
+        self._set_text(self.expected_text, case["expected_output"])
+        self.show_state()
+
+    def show_state(self):
+        """テストケースの実行状態（判定と実際の出力）を表示する"""
+        case = self.case
+        state = case["state"]
+        if state == "running":
+            self.set_running()
+        elif state == "error":
+            self.set_error()
+        else:
+            self.set_result(case["verdict"], case["result"], case["limits"])
+        self._set_text(self.actual_text, case["actual_output"])
+
+    def _set_text(self, widget, text):
+        widget.config(state="normal")
+        widget.delete("1.0", tk.END)
+        widget.insert(tk.END, text)
+        # プログラムからの変更は編集として扱わない
+        widget.edit_modified(False)
+
+
+class TestCaseList(ttk.Frame):
+    """
+    テストケースの一覧
+
+    すべての行は同じ高さなので、スクロール位置から見えている行だけを求め、
+    その分のウィジェットだけを作って表示するテストケースを入れ替えながら使い回す。
+    テストケースが何百あってもウィジェットの数は画面に収まる行数分で済む
+    """
+
+    def __init__(self, parent, on_profile=None):
+        """
+        Args:
+            on_profile: 行のプロファイルボタンで呼ぶ関数 on_profile(テストケースの番号)
+                （Noneならボタンを表示しない）
+        """
+        ttk.Frame.__init__(self, parent, style="Medium.TFrame")
+        self.on_profile = on_profile
+        self.cases = []  # 表示するテストケース
+        self.rows = []  # 作成済みの行（使い回す）
+        self.row_height = None
+        self.scrollregion = None
+
+        self.canvas = tk.Canvas(self, bg=COLOR_BG_MEDIUM, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(
+            self, orient="vertical", command=self.canvas.yview
+        )
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.canvas.bind("<Configure>", self._on_configure)
+
+    def set_cases(self, test_cases):
+        """
+        表示するテストケースを設定する
+
+        Returns:
+            表示用のテストケースのリスト（入力と期待される出力は編集した内容になり、
+            実行結果は set_running / set_result / set_error で表示する）
+        """
+        for row in self.rows:
+            row.show(None)
+        self.cases = [
+            {
+                "index": index,
+                "input_title": test_case["input_title"],
+                "input": test_case["input"],
+                "output_title": test_case["output_title"],
+                "expected_output": test_case["expected_output"],
+                "case_list": self,
+                "state": None,
+                "verdict": None,
+                "result": None,
+                "limits": None,
+                "actual_output": "",
+            }
+            for index, test_case in enumerate(test_cases)
+        ]
+        self.canvas.yview_moveto(0)
+        self._layout()
+        return self.cases
+
+    def read_case(self, case):
+        """テストケースの入力と期待される出力（表示中の行で編集された内容を含む）"""
+        row = self._row_for(case)
+        if row is not None:
+            row.save_edits()
+        return case["input"].strip(), case["expected_output"].strip()
+
+    def set_running(self, case):
+        """テストケースを実行中にする"""
+        self._update(case, state="running", actual_output="")
+
+    def set_result(self, case, verdict=None, result=None, limits=None, output=""):
+        """テストケースの判定と実際の出力を表示する"""
+        self._update(
+            case,
+            state=None,
+            verdict=verdict,
+            result=result,
+            limits=limits,
+            actual_output=output,
+        )
+
+    def set_error(self, case, message):
+        """テストケースの実行中に発生したエラーを表示する"""
+        self._update(case, state="error", actual_output=message)
+
+    def _update(self, case, **fields):
+        case.update(fields)
+        row = self._row_for(case)
+        if row is not None:
+            row.show_state()
+
+    def _row_for(self, case):
+        """テストケースを表示している行（表示されていなければNone）"""
+        for row in self.rows:
+            if row.case is case:
+                return row
+        return None
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._layout()
+
+    def _on_configure(self, event):
+        for row in self.rows:
+            if row.window_id is not None:
+                self.canvas.itemconfigure(row.window_id, width=self._row_width())
+        self._layout()
+
+    def _row_width(self):
+        return max(1, self.canvas.winfo_width() - ROW_PADDING * 2)
+
+    def _create_row(self):
+        row = _CaseRow(self.canvas, self.on_profile)
+        row.window_id = self.canvas.create_window(
+            ROW_PADDING, 0, window=row, anchor="nw", width=self._row_width()
+        )
+        self.rows.append(row)
+        if self.row_height is None:
+            # どの行も同じ構成なので、最初に作った行の高さを全行の高さとする
+            row.update_idletasks()
+            self.row_height = row.winfo_reqheight() + ROW_PADDING * 2
+        return row
+
+    def _update_scrollregion(self):
+        """スクロール範囲を全行の高さにする（変わったときだけ設定する）"""
+        height = len(self.cases) * (self.row_height or 0)
+        scrollregion = (0, 0, self._row_width(), height)
+        if scrollregion != self.scrollregion:
+            self.scrollregion = scrollregion
+            self.canvas.configure(scrollregion=scrollregion)
+
+    def _layout(self):
+        """見えている範囲のテストケースを行に割り当てる"""
+        if self.cases and self.row_height is None:
+            self._create_row()
+        self._update_scrollregion()
+
+        visible = range(0)
+        if self.cases:
+            top = max(0, int(self.canvas.canvasy(0)))
+            height = max(self.canvas.winfo_height(), self.row_height)
+            first = min(top // self.row_height, len(self.cases) - 1)
+            last = min(len(self.cases), (top + height) // self.row_height + 1)
+            visible = range(first, last)
+
+        # 表示している行はそのままにして、画面外に出た行を使い回す
+        free = [
+            row
+            for row in self.rows
+            if row.case is None or row.case["index"] not in visible
+        ]
+        shown = {row.case["index"] for row in self.rows if row not in free}
+        for index in visible:
+            if index in shown:
+                continue
+            row = free.pop() if free else self._create_row()
+            row.show(self.cases[index])
+            self.canvas.coords(
+                row.window_id, ROW_PADDING, index * self.row_height + ROW_PADDING
+            )
+            self.canvas.itemconfigure(row.window_id, state="normal")
+
+        for row in free:
+            if row.case is not None:
+                row.show(None)
+            self.canvas.itemconfigure(row.window_id, state="hidden")
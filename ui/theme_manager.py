@@ -8,10 +8,16 @@ class ThemeManager:
     def __init__(self, root):
         self.root = root
         self.style = ttk.Style()
+        self.deferred_ready = False
         self.setup_theme()
 
     def setup_theme(self):
-        """ダークテーマのスタイルを設定"""
+        """
+        ダークテーマのスタイルを設定
+
+        起動直後のウィンドウで使うスタイルだけを設定し、問題タブでだけ使う
+        スタイルは setup_deferred_theme でウィンドウの表示後に設定する
+        """
         # ウィンドウの背景色を設定
         self.root.configure(bg=COLOR_BG_DARK)
 
@@ -20,9 +26,6 @@ class ThemeManager:
         self.style.configure("Dark.TFrame", background=COLOR_BG_DARK)
         self.style.configure("Medium.TFrame", background=COLOR_BG_MEDIUM)
         self.style.configure("Light.TFrame", background=COLOR_BG_LIGHT)
-        self.style.configure(
-            "Highlight.TFrame", background=COLOR_PRIMARY, borderwidth=2
-        )
 
         # TLabelframe設定
         self.style.configure(
@@ -98,9 +101,6 @@ class ThemeManager:
             foreground=[("active", COLOR_BG_DARK), ("pressed", COLOR_ACCENT)],
         )
 
-        # Icon.TButton設定（アイコンボタン）
-        self.style.configure("Icon.TButton", padding=3, font=("Arial", 12))
-
         # TPanedwindow設定
         self.style.configure("TPanedwindow", background=COLOR_BG_DARK)
 
@@ -130,6 +130,52 @@ class ThemeManager:
             background=[("active", COLOR_PRIMARY), ("disabled", COLOR_DISABLED)],
         )
 
+    def setup_deferred_theme(self):
+        """問題タブで使うスタイルを設定（2回目以降は何もしない）"""
+        if self.deferred_ready:
+            return
+        self.deferred_ready = True
+
+        self.style.configure(
+            "Highlight.TFrame", background=COLOR_PRIMARY, borderwidth=2
+        )
+
+        # Icon.TButton設定（アイコンボタン）
+        self.style.configure("Icon.TButton", padding=3, font=("Arial", 12))
+
+        # TCombobox・TEntry設定（判定モードの選択など）
+        self.style.configure(
+            "TCombobox",
+            fieldbackground=COLOR_BG_LIGHT,
+            background=COLOR_BG_MEDIUM,
+            foreground=COLOR_FG,
+            arrowcolor=COLOR_ACCENT,
+        )
+        self.style.map(
+            "TCombobox",
+            fieldbackground=[("readonly", COLOR_BG_LIGHT)],
+            foreground=[("readonly", COLOR_FG)],
+        )
+        self.style.configure(
+            "TEntry",
+            fieldbackground=COLOR_BG_LIGHT,
+            foreground=COLOR_FG,
+            insertcolor=COLOR_FG,
+        )
+        self.style.map("TEntry", fieldbackground=[("disabled", COLOR_BG_MEDIUM)])
+
+        # Treeview設定（ランタイム比較の表）
+        self.style.configure(
+            "Treeview",
+            background=COLOR_BG_LIGHT,
+            fieldbackground=COLOR_BG_LIGHT,
+            foreground=COLOR_FG,
+        )
+        self.style.configure(
+            "Treeview.Heading", background=COLOR_BG_MEDIUM, foreground=COLOR_ACCENT
+        )
+        self.style.map("Treeview", background=[("selected", COLOR_PRIMARY)])
+
         # TProgressbar設定
         self.style.configure(
             "TProgressbar",
@@ -1,5 +1,6 @@
+import os
 import tkinter as tk
-from tkinter import scrolledtext
+from tkinter import ttk, scrolledtext, filedialog
 from ui.styles import COLOR_BG_LIGHT, COLOR_FG, COLOR_PRIMARY, COLOR_BG_DARK
 
 
@@ -19,3 +20,27 @@ def create_scrolledtext(parent, height=10, width=None, wrap=tk.WORD, readonly=Fa
     if readonly:
         text.configure(state="disabled")
     return text
+
+
+def create_file_entry(parent, label, variable):
+    """ファイル名の入力欄と参照ボタンを1行で作成"""
+    row = ttk.Frame(parent, style="Medium.TFrame")
+    row.pack(fill=tk.X, padx=5, pady=2)
+
+    ttk.Label(row, text=label, width=10, style="TLabel").pack(side=tk.LEFT)
+    ttk.Entry(row, textvariable=variable).pack(
+        side=tk.LEFT, fill=tk.X, expand=True, padx=5
+    )
+
+    def browse():
+        path = filedialog.askopenfilename(
+            initialdir=os.path.dirname(os.path.abspath(variable.get() or ".")),
+            filetypes=[("Python", "*.py"), ("すべてのファイル", "*.*")],
+        )
+        if path:
+            variable.set(path)
+
+    ttk.Button(row, text="参照", command=browse, style="Primary.TButton").pack(
+        side=tk.LEFT
+    )
+    return row